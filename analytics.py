@@ -0,0 +1,164 @@
+from datetime import datetime
+
+from database import get_connection
+
+# Периоды сводок: имя таблицы и формат ключа периода (одинаковый для SQLite и Python)
+PERIODS = {
+    'day': ('rollup_daily', '%Y-%m-%d'),
+    'week': ('rollup_weekly', '%Y-W%W'),
+    'month': ('rollup_monthly', '%Y-%m'),
+}
+
+UNKNOWN_TYPE = 'unknown'
+
+
+def _create_rollup(conn, table: str):
+    conn.execute(f'''
+                 CREATE TABLE IF NOT EXISTS {table}
+                 (
+                     period        TEXT    NOT NULL,
+                     item_type     TEXT    NOT NULL,
+                     items_count   INTEGER NOT NULL,
+                     fabric        REAL    NOT NULL,
+                     sewing_cost   REAL    NOT NULL,
+                     material_cost REAL    NOT NULL,
+                     PRIMARY KEY (period, item_type)
+                 ) WITHOUT ROWID
+                 ''')
+
+
+def _figures(item: str, calculation: str) -> tuple:
+    """Расход ткани, пошив и материалы изделия для сводки.
+
+    У изделий, перенесённых из старых текстовых списков, своих сумм нет:
+    итоги такого расчёта относятся к его первому изделию.
+    """
+    return tuple(f"COALESCE({item}.{column}, CASE {item}.position WHEN 1 THEN {calculation}.{total} ELSE 0 END)"
+                 for column, total in (('fabric', 'total_fabric'), ('sewing_cost', 'total_sewing_cost'),
+                                       ('material_cost', 'total_material_cost')))
+
+
+def _rollup_triggers(table: str, period_format: str) -> dict:
+    """Триггеры, обновляющие сводку при записи и удалении изделий расчёта"""
+    period = f"strftime('{period_format}', c.created_at, 'unixepoch')"
+    fabric, sewing_cost, material_cost = _figures('NEW', 'c')
+    old_fabric, old_sewing_cost, old_material_cost = _figures('OLD', 'c')
+    item_fabric, item_sewing_cost, item_material_cost = _figures('calculation_items', 'OLD')
+    return {
+        # Сводка обновляется при записи изделий расчёта, пересчёт таблицы не нужен
+        f'{table}_insert': f'''
+            CREATE TRIGGER {table}_insert
+                AFTER INSERT ON calculation_items
+            BEGIN
+                INSERT INTO {table} (period, item_type, items_count, fabric, sewing_cost, material_cost)
+                SELECT {period}, COALESCE(NEW.item_type, '{UNKNOWN_TYPE}'), 1, {fabric}, {sewing_cost}, {material_cost}
+                FROM calculations c
+                WHERE c.id = NEW.calculation_id
+                ON CONFLICT (period, item_type) DO UPDATE SET
+                    items_count   = items_count + 1,
+                    fabric        = fabric + excluded.fabric,
+                    sewing_cost   = sewing_cost + excluded.sewing_cost,
+                    material_cost = material_cost + excluded.material_cost;
+            END''',
+        f'{table}_delete': f'''
+            CREATE TRIGGER {table}_delete
+                AFTER DELETE ON calculation_items
+            BEGIN
+                UPDATE {table}
+                SET items_count   = {table}.items_count - 1,
+                    fabric        = {table}.fabric - i.fabric,
+                    sewing_cost   = {table}.sewing_cost - i.sewing_cost,
+                    material_cost = {table}.material_cost - i.material_cost
+                FROM (SELECT {period} AS period, {old_fabric} AS fabric, {old_sewing_cost} AS sewing_cost,
+                             {old_material_cost} AS material_cost
+                      FROM calculations c
+                      WHERE c.id = OLD.calculation_id) AS i
+                WHERE {table}.item_type = COALESCE(OLD.item_type, '{UNKNOWN_TYPE}')
+                  AND {table}.period = i.period;
+            END''',
+        # При удалении расчёта его изделия удаляются каскадно уже после строки
+        # расчёта, и триггер выше не находит период. Поэтому изделия вычитаются
+        # из сводки до удаления расчёта
+        f'{table}_delete_calculation': f'''
+            CREATE TRIGGER {table}_delete_calculation
+                BEFORE DELETE ON calculations
+            BEGIN
+                UPDATE {table}
+                SET items_count   = {table}.items_count - i.items_count,
+                    fabric        = {table}.fabric - i.fabric,
+                    sewing_cost   = {table}.sewing_cost - i.sewing_cost,
+                    material_cost = {table}.material_cost - i.material_cost
+                FROM (SELECT COALESCE(item_type, '{UNKNOWN_TYPE}') AS item_type, COUNT(*) AS items_count,
+                             TOTAL({item_fabric}) AS fabric, TOTAL({item_sewing_cost}) AS sewing_cost,
+                             TOTAL({item_material_cost}) AS material_cost
+                      FROM calculation_items
+                      WHERE calculation_id = OLD.id
+                      GROUP BY 1) AS i
+                WHERE {table}.item_type = i.item_type
+                  AND {table}.period = strftime('{period_format}', OLD.created_at, 'unixepoch');
+            END''',
+    }
+
+
+def _backfill_rollup(conn, table: str, period_format: str):
+    fabric, sewing_cost, material_cost = _figures('i', 'c')
+    conn.execute(f'''
+                 INSERT INTO {table} (period, item_type, items_count, fabric, sewing_cost, material_cost)
+                 SELECT strftime('{period_format}', c.created_at, 'unixepoch'),
+                        COALESCE(i.item_type, '{UNKNOWN_TYPE}'), COUNT(*),
+                        TOTAL({fabric}), TOTAL({sewing_cost}), TOTAL({material_cost})
+                 FROM calculation_items i
+                          JOIN calculations c ON c.id = i.calculation_id
+                 GROUP BY 1, 2
+                 ''')
+
+
+def init_analytics():
+    """Создание сводных таблиц и триггеров.
+
+    Новая сводка, как и сводка с устаревшими триггерами, заполняется заново по истории.
+    """
+    conn = get_connection()
+    existing = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type IN ('table', 'trigger')"))
+    with conn:
+        for table, period_format in PERIODS.values():
+            triggers = _rollup_triggers(table, period_format)
+            if table in existing and all(existing.get(name) == sql.strip() for name, sql in triggers.items()):
+                continue
+            _create_rollup(conn, table)
+            for name, sql in triggers.items():
+                conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+                conn.execute(sql)
+            conn.execute(f'DELETE FROM {table}')
+            _backfill_rollup(conn, table, period_format)
+
+
+def get_rollup(period: str = 'day', date_from=None, date_to=None, item_type=None, limit=None):
+    """Итоги по периодам и типам изделий, от новых периодов к старым.
+
+    Строки: (период, тип изделия, количество, расход ткани, пошив, материалы).
+    date_from и date_to (включительно) - datetime или строки '%Y-%m-%d'.
+    limit ограничивает количество периодов.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Неизвестный период: {period}")
+    table, period_format = PERIODS[period]
+    conditions = []
+    params = []
+    for value, operator in ((date_from, '>='), (date_to, '<=')):
+        if value is not None:
+            if isinstance(value, str):
+                value = datetime.strptime(value, '%Y-%m-%d')
+            conditions.append(f'period {operator} ?')
+            params.append(value.strftime(period_format))
+    if item_type is not None:
+        conditions.append('item_type = ?')
+        params.append(item_type)
+    if limit is not None:
+        conditions.append(f'period IN (SELECT DISTINCT period FROM {table} ORDER BY period DESC LIMIT ?)')
+        params.append(limit)
+    sql = f'SELECT period, item_type, items_count, fabric, sewing_cost, material_cost FROM {table}'
+    if conditions:
+        sql += ' WHERE ' + ' AND '.join(conditions)
+    sql += ' ORDER BY period DESC, item_type'
+    return get_connection().execute(sql, params).fetchall()
@@ -0,0 +1,68 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+
+# Количество потоков, выполняющих запросы к БД
+DB_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix='clothing-db')
+        return _executor
+
+
+async def _run(func, *args, **kwargs):
+    """Выполнение блокирующей функции database в потоке БД без блокировки цикла событий"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def init_db_async():
+    """Асинхронный аналог database.init_db"""
+    return await _run(database.init_db)
+
+
+async def save_calculation_async(items, total_fabric, total_sewing, total_materials, grand_total, item_rows=()):
+    """Асинхронный аналог database.save_calculation"""
+    # Строки изделий материализуются до передачи в поток БД
+    return await _run(database.save_calculation, items, total_fabric, total_sewing, total_materials,
+                      grand_total, list(item_rows))
+
+
+async def save_calculations_many_async(rows, chunk_size: int = database.BULK_CHUNK_SIZE):
+    """Асинхронный аналог database.save_calculations_many"""
+    return await _run(database.save_calculations_many, list(rows), chunk_size)
+
+
+async def get_history_async():
+    """Асинхронный аналог database.get_history"""
+    return await _run(database.get_history)
+
+
+async def iter_history_pages_async(page_size: int = database.HISTORY_PAGE_SIZE, date_from=None, date_to=None):
+    """Асинхронная постраничная выдача истории (см. database.iter_history_pages)"""
+    pages = database.iter_history_pages(page_size, date_from, date_to)
+    while True:
+        page = await _run(next, pages, None)
+        if page is None:
+            return
+        yield page
+
+
+def shutdown():
+    """Остановка потоков БД и закрытие их соединений"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+    database.close_connections()
@@ -0,0 +1,145 @@
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import groupby, islice
+
+import database
+from clothing_package import ClothingCalculator, metrics
+from clothing_package.records import item_from_dict, item_row
+
+# Количество заказов, обрабатываемых и записываемых за один шаг
+BATCH_CHUNK_SIZE = 1000
+
+RESULT_FIELDS = ('order_id', 'items_count', 'total_fabric', 'total_sewing_cost', 'total_material_cost',
+                 'grand_total')
+
+
+def read_jsonl_orders(path: str):
+    """Заказы из JSONL: по одному объекту {"order_id": ..., "items": [...]} на строку"""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                order = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Строка {line_number}: некорректный JSON ({e})") from None
+            if not isinstance(order, dict) or not isinstance(order.get('items'), list):
+                raise ValueError(f"Строка {line_number}: ожидается объект заказа со списком items")
+            yield str(order.get('order_id', line_number)), order['items']
+
+
+def read_csv_orders(path: str):
+    """Заказы из CSV: строка на изделие, подряд идущие строки с одним order_id - один заказ.
+
+    Колонки: order_id, type, name, size, fabric_price, accessories_price и параметры
+    изделий (has_lining, pockets_count, has_belt, is_classic). Костюмы в CSV не поддерживаются.
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = ({key: value for key, value in row.items() if value not in (None, '')}
+                for row in csv.DictReader(f))
+        for order_id, items in groupby(rows, key=lambda row: row.get('order_id', '')):
+            yield order_id, list(items)
+
+
+def read_orders(path: str, input_format: str = None):
+    """Потоковое чтение заказов; формат определяется по расширению файла"""
+    if input_format is None:
+        input_format = 'csv' if os.path.splitext(path)[1].lower() == '.csv' else 'jsonl'
+    if input_format == 'csv':
+        return read_csv_orders(path)
+    if input_format == 'jsonl':
+        return read_jsonl_orders(path)
+    raise ValueError(f"Неизвестный формат заказов: {input_format}")
+
+
+def price_order(order_id: str, items, with_items: bool = False) -> tuple:
+    """Итоги одного заказа в порядке RESULT_FIELDS.
+
+    При with_items возвращается пара (итоги, строки изделий для calculation_items).
+    """
+    calculator = ClothingCalculator()
+    for data in items:
+        try:
+            calculator.add_item(item_from_dict(data))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Заказ {order_id}: некорректное изделие {data!r} ({e!r})") from None
+    total_sewing = calculator.calculate_total_sewing_cost()
+    total_materials = calculator.calculate_total_material_cost()
+    result = (order_id, len(calculator), calculator.calculate_total_fabric(), total_sewing, total_materials,
+              total_sewing + total_materials)
+    if with_items:
+        return result, [item_row(item) for item in calculator.iter_items()]
+    return result
+
+
+def price_orders(orders, with_items: bool = False) -> list:
+    """Итоги порции заказов; выполняется и в процессах-обработчиках"""
+    return [price_order(order_id, items, with_items) for order_id, items in orders]
+
+
+def _priced_chunks(orders, chunk_size: int, workers: int, with_items: bool = False):
+    """Итоги по порциям заказов в исходном порядке.
+
+    При workers > 1 порции считаются в пуле процессов. В работе одновременно
+    не больше двух порций на процесс, чтобы память оставалась ограниченной.
+    Между процессами передаются только списки заказов и кортежи итогов.
+    """
+    chunks = iter(lambda: list(islice(orders, chunk_size)), [])
+    if workers <= 1:
+        yield from map(partial(price_orders, with_items=with_items), chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(price_orders, chunk, with_items))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _format_result(result: tuple) -> tuple:
+    order_id, items_count, *totals = result
+    return (order_id, items_count, *(f"{value:.2f}" for value in totals))
+
+
+def run_batch(orders_path: str, out_path: str, chunk_size: int = BATCH_CHUNK_SIZE, save_db: bool = False,
+              input_format: str = None, workers: int = 1) -> int:
+    """Пакетный расчёт заказов с записью итогов в CSV.
+
+    Заказы читаются и обрабатываются порциями по chunk_size, результаты каждой
+    порции сразу дописываются в файл, поэтому память не зависит от размера входа.
+    При workers > 1 порции распределяются по процессам; порядок и содержимое
+    результатов те же, что при обработке в одном процессе.
+    При save_db итоги заказов сохраняются в БД вместе с изделиями.
+    Возвращает количество заказов.
+    """
+    if chunk_size < 1:
+        raise ValueError("Размер порции должен быть положительным")
+    if workers < 1:
+        raise ValueError("Количество процессов должно быть положительным")
+    orders = read_orders(orders_path, input_format)
+    if save_db:
+        database.init_db()
+    processed = 0
+    with open(out_path, 'w', encoding='utf-8', newline='') as out:
+        writer = csv.writer(out)
+        writer.writerow(RESULT_FIELDS)
+        for results in _priced_chunks(orders, chunk_size, workers, save_db):
+            if save_db:
+                results, item_rows = zip(*results)
+            writer.writerows(map(_format_result, results))
+            out.flush()
+            if save_db:
+                database.save_calculations_many((f"Заказ {order_id}: {items_count} изд.", *totals, rows)
+                                                for (order_id, items_count, *totals), rows in zip(results, item_rows))
+            processed += len(results)
+    return processed
+
+
+metrics.instrument(sys.modules[__name__], 'price_orders', 'read_orders', prefix='batch_processing')
@@ -0,0 +1,41 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+
+
+def rows(count):
+    for i in range(count):
+        yield f"1. Пиджак {i} (размер 50)", 3.1, 5300.0, 3600.0, 8900.0
+
+
+def run(label, count, save):
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_NAME = os.path.join(tmp, 'bench.db')
+        database.init_db()
+        start = time.perf_counter()
+        save(count)
+        elapsed = time.perf_counter() - start
+        assert len(database.get_history()) == count
+        database.close_connections()
+    print(f"{label:<32} {count:>7} строк  {elapsed:7.3f} с  {count / elapsed:>10.0f} строк/с")
+    return elapsed
+
+
+def per_row(count):
+    for row in rows(count):
+        database.save_calculation(*row)
+
+
+def main(count=20_000):
+    slow = run("save_calculation по одной", count, per_row)
+    fast = run("save_calculations_many", count, lambda n: database.save_calculations_many(rows(n)))
+    print(f"Ускорение: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
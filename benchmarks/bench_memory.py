@@ -0,0 +1,77 @@
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers, ClothingCalculator
+
+
+# Допустимый рост памяти обычной корзины относительно исходной версии
+THRESHOLD = 0.25
+
+
+class BaselineItem:
+    """Изделие в раскладке исходной версии: атрибуты в __dict__, без кэша расчётов и подписок"""
+
+    def __init__(self, name, size, fabric_price, accessories_price, first_option, second_option):
+        self._name = name
+        self._size = size
+        self._fabric_price = fabric_price
+        self._accessories_price = accessories_price
+        self._first_option = first_option
+        self._second_option = second_option
+        # Исходная версия считала расход ткани в конструкторе и хранила его
+        self._fabric_consumption = round(1.5 + max(0, size - 48) * 0.2, 2)
+
+
+class BaselineCalculator:
+    """Корзина исходной версии: список изделий"""
+
+    def __init__(self, compact=False):
+        self._items = []
+
+    def add_item(self, item):
+        self._items.append(item)
+
+
+def fill(calculator, count, jacket_cls=Jacket, trousers_cls=Trousers):
+    for i in range(count):
+        size = 44 + i % 21
+        # Цены разные, как при разборе реальных заказов
+        fabric_price = float(800 + i % 1200)
+        accessories_price = float(100 + i % 500)
+        if i % 2:
+            calculator.add_item(jacket_cls("Пиджак классический", size, fabric_price, accessories_price, True, 4))
+        else:
+            calculator.add_item(trousers_cls("Брюки классические", size, fabric_price, accessories_price, False, True))
+    return calculator
+
+
+def measure(label, count, calculator_cls=ClothingCalculator, **kwargs):
+    compact = kwargs.pop('compact', False)
+    tracemalloc.start()
+    calculator = fill(calculator_cls(compact=compact), count, **kwargs)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {current / 2 ** 20:8.2f} МБ  {current / count:7.1f} байт/изделие")
+    del calculator
+    return current
+
+
+def main(count=100_000) -> int:
+    """Замер памяти; 1, если обычная корзина тяжелее исходной версии больше чем на THRESHOLD"""
+    print(f"Изделий в корзине: {count}")
+    baseline = measure("Исходная версия", count, BaselineCalculator,
+                       jacket_cls=BaselineItem, trousers_cls=BaselineItem)
+    regular = measure("Обычная корзина", count)
+    compact = measure("Компактное ItemStore", count, compact=True)
+    print(f"Обычная корзина: {regular / baseline:.2f}x исходной версии, ItemStore: {compact / baseline:.2f}x")
+    if regular > baseline * (1 + THRESHOLD):
+        print(f"РОСТ ПАМЯТИ больше {THRESHOLD:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
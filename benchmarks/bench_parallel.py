@@ -0,0 +1,49 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from batch_processing import run_batch
+
+
+def write_orders(path, count):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            items = []
+            for j in range(10):
+                size = 44 + (i + j) % 21
+                items.append({"type": "jacket", "name": "Пиджак", "size": size, "fabric_price": 800 + j * 50,
+                              "accessories_price": 300, "has_lining": j % 2 == 0, "pockets_count": j % 5})
+                items.append({"type": "trousers", "name": "Брюки", "size": size, "fabric_price": 700 + j * 40,
+                              "accessories_price": 150, "has_belt": j % 3 == 0, "is_classic": True})
+            f.write(json.dumps({"order_id": i, "items": items}, ensure_ascii=False) + "\n")
+
+
+def main(count=50_000):
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        orders = os.path.join(tmp, 'orders.jsonl')
+        write_orders(orders, count)
+        print(f"Заказов: {count} (по 20 изделий), ядер: {cpus}")
+        reference = None
+        baseline = None
+        workers = 1
+        while workers <= cpus:
+            out = os.path.join(tmp, f'results_{workers}.csv')
+            start = time.perf_counter()
+            run_batch(orders, out, workers=workers)
+            elapsed = time.perf_counter() - start
+            with open(out, 'rb') as f:
+                content = f.read()
+            reference = reference or content
+            baseline = baseline or elapsed
+            print(f"--workers {workers:<3} {elapsed:7.2f} с  ускорение {baseline / elapsed:4.1f}x  "
+                  f"результат {'совпадает' if content == reference else 'ОТЛИЧАЕТСЯ'}")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers
+from clothing_package import pricing_tables as tables
+
+
+def measure(func, args):
+    start = time.perf_counter()
+    for arguments in args:
+        func(*arguments)
+    return time.perf_counter() - start
+
+
+def main(count=1_000_000):
+    jackets = [(44 + i % 21, i % 2 == 0, i % 6) for i in range(count)]
+    trousers = [(44 + i % 21, i % 3 == 0, i % 4 != 0) for i in range(count)]
+    print(f"Расчётов: {count}")
+    for name, formula, table, args in (
+            ("ткань пиджака", tables.jacket_fabric_formula, tables.jacket_fabric, jackets),
+            ("пошив пиджака", tables.jacket_sewing_formula, tables.jacket_sewing, [(s, p) for s, _, p in jackets]),
+            ("ткань брюк", tables.trousers_fabric_formula, tables.trousers_fabric, trousers),
+            ("пошив брюк", tables.trousers_sewing_formula, tables.trousers_sewing, [(s, c) for s, _, c in trousers])):
+        by_formula = measure(formula, args)
+        by_table = measure(table, args)
+        print(f"{name:<14} формула {by_formula / count * 1e9:6.0f} нс  таблица {by_table / count * 1e9:6.0f} нс  "
+              f"ускорение {by_formula / by_table:4.1f}x")
+
+    # Полный расчёт нового изделия: создание и все три показателя
+    start = time.perf_counter()
+    for i, (size, lining, pockets) in enumerate(jackets[:count // 10]):
+        item = Jacket("Пиджак", size, 1000.0, 300.0, lining, pockets) if i % 2 else \
+            Trousers("Брюки", size, 800.0, 150.0, lining, pockets % 2 == 0)
+        item.calculate_fabric_consumption()
+        item.calculate_sewing_cost()
+        item.calculate_total_cost()
+    elapsed = time.perf_counter() - start
+    print(f"новое изделие   {elapsed / (count // 10) * 1e9:6.0f} нс на изделие")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
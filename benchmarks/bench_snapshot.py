@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers, ClothingCalculator
+from clothing_package.snapshot import load_snapshot, save_snapshot
+
+
+def main(count=1_000_000):
+    calculator = ClothingCalculator(compact=True)
+    for i in range(count):
+        size = 44 + i % 21
+        calculator.add_item(Jacket("Пиджак", size, 1000.0, 300.0, i % 2 == 0, i % 5) if i % 2 else
+                            Trousers("Брюки", size, 800.0, 150.0, i % 3 == 0, True))
+    print(f"Изделий в корзине: {count}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cart.snapshot')
+        start = time.perf_counter()
+        save_snapshot(calculator, path)
+        print(f"Сохранение снимка      {time.perf_counter() - start:8.3f} с  ({os.path.getsize(path) / 2**20:.1f} МБ)")
+
+        start = time.perf_counter()
+        loaded = load_snapshot(path)
+        print(f"Открытие снимка (mmap) {time.perf_counter() - start:8.3f} с")
+
+        start = time.perf_counter()
+        total = loaded.calculate_total_material_cost()
+        item = loaded.get_item(count // 2)
+        print(f"Итоги и одно изделие   {time.perf_counter() - start:8.3f} с  ({item}, итого {total:.2f})")
+
+        start = time.perf_counter()
+        rebuilt = ClothingCalculator(compact=True)
+        for item in loaded.iter_items():
+            rebuilt.add_item(item.materialize())
+        print(f"Пересборка по объектам {time.perf_counter() - start:8.3f} с")
+        del loaded
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from clothing_package import Jacket, Trousers, ThreePieceSuit, ClothingCalculator
+from clothing_package.records import item_row
+from reports import REPORT_WRITERS
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+DEFAULT_SIZES = (1, 1000, 100_000)
+# Допустимое замедление относительно базовой линии (0.25 = на 25%)
+DEFAULT_THRESHOLD = 0.25
+# Замеры короче этого порога слишком шумные для сравнения, секунды
+MIN_COMPARABLE = 0.001
+
+
+def _jacket(i):
+    return Jacket("Пиджак", 44 + i % 21, 800.0 + i % 1200, 100.0 + i % 500, i % 2 == 0, i % 6)
+
+
+def _trousers(i):
+    return Trousers("Брюки", 44 + i % 21, 700.0 + i % 900, 50.0 + i % 300, i % 3 == 0, i % 4 != 0)
+
+
+def _cart(size):
+    calculator = ClothingCalculator()
+    for i in range(size):
+        calculator.add_item(_jacket(i) if i % 2 else _trousers(i))
+    return calculator
+
+
+def bench_calculator_totals(size):
+    """Наполнение корзины, изменение параметров и чтение итогов"""
+    items = [_jacket(i) if i % 2 else _trousers(i) for i in range(size)]
+    start = time.perf_counter()
+    calculator = ClothingCalculator()
+    for item in items:
+        calculator.add_item(item)
+    for item in items[::10]:
+        if isinstance(item, Jacket):
+            item.pockets_count += 1
+        else:
+            item.has_belt = not item.has_belt
+    for _ in range(100):
+        calculator.calculate_total_fabric()
+        calculator.calculate_total_sewing_cost()
+        calculator.calculate_total_material_cost()
+    return time.perf_counter() - start
+
+
+def bench_suit_composition(size):
+    """Сборка костюмов и расчёт их показателей"""
+    pairs = [(_jacket(i), _trousers(i)) for i in range(size)]
+    start = time.perf_counter()
+    for jacket, trousers in pairs:
+        suit = ThreePieceSuit("Костюм", jacket, trousers, None)
+        suit.calculate_fabric_consumption()
+        suit.calculate_sewing_cost()
+        suit.calculate_total_cost()
+    return time.perf_counter() - start
+
+
+def _with_database(func):
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = database.DB_NAME
+        database.DB_NAME = os.path.join(tmp, 'bench.db')
+        try:
+            database.init_db()
+            return func()
+        finally:
+            database.close_connections()
+            database.DB_NAME = previous
+
+
+def bench_db_save(size):
+    """Сохранение расчётов по одному с изделиями"""
+    rows = [item_row(_jacket(1))]
+
+    def run():
+        start = time.perf_counter()
+        for i in range(size):
+            database.save_calculation(f"1. Пиджак {i}", 3.1, 5300, 3600, 8900, rows)
+        return time.perf_counter() - start
+
+    return _with_database(run)
+
+
+def bench_db_history(size):
+    """Чтение всей истории из size записей постранично"""
+    def run():
+        database.save_calculations_many((f"1. Пиджак {i}", 3.1, 5300, 3600, 8900) for i in range(size))
+        start = time.perf_counter()
+        count = sum(1 for _ in database.iter_history())
+        assert count == size
+        return time.perf_counter() - start
+
+    return _with_database(run)
+
+
+def _bench_report(report_format):
+    def bench(size):
+        calculator = _cart(size)
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            REPORT_WRITERS[report_format](calculator, os.path.join(tmp, f'report.{report_format}'))
+            return time.perf_counter() - start
+
+    bench.__doc__ = f"Сохранение отчёта .{report_format}"
+    return bench
+
+
+BENCHMARKS = {
+    'calculator_totals': bench_calculator_totals,
+    'suit_composition': bench_suit_composition,
+    'db_save': bench_db_save,
+    'db_history': bench_db_history,
+    'report_csv': _bench_report('csv'),
+    'report_json': _bench_report('json'),
+    'report_docx': _bench_report('docx'),
+}
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=3, names=None, log=print) -> dict:
+    """Прогон тестов производительности: лучшее время из repeat запусков"""
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            try:
+                seconds = min(bench(size) for _ in range(repeat))
+            except ImportError as e:
+                log(f"{name}[{size}]: пропущен ({e})")
+                continue
+            results[f"{name}[{size}]"] = seconds
+            log(f"{name}[{size}]: {seconds * 1000:.3f} мс")
+    return {
+        'meta': {'date': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                 'platform': platform.platform(), 'sizes': list(sizes), 'repeat': repeat},
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Замедления относительно базовой линии: [(замер, было, стало, отношение)]"""
+    regressions = []
+    for key, before in baseline['results'].items():
+        after = current['results'].get(key)
+        if after is None or max(before, after) < MIN_COMPARABLE:
+            continue
+        ratio = after / before if before else float('inf')
+        if ratio > 1 + threshold:
+            regressions.append((key, before, after, ratio))
+    return regressions
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _report_regressions(regressions, threshold) -> int:
+    if not regressions:
+        print(f"Замедлений больше {threshold:.0%} нет")
+        return 0
+    for key, before, after, ratio in regressions:
+        print(f"ЗАМЕДЛЕНИЕ {key}: {before * 1000:.3f} мс -> {after * 1000:.3f} мс ({ratio:.2f}x)")
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Тесты производительности калькулятора")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help="прогон и сохранение результатов в JSON")
+    run.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="размеры через запятую")
+    run.add_argument('--repeat', type=int, default=3)
+    run.add_argument('--only', help="имена замеров через запятую")
+    run.add_argument('--out', help="файл результатов (по умолчанию baselines/<дата>.json)")
+    run.add_argument('--baseline', help="сразу сравнить с базовой линией")
+    run.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    cmp = subparsers.add_parser('compare', help="сравнение результатов с базовой линией")
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        return _report_regressions(compare(_load(args.baseline), _load(args.current), args.threshold),
+                                   args.threshold)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    names = args.only.split(',') if args.only else None
+    results = run_suite(sizes, args.repeat, names)
+    out = args.out or os.path.join(BASELINES_DIR, f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены: {out}")
+    if args.baseline:
+        return _report_regressions(compare(_load(args.baseline), results, args.threshold), args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
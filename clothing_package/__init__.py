@@ -1,2 +1,3 @@
 from .clothing_items import Jacket, Trousers, ThreePieceSuit
-from .calculator import ClothingCalculator
\ No newline at end of file
+from .calculator import ClothingCalculator
+from .item_store import ItemStore, ItemView
@@ -1,15 +1,57 @@
+import weakref
 from abc import ABC, abstractmethod
+from functools import wraps
+
+from . import metrics
+from .money import from_kopecks, material_cost, round_material, to_kopecks, to_mm
+
+
+def memoized(slot: str):
+    """Кэширует результат расчёта изделия в указанном слоте (None - не рассчитано)"""
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self):
+            value = getattr(self, slot)
+            if value is None:
+                value = method(self)
+                setattr(self, slot, value)
+            return value
+
+        return wrapper
+
+    return decorator
 
 
 class Clothing(ABC):
     """Абстрактный базовый класс для одежды"""
 
+    __slots__ = ('_name', '_size', '_fabric_price', '_accessories_price',
+                 '_fabric_consumption', '_sewing_cost', '_total_cost', '_fabric_mm', '_dependents', '__weakref__')
+
     def __init__(self, name: str, size: int, fabric_price: float, accessories_price: float):
         self._name = name
         self._size = size
         self._fabric_price = fabric_price
         self._accessories_price = accessories_price
-        self._fabric_consumption = 0.0
+        # Кэш расчётов, сбрасывается при изменении параметров
+        self._fabric_consumption = None
+        self._sewing_cost = None
+        self._total_cost = None
+        self._fabric_mm = None
+        # Слабые ссылки на объекты, чьи расчёты зависят от этого изделия:
+        # None, одна ссылка или список ссылок (см. _add_dependent)
+        self._dependents = None
+
+    def __getstate__(self):
+        """Состояние для pickle и copy: подписки зависимых (слабые ссылки) не переносятся"""
+        return {slot: getattr(self, slot) for cls in type(self).__mro__ for slot in getattr(cls, '__slots__', ())
+                if slot not in ('_dependents', '__weakref__')}
+
+    def __setstate__(self, state: dict):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._dependents = None
 
     @property
     def name(self):
@@ -37,13 +79,108 @@ class Clothing(ABC):
         """Расчёт стоимости пошива"""
         pass
 
+    def _add_dependent(self, dependent):
+        """Подписывает объект на изменения изделия.
+
+        Обычно подписчик один (корзина или костюм) и хранится сама ссылка, без
+        списка. Ссылки на удалённые объекты вычищаются при новых подписках,
+        поэтому подписки временных костюмов не копятся.
+        """
+        ref = weakref.ref(dependent)
+        dependents = self._dependents
+        if dependents is None or (type(dependents) is not list and dependents() is None):
+            self._dependents = ref
+        elif type(dependents) is not list:
+            self._dependents = [dependents, ref]
+        else:
+            count = len(dependents)
+            # Чистка на степенях двойки: в среднем O(1) на подписку, а мёртвых
+            # ссылок в списке не больше, чем живых
+            if count >= 4 and count & (count - 1) == 0:
+                dependents[:] = [ref for ref in dependents if ref() is not None]
+            dependents.append(ref)
+
+    def _remove_dependent(self, dependent):
+        """Отписывает объект (одну подписку) от изменений изделия"""
+        dependents = self._dependents
+        if type(dependents) is not list:
+            if dependents is not None and dependents() is dependent:
+                self._dependents = None
+            return
+        for i, ref in enumerate(dependents):
+            if ref() is dependent:
+                del dependents[i]
+                return
+
+    def _live_dependents(self):
+        dependents = self._dependents
+        if dependents is None:
+            return []
+        if type(dependents) is not list:
+            dependent = dependents()
+            if dependent is None:
+                self._dependents = None
+                return []
+            return [dependent]
+        live = [ref() for ref in dependents]
+        if None in live:
+            self._dependents = [ref for ref, dependent in zip(dependents, live) if dependent is not None]
+            live = [dependent for dependent in live if dependent is not None]
+        return live
+
+    def _notify_changing(self):
+        """Сообщает зависимым объектам, что изделие сейчас изменится"""
+        for dependent in self._live_dependents():
+            dependent._dependency_changing(self)
+
+    def _notify_changed(self):
+        """Сообщает зависимым объектам, что изделие изменилось"""
+        for dependent in self._live_dependents():
+            dependent._dependency_changed(self)
+
+    def _invalidate(self):
+        """Сброс кэша расчётов"""
+        self._fabric_consumption = None
+        self._sewing_cost = None
+        self._total_cost = None
+        self._fabric_mm = None
+
+    def _update_option(self, attr: str, value):
+        """Изменение параметра изделия со сбросом кэша и оповещением зависимых"""
+        self._notify_changing()
+        setattr(self, attr, value)
+        self._invalidate()
+        self._notify_changed()
+
+    @memoized('_total_cost')
     def calculate_total_cost(self) -> float:
-        """Общая стоимость изделия"""
-        fabric_cost = self.calculate_fabric_consumption() * self._fabric_price
-        return fabric_cost + self._accessories_price
+        """Общая стоимость материалов изделия, округлённая до копейки"""
+        return from_kopecks(round_material(self.exact_material_cost()))
+
+    # Целочисленные расчёты (миллиметры и копейки) для точного суммирования
+
+    @memoized('_fabric_mm')
+    def fabric_mm(self) -> int:
+        """Расход ткани в миллиметрах"""
+        return to_mm(self.calculate_fabric_consumption())
+
+    def sewing_kopecks(self) -> int:
+        """Стоимость пошива в копейках"""
+        return to_kopecks(self.calculate_sewing_cost())
+
+    def material_kopecks(self) -> int:
+        """Стоимость материалов в копейках (та же, что calculate_total_cost)"""
+        return to_kopecks(self.calculate_total_cost())
+
+    def exact_material_cost(self):
+        """Точная стоимость материалов до округления (см. money.material_cost)"""
+        return material_cost(self.fabric_mm(), self._fabric_price, self._accessories_price)
 
     def __str__(self):
         return f"{self._name} (размер {self._size})"
 
     def __repr__(self):
-        return f"{self.__class__.__name__}('{self._name}', {self._size}, {self._fabric_price}, {self._accessories_price})"
\ No newline at end of file
+        return f"{self.__class__.__name__}('{self._name}', {self._size}, {self._fabric_price}, {self._accessories_price})"
+
+
+metrics.instrument(Clothing, 'calculate_total_cost')
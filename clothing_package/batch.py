@@ -0,0 +1,96 @@
+import numpy as np
+
+from . import money
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Векторный аналог round(x, 2), совпадающий со встроенным round"""
+    scaled = values * 100
+    result = np.rint(scaled) / 100
+    # Вблизи половины копейки результат np.rint может отличаться от round(),
+    # поэтому такие значения досчитываем поэлементно
+    ambiguous = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if ambiguous.any():
+        result[ambiguous] = [round(value, 2) for value in values[ambiguous].tolist()]
+    return result
+
+
+def jacket_fabric_consumption(sizes, has_lining, pockets_count) -> np.ndarray:
+    """Расход ткани для массива пиджаков"""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    consumption = np.where(sizes > 48, 2.5 + (sizes - 48) * 0.2, 2.5)
+    consumption = np.where(np.asarray(has_lining, dtype=bool), consumption * 1.3, consumption)
+    consumption = consumption + np.asarray(pockets_count, dtype=np.int64) * 0.1
+    return _round2(consumption)
+
+
+def jacket_sewing_cost(sizes, pockets_count) -> np.ndarray:
+    """Стоимость пошива для массива пиджаков"""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    return 5000 + np.maximum(0, sizes - 48) * 200 + np.asarray(pockets_count, dtype=np.int64) * 150
+
+
+def trousers_fabric_consumption(sizes, has_belt, is_classic) -> np.ndarray:
+    """Расход ткани для массива брюк"""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    consumption = np.where(sizes > 50, 1.5 + (sizes - 50) * 0.15, 1.5)
+    consumption = np.where(np.asarray(is_classic, dtype=bool), consumption * 1.2, consumption)
+    consumption = np.where(np.asarray(has_belt, dtype=bool), consumption + 0.2, consumption)
+    return _round2(consumption)
+
+
+def trousers_sewing_cost(sizes, is_classic) -> np.ndarray:
+    """Стоимость пошива для массива брюк"""
+    sizes = np.asarray(sizes, dtype=np.int64)
+    return 3000 + np.maximum(0, sizes - 50) * 150 + np.where(np.asarray(is_classic, dtype=bool), 500, 0)
+
+
+def material_cost(fabric_consumption, fabric_prices, accessories_prices) -> np.ndarray:
+    """Стоимость материалов (ткань плюс фурнитура), округлённая до копейки"""
+    return material_kopecks(fabric_consumption, fabric_prices, accessories_prices) / money.KOPECKS
+
+
+def price_jackets(sizes, fabric_prices, accessories_prices, has_lining, pockets_count):
+    """Расход ткани, стоимость пошива и материалов для массива пиджаков"""
+    fabric = jacket_fabric_consumption(sizes, has_lining, pockets_count)
+    sewing = jacket_sewing_cost(sizes, pockets_count)
+    return fabric, sewing, material_cost(fabric, fabric_prices, accessories_prices)
+
+
+def price_trousers(sizes, fabric_prices, accessories_prices, has_belt, is_classic):
+    """Расход ткани, стоимость пошива и материалов для массива брюк"""
+    fabric = trousers_fabric_consumption(sizes, has_belt, is_classic)
+    sewing = trousers_sewing_cost(sizes, is_classic)
+    return fabric, sewing, material_cost(fabric, fabric_prices, accessories_prices)
+
+
+def material_kopecks(fabric_consumption, fabric_prices, accessories_prices) -> np.ndarray:
+    """Стоимость материалов в копейках (int64), как Clothing.material_kopecks"""
+    return money.material_kopecks_array((money.to_mm_array(fabric_consumption), fabric_prices, accessories_prices))
+
+
+def combine_suits(jacket_figures, trousers_figures, materials_kopecks):
+    """Показатели костюмов (без жилета) из показателей пиджаков и брюк.
+
+    materials_kopecks - стоимость материалов костюмов в копейках (см. price_suits).
+    """
+    jacket_fabric, jacket_sewing, _ = jacket_figures
+    trousers_fabric, trousers_sewing, _ = trousers_figures
+    fabric = (money.to_mm_array(jacket_fabric) + money.to_mm_array(trousers_fabric)) / money.MM_PER_M
+    # Скидка за комплект с отбрасыванием дробной части рубля, как в ThreePieceSuit
+    sewing = (np.asarray(jacket_sewing, dtype=np.int64) + np.asarray(trousers_sewing, dtype=np.int64)) * 9 // 10
+    return fabric, sewing, np.asarray(materials_kopecks) / money.KOPECKS
+
+
+def price_suits(jacket_columns: dict, trousers_columns: dict):
+    """Показатели костюмов по столбцам параметров пиджаков и брюк.
+
+    Столбцы передаются словарями с ключами аргументов price_jackets и price_trousers.
+    """
+    jackets = price_jackets(**jacket_columns)
+    trousers = price_trousers(**trousers_columns)
+    # Стоимость частей складывается точно и округляется один раз, как в ThreePieceSuit
+    materials = money.material_kopecks_array(
+        (money.to_mm_array(jackets[0]), jacket_columns['fabric_prices'], jacket_columns['accessories_prices']),
+        (money.to_mm_array(trousers[0]), trousers_columns['fabric_prices'], trousers_columns['accessories_prices']))
+    return combine_suits(jackets, trousers, materials)
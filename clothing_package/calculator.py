@@ -1,41 +1,233 @@
-from typing import List
+import numbers
+from itertools import compress, islice
+from typing import Iterator, List, Tuple
+from . import metrics
 from .abstract_clothing import Clothing
+from .item_store import ItemStore, KINDS
+from .money import from_kopecks, from_mm, to_kopecks
 
 
 class ClothingCalculator:
-    """Калькулятор для расчётов одежды"""
+    """Калькулятор для расчётов одежды.
 
-    def __init__(self):
-        self._items: List[Clothing] = []
+    Каждое добавленное изделие получает постоянный номер (id, начиная с 1),
+    который не меняется при удалении других изделий. Поиск и удаление по
+    номеру - O(1); изделия перебираются в порядке добавления.
 
-    def add_item(self, item: Clothing):
+    Индексы по типу, размеру и названию строятся при первом запросе с
+    фильтром и дальше поддерживаются при добавлении и удалении; корзина без
+    таких запросов не тратит на них память.
+
+    В компактном режиме изделия копируются в колоночное ItemStore, номер
+    изделия - номер его строки плюс один, а наружу выдаются лёгкие
+    представления ItemView. Вместо индексов фильтры в этом режиме
+    проверяются по столбцам хранилища.
+
+    Итоговые суммы поддерживаются инкрементально: при добавлении и удалении
+    изделий, а также при изменении параметров изделий через их свойства.
+    Итоги хранятся целыми числами (миллиметры и копейки), поэтому суммируются
+    точно и без накопления погрешности; методы calculate_* возвращают их в
+    метрах и рублях.
+    """
+
+    def __init__(self, compact: bool = False):
+        self._store = ItemStore() if compact else None
+        # Обычный режим: изделие с номером id - элемент id - 1, удалённые - None.
+        # Индексы значение -> {id: None} (упорядоченное множество), None - ещё не построены
+        self._items = []
+        self._by_type = None
+        self._by_size = None
+        self._by_name = None
+        # Компактный режим: по байту на строку хранилища, 1 - изделие в корзине
+        self._alive = bytearray()
+        self._count = 0
+        self._total_fabric = 0
+        self._total_sewing = 0
+        self._total_material = 0
+        self._total_accessories = 0
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        # Подписки изделий не копируются и не сериализуются (см. Clothing.__getstate__)
+        for item in self._items:
+            if item is not None:
+                item._add_dependent(self)
+
+    @property
+    def compact(self):
+        return self._store is not None
+
+    def _account(self, item: Clothing, sign: int):
+        self._total_fabric += sign * item.fabric_mm()
+        self._total_sewing += sign * item.sewing_kopecks()
+        self._total_material += sign * item.material_kopecks()
+        self._total_accessories += sign * to_kopecks(item.accessories_price)
+
+    def _dependency_changing(self, item: Clothing):
+        self._account(item, -1)
+
+    def _dependency_changed(self, item: Clothing):
+        self._account(item, 1)
+
+    def _indexes(self, item: Clothing):
+        return (self._by_type, type(item)), (self._by_size, item.size), (self._by_name, item.name)
+
+    def _index(self, item_id: int, item: Clothing):
+        for index, key in self._indexes(item):
+            index.setdefault(key, {})[item_id] = None
+
+    def _build_indexes(self):
+        self._by_type, self._by_size, self._by_name = {}, {}, {}
+        for item_id in self._ids():
+            self._index(item_id, self._items[item_id - 1])
+
+    def add_item(self, item: Clothing) -> int:
+        """Добавляет изделие и возвращает его номер"""
+        self._account(item, 1)
+        if self._store is not None:
+            # В компактном режиме хранится копия, изменения объекта не отслеживаются
+            row = self._store.append(item)
+            self._alive.extend(bytes(row + 1 - len(self._alive)))
+            self._alive[row] = 1
+            self._count += 1
+            return row + 1
+        item._add_dependent(self)
         self._items.append(item)
+        self._count += 1
+        item_id = len(self._items)
+        if self._by_type is not None:
+            self._index(item_id, item)
+        return item_id
+
+    def get_item(self, item_id: int) -> Clothing:
+        """Изделие по номеру; KeyError, если его нет в корзине"""
+        if self._store is not None:
+            if not 0 < item_id <= len(self._alive) or not self._alive[item_id - 1]:
+                raise KeyError(item_id)
+            return self._store.view(item_id - 1)
+        item = self._items[item_id - 1] if 0 < item_id <= len(self._items) else None
+        if item is None:
+            raise KeyError(item_id)
+        return item
+
+    def remove_by_id(self, item_id: int):
+        """Удаление изделия по номеру за O(1); KeyError, если его нет в корзине"""
+        item = self.get_item(item_id)
+        self._count -= 1
+        if self._store is not None:
+            self._alive[item_id - 1] = 0
+        else:
+            self._items[item_id - 1] = None
+            if self._by_type is not None:
+                for index, key in self._indexes(item):
+                    bucket = index[key]
+                    del bucket[item_id]
+                    if not bucket:
+                        del index[key]
+            item._remove_dependent(self)
+        self._account(item, -1)
+
+    def remove_by_ids(self, item_ids):
+        """Удаление нескольких изделий по номерам"""
+        for item_id in item_ids:
+            self.remove_by_id(item_id)
+
+    def _ids(self) -> Iterator[int]:
+        if self._store is None:
+            return (item_id for item_id, item in enumerate(self._items, 1) if item is not None)
+        return compress(range(1, len(self._alive) + 1), self._alive)
 
     def remove_item(self, index: int):
-        if 0 <= index < len(self._items):
-            self._items.pop(index)
+        """Удаление изделия по позиции в корзине (O(n), предпочтительнее remove_by_id)"""
+        if 0 <= index < len(self):
+            self.remove_by_id(next(islice(self._ids(), index, None)))
+
+    def _filtered_ids(self, item_type, size, name) -> Iterator[int]:
+        if self._store is not None:
+            store = self._store
+            kind = None if item_type is None else KINDS.get(item_type, -1)
+            return (item_id for item_id in self._ids()
+                    if (kind is None or store._kinds[item_id - 1] == kind)
+                    and (size is None or store._sizes[item_id - 1] == size)
+                    and (name is None or store._names[item_id - 1] == name))
+        if self._by_type is None:
+            self._build_indexes()
+        buckets = [index.get(key, {}) for index, key in
+                   ((self._by_type, item_type), (self._by_size, size), (self._by_name, name)) if key is not None]
+        # Перебирается самый короткий индекс, остальные проверяются поиском в словаре
+        buckets.sort(key=len)
+        smallest, rest = buckets[0], buckets[1:]
+        return (item_id for item_id in smallest if all(item_id in bucket for bucket in rest))
+
+    def iter_entries(self, item_type=None, size=None, name=None) -> Iterator[Tuple[int, Clothing]]:
+        """Пары (номер, изделие) в порядке добавления.
+
+        item_type (класс изделия), size и name отбирают изделия по индексам
+        без перебора всей корзины.
+        """
+        if item_type is None and size is None and name is None:
+            ids = self._ids()
+        else:
+            ids = self._filtered_ids(item_type, size, name)
+        if self._store is None:
+            items = self._items
+            return ((item_id, items[item_id - 1]) for item_id in ids)
+        view = self._store.view
+        return ((item_id, view(item_id - 1)) for item_id in ids)
+
+    def iter_items(self, item_type=None, size=None, name=None) -> Iterator[Clothing]:
+        """Обход изделий без копирования списка (фильтры - см. iter_entries)"""
+        if item_type is None and size is None and name is None and self._store is None:
+            return (item for item in self._items if item is not None)
+        return (item for _, item in self.iter_entries(item_type, size, name))
 
     def get_items(self) -> List[Clothing]:
-        return self._items.copy()
+        return list(self.iter_items())
+
+    def total_fabric_mm(self) -> int:
+        """Общий расход ткани в миллиметрах"""
+        return self._total_fabric
+
+    def total_sewing_kopecks(self) -> int:
+        """Общая стоимость пошива в копейках"""
+        return self._total_sewing
+
+    def total_material_kopecks(self) -> int:
+        """Общая стоимость материалов в копейках"""
+        return self._total_material
 
     def calculate_total_fabric(self) -> float:
         """Общий расход ткани"""
-        return sum(item.calculate_fabric_consumption() for item in self._items)
+        return from_mm(self._total_fabric)
 
     def calculate_total_sewing_cost(self) -> float:
         """Общая стоимость пошива"""
-        return sum(item.calculate_sewing_cost() for item in self._items)
+        return from_kopecks(self._total_sewing)
 
     def calculate_total_material_cost(self) -> float:
         """Общая стоимость материалов"""
-        return sum(item.calculate_total_cost() for item in self._items)
+        return from_kopecks(self._total_material)
 
     def __len__(self):
-        return len(self._items)
+        return self._count
 
-    def __call__(self, fabric_price_per_meter: float):
-        """При вызове объекта пересчитывает все стоимости с новой ценой ткани"""
-        total = 0
-        for item in self._items:
-            total += item.calculate_fabric_consumption() * fabric_price_per_meter + item._accessories_price
-        return total
\ No newline at end of file
+    def price_sweep(self, prices):
+        """Стоимость материалов для набора цен ткани за метр (массив numpy)"""
+        import numpy as np  # numpy нужен только для развёртки по ценам
+
+        prices = np.asarray(prices, dtype=np.float64)
+        return from_mm(self._total_fabric) * prices + from_kopecks(self._total_accessories)
+
+    def __call__(self, fabric_price_per_meter):
+        """При вызове объекта пересчитывает все стоимости с новой ценой ткани.
+
+        Принимает одну цену или последовательность цен; во втором случае
+        возвращает массив стоимостей (см. price_sweep).
+        """
+        if isinstance(fabric_price_per_meter, numbers.Real):
+            return from_mm(self._total_fabric) * fabric_price_per_meter + from_kopecks(self._total_accessories)
+        return self.price_sweep(fabric_price_per_meter)
+
+
+metrics.instrument(ClothingCalculator, 'add_item', 'remove_by_id', 'remove_item', 'calculate_total_fabric',
+                   'calculate_total_sewing_cost', 'calculate_total_material_cost')
@@ -1,15 +1,23 @@
-from .abstract_clothing import Clothing
+from . import metrics
+from .abstract_clothing import Clothing, memoized
+from .money import KOPECKS, from_kopecks, from_mm, round_material
+from .pricing_tables import (jacket_fabric, jacket_fabric_mm, jacket_sewing, trousers_fabric, trousers_fabric_mm,
+                             trousers_sewing, vest_fabric_mm)
+
+# Пошив жилета костюма, копейки
+VEST_SEWING_KOPECKS = 2000_00
 
 
 class Jacket(Clothing):
     """Класс для пиджака"""
 
+    __slots__ = ('_has_lining', '_pockets_count')
+
     def __init__(self, name: str, size: int, fabric_price: float, accessories_price: float,
                  has_lining: bool = True, pockets_count: int = 4):
         super().__init__(name, size, fabric_price, accessories_price)
         self._has_lining = has_lining
         self._pockets_count = pockets_count
-        self._fabric_consumption = self.calculate_fabric_consumption()
 
     @property
     def has_lining(self):
@@ -17,8 +25,7 @@ class Jacket(Clothing):
 
     @has_lining.setter
     def has_lining(self, value: bool):
-        self._has_lining = value
-        self._fabric_consumption = self.calculate_fabric_consumption()
+        self._update_option('_has_lining', value)
 
     @property
     def pockets_count(self):
@@ -28,28 +35,21 @@ class Jacket(Clothing):
     def pockets_count(self, value: int):
         if value < 0:
             raise ValueError("Количество карманов не может быть отрицательным")
-        self._pockets_count = value
-        self._fabric_consumption = self.calculate_fabric_consumption()
+        self._update_option('_pockets_count', value)
 
+    @memoized('_fabric_consumption')
     def calculate_fabric_consumption(self) -> float:
         """Расход ткани для пиджака (2.5м + 0.2м на каждый размер больше 48)"""
-        base_consumption = 2.5
-        if self._size > 48:
-            base_consumption += (self._size - 48) * 0.2
+        return jacket_fabric(self._size, self._has_lining, self._pockets_count)
 
-        # Добавляем на подкладку и карманы
-        if self._has_lining:
-            base_consumption *= 1.3
-        base_consumption += self._pockets_count * 0.1
-
-        return round(base_consumption, 2)
+    @memoized('_fabric_mm')
+    def fabric_mm(self) -> int:
+        return jacket_fabric_mm(self._size, self._has_lining, self._pockets_count)
 
+    @memoized('_sewing_cost')
     def calculate_sewing_cost(self) -> float:
         """Стоимость пошива пиджака"""
-        base_cost = 5000
-        base_cost += max(0, self._size - 48) * 200
-        base_cost += self._pockets_count * 150
-        return base_cost
+        return jacket_sewing(self._size, self._pockets_count)
 
     def __add__(self, other):
         if isinstance(other, Trousers):
@@ -58,18 +58,19 @@ class Jacket(Clothing):
 
     def __len__(self):
         """Возвращает расход ткани в сантиметрах"""
-        return int(self._fabric_consumption * 100)
+        return int(self.calculate_fabric_consumption() * 100)
 
 
 class Trousers(Clothing):
     """Класс для брюк"""
 
+    __slots__ = ('_has_belt', '_is_classic')
+
     def __init__(self, name: str, size: int, fabric_price: float, accessories_price: float,
                  has_belt: bool = False, is_classic: bool = True):
         super().__init__(name, size, fabric_price, accessories_price)
         self._has_belt = has_belt
         self._is_classic = is_classic
-        self._fabric_consumption = self.calculate_fabric_consumption()
 
     @property
     def has_belt(self):
@@ -77,35 +78,25 @@ class Trousers(Clothing):
 
     @has_belt.setter
     def has_belt(self, value: bool):
-        self._has_belt = value
-        self._fabric_consumption = self.calculate_fabric_consumption()
+        self._update_option('_has_belt', value)
 
     @property
     def is_classic(self):
         return self._is_classic
 
+    @memoized('_fabric_consumption')
     def calculate_fabric_consumption(self) -> float:
         """Расход ткани для брюк (1.5м + 0.15м на каждый размер больше 50)"""
-        base_consumption = 1.5
-        if self._size > 50:
-            base_consumption += (self._size - 50) * 0.15
+        return trousers_fabric(self._size, self._has_belt, self._is_classic)
 
-        # Классические брюки требуют больше ткани
-        if self._is_classic:
-            base_consumption *= 1.2
-
-        if self._has_belt:
-            base_consumption += 0.2
-
-        return round(base_consumption, 2)
+    @memoized('_fabric_mm')
+    def fabric_mm(self) -> int:
+        return trousers_fabric_mm(self._size, self._has_belt, self._is_classic)
 
+    @memoized('_sewing_cost')
     def calculate_sewing_cost(self) -> float:
         """Стоимость пошива брюк"""
-        base_cost = 3000
-        base_cost += max(0, self._size - 50) * 150
-        if self._is_classic:
-            base_cost += 500
-        return base_cost
+        return trousers_sewing(self._size, self._is_classic)
 
     def __add__(self, other):
         if isinstance(other, Jacket):
@@ -116,14 +107,32 @@ class Trousers(Clothing):
 class ThreePieceSuit(Clothing):
     """Класс для костюма-тройки"""
 
+    __slots__ = ('_jacket', '_trousers', '_vest')
+
     def __init__(self, name: str, jacket: Jacket, trousers: Trousers, vest=None):
+        accessories_price = jacket.accessories_price + trousers.accessories_price
+        if vest:
+            accessories_price += vest.accessories_price
+        super().__init__(name, jacket.size, jacket.fabric_price, accessories_price)
         self._jacket = jacket
         self._trousers = trousers
         self._vest = vest
-        self._name = name
-        self._size = jacket.size
-        self._fabric_price = jacket.fabric_price
-        self._fabric_consumption = self.calculate_fabric_consumption()
+        for part in (jacket, trousers, vest):
+            if isinstance(part, Clothing):
+                part._add_dependent(self)
+
+    def __setstate__(self, state: dict):
+        super().__setstate__(state)
+        for part in (self._jacket, self._trousers, self._vest):
+            if isinstance(part, Clothing):
+                part._add_dependent(self)
+
+    def _dependency_changing(self, item: Clothing):
+        self._notify_changing()
+
+    def _dependency_changed(self, item: Clothing):
+        self._invalidate()
+        self._notify_changed()
 
     @property
     def jacket(self):
@@ -137,30 +146,35 @@ class ThreePieceSuit(Clothing):
     def vest(self):
         return self._vest
 
+    def exact_material_cost(self):
+        # Стоимость частей складывается точно, округляется только итог
+        total = self._jacket.exact_material_cost() + self._trousers.exact_material_cost()
+        if self._vest:
+            total += self._vest.exact_material_cost()
+        return total
+
+    @memoized('_fabric_consumption')
     def calculate_fabric_consumption(self) -> float:
         """Общий расход ткани для костюма"""
-        total = self._jacket.calculate_fabric_consumption() + self._trousers.calculate_fabric_consumption()
+        total = self._jacket.fabric_mm() + self._trousers.fabric_mm()
         if self._vest:
             # Расход ткани на жилет
-            vest_consumption = 1.0 + max(0, self._size - 48) * 0.1
-            total += vest_consumption
-        return round(total, 2)
+            total += vest_fabric_mm(self._size)
+        return from_mm(total)
 
+    @memoized('_sewing_cost')
     def calculate_sewing_cost(self) -> float:
         """Общая стоимость пошива костюма со скидкой 10%"""
-        total = self._jacket.calculate_sewing_cost() + self._trousers.calculate_sewing_cost()
+        total = self._jacket.sewing_kopecks() + self._trousers.sewing_kopecks()
         if self._vest:
-            total += 2000
-        # Скидка за комплект
-        return int(total * 0.9)
+            total += VEST_SEWING_KOPECKS
+        # Скидка за комплект, дробная часть рубля отбрасывается
+        return total * 9 // (10 * KOPECKS)
 
+    @memoized('_total_cost')
     def calculate_total_cost(self) -> float:
-        """Общая стоимость материалов для костюма"""
-        total = self._jacket.calculate_total_cost() + self._trousers.calculate_total_cost()
-        if self._vest:
-            vest_cost = self._vest.calculate_total_cost()
-            total += vest_cost
-        return round(total, 2)
+        """Общая стоимость материалов для костюма, округлённая до копейки"""
+        return from_kopecks(round_material(self.exact_material_cost()))
 
     def __str__(self):
         return f"Костюм-тройка '{self._name}', размер {self._size}"
@@ -169,4 +183,11 @@ class ThreePieceSuit(Clothing):
         items = [self._jacket, self._trousers]
         if self._vest:
             items.append(self._vest)
-        return items[index]
\ No newline at end of file
+        return items[index]
+
+
+for _cls in (Jacket, Trousers, ThreePieceSuit):
+    metrics.instrument(_cls, 'calculate_fabric_consumption', 'calculate_sewing_cost')
+metrics.instrument(ThreePieceSuit, 'calculate_total_cost')
+for _cls in (Jacket, Trousers):
+    metrics.instrument(_cls, 'fabric_mm')
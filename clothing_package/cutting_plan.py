@@ -0,0 +1,142 @@
+import math
+import numbers
+from bisect import bisect_left, insort
+
+from .calculator import ClothingCalculator
+
+METHODS = ('ffd', 'bfd')
+
+
+def _to_cm(meters: float) -> int:
+    return round(meters * 100)
+
+
+def cart_pieces(calculator: ClothingCalculator, cart=None):
+    """Отрезы ткани изделий корзины: (ключ, цена ткани, длина в см).
+
+    Ключ - номер (id) изделия в корзине, а при заданном cart - (cart, номер).
+    """
+    for item_id, item in calculator.iter_entries():
+        key = item_id if cart is None else (cart, item_id)
+        yield key, item.fabric_price, _to_cm(item.calculate_fabric_consumption())
+
+
+def _first_fit(lengths, capacity: int, bins: int) -> list:
+    """Первый подходящий рулон для каждого отреза через дерево максимумов остатков.
+
+    Листья дерева - рулоны по порядку (ещё не начатые считаются полными),
+    узел хранит наибольший остаток в поддереве, поэтому самый левый рулон
+    с достаточным остатком находится спуском от корня за O(log n).
+    """
+    size = 1 << max(0, bins - 1).bit_length()
+    tree = [capacity] * (2 * size)
+    assignment = []
+    for length in lengths:
+        node = 1
+        while node < size:
+            node *= 2
+            if tree[node] < length:
+                node += 1
+        assignment.append(node - size)
+        tree[node] -= length
+        node //= 2
+        while node:
+            value = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == value:
+                break
+            tree[node] = value
+            node //= 2
+    return assignment
+
+
+def _best_fit(lengths, capacity: int) -> list:
+    """Рулон с наименьшим достаточным остатком для каждого отреза"""
+    remaining = []  # отсортированные пары (остаток, номер рулона)
+    opened = 0
+    assignment = []
+    for length in lengths:
+        position = bisect_left(remaining, (length, -1))
+        if position < len(remaining):
+            free, roll = remaining.pop(position)
+        else:
+            free, roll = capacity, opened
+            opened += 1
+        assignment.append(roll)
+        if free > length:
+            insort(remaining, (free - length, roll))
+    return assignment
+
+
+def pack_pieces(pieces, capacity: int, method: str = 'ffd') -> list:
+    """Раскладка отрезов (ключ, длина в см) по рулонам длиной capacity см.
+
+    Отрезы раскладываются по убыванию длины: 'ffd' - в первый подходящий
+    рулон, 'bfd' - в рулон с наименьшим достаточным остатком (на части заказов
+    экономит рулон). Возвращает рулоны - списки ключей.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод раскроя: {method}")
+    pieces = sorted(pieces, key=lambda piece: piece[1], reverse=True)
+    if not pieces:
+        return []
+    if pieces[0][1] > capacity:
+        raise ValueError(f"Отрез {pieces[0][0]!r} ({pieces[0][1]} см) длиннее рулона ({capacity} см)")
+    lengths = [length for _, length in pieces]
+    if method == 'ffd':
+        # При первом подходящем не больше одного рулона заполнено наполовину или меньше
+        bins = min(len(lengths), 2 * math.ceil(sum(lengths) / capacity) + 1)
+        assignment = _first_fit(lengths, capacity, bins)
+    else:
+        assignment = _best_fit(lengths, capacity)
+    rolls = [[] for _ in range(max(assignment) + 1)]
+    for (key, _), roll in zip(pieces, assignment):
+        rolls[roll].append(key)
+    return rolls
+
+
+def plan_cutting(carts, roll_lengths, default_roll_length: float = None, method: str = 'ffd') -> dict:
+    """План раскроя ткани по рулонам для корзины или набора корзин.
+
+    roll_lengths - длина рулона в метрах, общая или словарь {цена ткани: длина};
+    для цен, которых нет в словаре, берётся default_roll_length. Расчёт ведётся
+    в целых сантиметрах. Для каждой цены ткани возвращается словарь:
+    roll_length, rolls (списки ключей отрезов, см. cart_pieces), used, waste
+    (в метрах) и lower_bound - минимально возможное число рулонов.
+    """
+    if isinstance(carts, ClothingCalculator):
+        pieces = cart_pieces(carts)
+    else:
+        pieces = (piece for cart, calculator in enumerate(carts) for piece in cart_pieces(calculator, cart))
+    by_fabric = {}
+    for key, fabric_price, length in pieces:
+        by_fabric.setdefault(fabric_price, []).append((key, length))
+
+    plan = {}
+    for fabric_price, fabric_pieces in by_fabric.items():
+        if isinstance(roll_lengths, numbers.Real):
+            roll_length = roll_lengths
+        else:
+            roll_length = roll_lengths.get(fabric_price, default_roll_length)
+        if roll_length is None or roll_length <= 0:
+            raise ValueError(f"Не задана длина рулона для ткани по цене {fabric_price}")
+        capacity = _to_cm(roll_length)
+        used = sum(length for _, length in fabric_pieces)
+        rolls = pack_pieces(fabric_pieces, capacity, method)
+        plan[fabric_price] = {
+            'roll_length': roll_length,
+            'rolls': rolls,
+            'used': used / 100,
+            'waste': (len(rolls) * capacity - used) / 100,
+            'lower_bound': math.ceil(used / capacity),
+        }
+    return plan
+
+
+def plan_totals(plan: dict) -> dict:
+    """Итоги плана раскроя: рулоны, нижняя оценка числа рулонов, расход и отходы в метрах"""
+    return {
+        'rolls': sum(len(fabric['rolls']) for fabric in plan.values()),
+        'lower_bound': sum(fabric['lower_bound'] for fabric in plan.values()),
+        'used': round(math.fsum(fabric['used'] for fabric in plan.values()), 2),
+        'waste': round(math.fsum(fabric['waste'] for fabric in plan.values()), 2),
+    }
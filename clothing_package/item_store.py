@@ -0,0 +1,143 @@
+from array import array
+from .abstract_clothing import Clothing
+from .clothing_items import Jacket, Trousers, ThreePieceSuit
+
+JACKET, TROUSERS, SUIT = 0, 1, 2
+
+KINDS = {Jacket: JACKET, Trousers: TROUSERS, ThreePieceSuit: SUIT}
+CLASSES = {kind: cls for cls, kind in KINDS.items()}
+
+
+class ItemStore:
+    """Компактное колоночное хранилище изделий.
+
+    Каждое изделие занимает строку в типизированных столбцах. Для костюма
+    перед его строкой записываются строки пиджака и брюк. Хранилище только
+    дополняется: строки удалённых из корзины изделий остаются на месте.
+    """
+
+    def __init__(self):
+        self._kinds = array('b')
+        self._sizes = array('h')
+        self._fabric_prices = array('d')
+        self._accessories_prices = array('d')
+        # Подкладка пиджака / пояс брюк
+        self._flags = array('b')
+        # Количество карманов пиджака / классический фасон брюк
+        self._counts = array('i')
+        self._names = []
+        self._name_pool = {}
+
+    def __len__(self):
+        return len(self._kinds)
+
+    def _append_row(self, kind: int, item: Clothing, flag: int, count: int) -> int:
+        self._kinds.append(kind)
+        self._sizes.append(item.size)
+        self._fabric_prices.append(item.fabric_price)
+        self._accessories_prices.append(item.accessories_price)
+        self._flags.append(flag)
+        self._counts.append(count)
+        # Одинаковые названия моделей хранятся одной строкой
+        self._names.append(self._name_pool.setdefault(item.name, item.name))
+        return len(self._kinds) - 1
+
+    def _append_item(self, item: Clothing) -> int:
+        if isinstance(item, Jacket):
+            return self._append_row(JACKET, item, item.has_lining, item.pockets_count)
+        if isinstance(item, Trousers):
+            return self._append_row(TROUSERS, item, item.has_belt, item.is_classic)
+        if isinstance(item, ThreePieceSuit):
+            if item.vest:
+                raise TypeError("Костюмы с жилетом не поддерживаются компактным хранилищем")
+            self._append_item(item.jacket)
+            self._append_item(item.trousers)
+            return self._append_row(SUIT, item, 0, 0)
+        raise TypeError(f"Неподдерживаемый тип изделия: {item.__class__.__name__}")
+
+    def append(self, item: Clothing) -> int:
+        """Добавляет изделие и возвращает номер его строки"""
+        return self._append_item(item)
+
+    def view(self, row: int) -> 'ItemView':
+        return ItemView(self, row)
+
+    def kind(self, row: int) -> int:
+        return self._kinds[row]
+
+    def materialize(self, row: int) -> Clothing:
+        """Создаёт объект изделия по строке хранилища"""
+        kind = self._kinds[row]
+        if kind == SUIT:
+            return ThreePieceSuit(self._names[row], self.materialize(row - 2), self.materialize(row - 1), None)
+        args = (self._names[row], self._sizes[row], self._fabric_prices[row], self._accessories_prices[row])
+        if kind == JACKET:
+            return Jacket(*args, bool(self._flags[row]), self._counts[row])
+        return Trousers(*args, bool(self._flags[row]), bool(self._counts[row]))
+
+
+class ItemView:
+    """Лёгкое представление изделия из ItemStore"""
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: ItemStore, row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def name(self):
+        return self._store._names[self._row]
+
+    @property
+    def size(self):
+        return self._store._sizes[self._row]
+
+    @property
+    def fabric_price(self):
+        return self._store._fabric_prices[self._row]
+
+    @property
+    def accessories_price(self):
+        return self._store._accessories_prices[self._row]
+
+    @property
+    def item_class(self) -> type:
+        """Класс представляемого изделия (без создания объекта)"""
+        return CLASSES[self._store.kind(self._row)]
+
+    def materialize(self) -> Clothing:
+        """Полноценный объект изделия"""
+        return self._store.materialize(self._row)
+
+    def calculate_fabric_consumption(self) -> float:
+        return self.materialize().calculate_fabric_consumption()
+
+    def calculate_sewing_cost(self) -> float:
+        return self.materialize().calculate_sewing_cost()
+
+    def calculate_total_cost(self) -> float:
+        return self.materialize().calculate_total_cost()
+
+    def fabric_mm(self) -> int:
+        return self.materialize().fabric_mm()
+
+    def sewing_kopecks(self) -> int:
+        return self.materialize().sewing_kopecks()
+
+    def material_kopecks(self) -> int:
+        return self.materialize().material_kopecks()
+
+    def exact_material_cost(self):
+        return self.materialize().exact_material_cost()
+
+    def __str__(self):
+        return str(self.materialize())
+
+    def __repr__(self):
+        return f"ItemView({self.materialize()!r})"
+
+
+def item_class(item) -> type:
+    """Класс изделия, в том числе представленного через ItemView"""
+    return item.item_class if isinstance(item, ItemView) else type(item)
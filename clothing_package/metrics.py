@@ -0,0 +1,160 @@
+import os
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+
+# Переменная окружения, включающая сбор метрик при запуске
+ENV_VAR = 'CLOTHING_METRICS'
+
+# Верхние границы интервалов гистограммы задержек, секунды
+BUCKETS = (0.000001, 0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+PROMETHEUS_PREFIX = 'clothing'
+
+
+class Histogram:
+    """Количество вызовов, ошибок и распределение задержек одной функции"""
+
+    __slots__ = ('count', 'errors', 'total', 'buckets')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        # Последний интервал - больше всех границ (+Inf)
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, seconds: float, failed: bool = False):
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def cumulative(self) -> list:
+        """Накопленные количества по границам BUCKETS и +Inf, как в Prometheus"""
+        result = []
+        running = 0
+        for value in self.buckets:
+            running += value
+            result.append(running)
+        return result
+
+
+_enabled = False
+# Зарегистрированные функции: (владелец - класс или модуль, имя атрибута, имя метрики)
+_targets = []
+# Исходные функции на время подмены: (владелец, имя атрибута) -> функция
+_originals = {}
+_histograms = {}
+
+
+def _timed(function, histogram: Histogram):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException:
+            histogram.observe(perf_counter() - start, True)
+            raise
+        histogram.observe(perf_counter() - start)
+        return result
+
+    return wrapper
+
+
+def _patch(owner, attr: str, name: str):
+    if (owner, attr) in _originals:
+        return
+    original = vars(owner)[attr]
+    _originals[owner, attr] = original
+    histogram = _histograms.setdefault(name, Histogram())
+    setattr(owner, attr, _timed(original, histogram))
+
+
+def instrument(owner, *attrs, prefix: str = None):
+    """Регистрация функций класса или модуля для сбора метрик.
+
+    Пока сбор выключен, функции не подменяются и вызовы ничего не стоят.
+    При включении они заменяются обёртками с замером времени; модули,
+    импортировавшие функцию по имени, продолжают вызывать исходную.
+    """
+    prefix = prefix or owner.__name__
+    for attr in attrs:
+        target = (owner, attr, f"{prefix}.{attr}")
+        _targets.append(target)
+        if _enabled:
+            _patch(*target)
+
+
+def enable():
+    """Включение сбора метрик для всех зарегистрированных функций"""
+    global _enabled
+    _enabled = True
+    for target in _targets:
+        _patch(*target)
+
+
+def disable():
+    """Выключение сбора: исходные функции возвращаются, накопленное сохраняется"""
+    global _enabled
+    _enabled = False
+    for (owner, attr), original in _originals.items():
+        setattr(owner, attr, original)
+    _originals.clear()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Обнуление накопленных метрик"""
+    for histogram in _histograms.values():
+        histogram.reset()
+
+
+def snapshot() -> dict:
+    """Метрики вызывавшихся функций: имя -> count, errors, total_seconds, buckets"""
+    bounds = [str(bound) for bound in BUCKETS] + ['+Inf']
+    return {name: {'count': histogram.count, 'errors': histogram.errors, 'total_seconds': histogram.total,
+                   'buckets': dict(zip(bounds, histogram.cumulative()))}
+            for name, histogram in sorted(_histograms.items()) if histogram.count}
+
+
+def to_prometheus() -> str:
+    """Метрики в текстовом формате Prometheus"""
+    calls = f'{PROMETHEUS_PREFIX}_calls_total'
+    errors = f'{PROMETHEUS_PREFIX}_call_errors_total'
+    duration = f'{PROMETHEUS_PREFIX}_call_duration_seconds'
+    metrics = snapshot()
+    lines = [f'# HELP {calls} Количество вызовов', f'# TYPE {calls} counter']
+    lines += [f'{calls}{{function="{name}"}} {data["count"]}' for name, data in metrics.items()]
+    lines += [f'# HELP {errors} Количество вызовов, завершившихся исключением', f'# TYPE {errors} counter']
+    lines += [f'{errors}{{function="{name}"}} {data["errors"]}' for name, data in metrics.items()]
+    lines += [f'# HELP {duration} Время выполнения', f'# TYPE {duration} histogram']
+    for name, data in metrics.items():
+        for bound, count in data['buckets'].items():
+            lines.append(f'{duration}_bucket{{function="{name}",le="{bound}"}} {count}')
+        lines.append(f'{duration}_sum{{function="{name}"}} {data["total_seconds"]!r}')
+        lines.append(f'{duration}_count{{function="{name}"}} {data["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def dump(path: str):
+    """Запись метрик в файл: .prom и .txt - формат Prometheus, иначе JSON"""
+    if os.path.splitext(path)[1].lower() in ('.prom', '.txt'):
+        text = to_prometheus()
+    else:
+        import json
+
+        text = json.dumps(snapshot(), ensure_ascii=False, indent=2)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+if os.environ.get(ENV_VAR, '').lower() in ('1', 'true', 'yes'):
+    enable()
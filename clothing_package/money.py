@@ -0,0 +1,142 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+# Копеек в рубле и миллиметров в метре
+KOPECKS = 100
+MM_PER_M = 1000
+
+# Допуск, в пределах которого произведение считается целым (ошибка представления float)
+_EPSILON = 1e-6
+_ONE = Decimal(1)
+
+
+def _decimal(value) -> Decimal:
+    """Точное значение десятичной записи числа"""
+    return Decimal(value) if isinstance(value, int) else Decimal(repr(float(value)))
+
+
+def _whole(value, factor: int):
+    """Значение в единицах, если оно целое (с точностью до ошибки представления float), иначе None"""
+    scaled = value * factor
+    if isinstance(value, int):
+        return scaled
+    nearest = round(scaled)
+    if -_EPSILON < scaled - nearest < _EPSILON:
+        return nearest
+    return None
+
+
+def _scale(value, factor: int) -> int:
+    units = _whole(value, factor)
+    if units is not None:
+        return units
+    # Больше знаков, чем помещается в единицу: округление десятичной записи числа
+    return int((_decimal(value) * factor).quantize(_ONE, ROUND_HALF_UP))
+
+
+def to_kopecks(rubles) -> int:
+    """Сумма в копейках (половина копейки округляется от нуля)"""
+    return _scale(rubles, KOPECKS)
+
+
+def to_mm(meters) -> int:
+    """Длина в миллиметрах (половина миллиметра округляется от нуля)"""
+    return _scale(meters, MM_PER_M)
+
+
+def from_kopecks(kopecks: int) -> float:
+    return kopecks / KOPECKS
+
+
+def from_mm(mm: int) -> float:
+    return mm / MM_PER_M
+
+
+def div_round(numerator: int, denominator: int) -> int:
+    """Целочисленное деление на положительное число с округлением половины от нуля"""
+    quotient = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return quotient if numerator >= 0 else -quotient
+
+
+def material_cost(fabric_mm: int, fabric_price, accessories_price):
+    """Точная стоимость материалов в тысячных долях копейки (копейка за метр на миллиметр).
+
+    Целое число, если цены заданы в целых копейках, иначе Decimal. Стоимости
+    можно складывать и округлять один раз через round_material.
+    """
+    price = _whole(fabric_price, KOPECKS)
+    accessories = _whole(accessories_price, KOPECKS)
+    if price is None or accessories is None:
+        return (fabric_mm * _decimal(fabric_price) + _decimal(accessories_price) * MM_PER_M) * KOPECKS
+    return fabric_mm * price + accessories * MM_PER_M
+
+
+def round_material(cost) -> int:
+    """Стоимость из material_cost в копейках (половина копейки округляется от нуля)"""
+    if isinstance(cost, int):
+        return div_round(cost, MM_PER_M)
+    return int((cost / MM_PER_M).quantize(_ONE, ROUND_HALF_UP))
+
+
+def material_kopecks(fabric_mm: int, fabric_price, accessories_price) -> int:
+    """Стоимость материалов в копейках: точная стоимость ткани и фурнитуры, округлённая один раз"""
+    return round_material(material_cost(fabric_mm, fabric_price, accessories_price))
+
+
+# Те же операции для столбцов int64 (numpy нужен только для них)
+
+def _scale_array(values, factor: int):
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * factor
+    nearest = np.rint(scaled)
+    result = nearest.astype(np.int64)
+    inexact = np.abs(scaled - nearest) >= _EPSILON
+    if inexact.any():
+        result[inexact] = [_scale(value, factor) for value in values[inexact].tolist()]
+    return result
+
+
+def to_kopecks_array(rubles):
+    """Столбец сумм в копейках (int64)"""
+    return _scale_array(rubles, KOPECKS)
+
+
+def to_mm_array(meters):
+    """Столбец длин в миллиметрах (int64)"""
+    return _scale_array(meters, MM_PER_M)
+
+
+def material_kopecks_array(*parts):
+    """Столбец стоимостей материалов в копейках (int64), как material_kopecks.
+
+    Каждая часть - (расход ткани в мм, цены ткани, цены фурнитуры). Стоимости
+    частей складываются точно и округляются один раз, как у костюма.
+    """
+    import numpy as np
+
+    parts = [(np.asarray(fabric_mm, dtype=np.int64), np.asarray(fabric_prices, dtype=np.float64),
+              np.asarray(accessories_prices, dtype=np.float64)) for fabric_mm, fabric_prices, accessories_prices in parts]
+    parts = [tuple(np.broadcast_arrays(*part)) for part in parts]
+    cost = 0
+    inexact = False
+    for fabric_mm, fabric_prices, accessories_prices in parts:
+        prices = np.rint(fabric_prices * KOPECKS)
+        accessories = np.rint(accessories_prices * KOPECKS)
+        cost = cost + fabric_mm * prices.astype(np.int64) + accessories.astype(np.int64) * MM_PER_M
+        inexact = inexact | (np.abs(fabric_prices * KOPECKS - prices) >= _EPSILON) \
+            | (np.abs(accessories_prices * KOPECKS - accessories) >= _EPSILON)
+    result = np.sign(cost) * ((2 * np.abs(cost) + MM_PER_M) // (2 * MM_PER_M))
+    # Цены с долями копейки считаются поэлементно через Decimal
+    for i in np.flatnonzero(inexact).tolist():
+        result[i] = round_material(sum(material_cost(int(fabric_mm[i]), float(fabric_prices[i]),
+                                                     float(accessories_prices[i]))
+                                       for fabric_mm, fabric_prices, accessories_prices in parts))
+    return result
+
+
+def total(values) -> int:
+    """Точная сумма столбца int64 как целое Python"""
+    import numpy as np
+
+    return int(np.sum(values, dtype=np.int64))
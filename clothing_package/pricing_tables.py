@@ -0,0 +1,160 @@
+from .money import to_mm
+
+# Диапазон размеров таблиц расхода ткани и стоимости пошива. Значения
+# рассчитываются по формулам изделий один раз при импорте модуля
+MIN_SIZE = 44
+MAX_SIZE = 64
+# Карманов в таблице пиджаков: 0..MAX_POCKETS
+MAX_POCKETS = 10
+
+
+def jacket_fabric_formula(size: int, has_lining: bool, pockets_count: int) -> float:
+    """Расход ткани для пиджака (2.5м + 0.2м на каждый размер больше 48)"""
+    base_consumption = 2.5
+    if size > 48:
+        base_consumption += (size - 48) * 0.2
+
+    # Добавляем на подкладку и карманы
+    if has_lining:
+        base_consumption *= 1.3
+    base_consumption += pockets_count * 0.1
+
+    return round(base_consumption, 2)
+
+
+def jacket_sewing_formula(size: int, pockets_count: int) -> int:
+    """Стоимость пошива пиджака"""
+    base_cost = 5000
+    base_cost += max(0, size - 48) * 200
+    base_cost += pockets_count * 150
+    return base_cost
+
+
+def trousers_fabric_formula(size: int, has_belt: bool, is_classic: bool) -> float:
+    """Расход ткани для брюк (1.5м + 0.15м на каждый размер больше 50)"""
+    base_consumption = 1.5
+    if size > 50:
+        base_consumption += (size - 50) * 0.15
+
+    # Классические брюки требуют больше ткани
+    if is_classic:
+        base_consumption *= 1.2
+
+    if has_belt:
+        base_consumption += 0.2
+
+    return round(base_consumption, 2)
+
+
+def trousers_sewing_formula(size: int, is_classic: bool) -> int:
+    """Стоимость пошива брюк"""
+    base_cost = 3000
+    base_cost += max(0, size - 50) * 150
+    if is_classic:
+        base_cost += 500
+    return base_cost
+
+
+def vest_fabric_formula(size: int) -> float:
+    """Расход ткани на жилет костюма"""
+    return 1.0 + max(0, size - 48) * 0.1
+
+
+_SIZES = range(MIN_SIZE, MAX_SIZE + 1)
+_FLAGS = (False, True)
+
+# Индексы: [размер - MIN_SIZE][параметр-флаг][...]
+_JACKET_FABRIC = [[[jacket_fabric_formula(size, lining, pockets) for pockets in range(MAX_POCKETS + 1)]
+                   for lining in _FLAGS] for size in _SIZES]
+_JACKET_SEWING = [[jacket_sewing_formula(size, pockets) for pockets in range(MAX_POCKETS + 1)] for size in _SIZES]
+_TROUSERS_FABRIC = [[[trousers_fabric_formula(size, belt, classic) for classic in _FLAGS] for belt in _FLAGS]
+                    for size in _SIZES]
+_TROUSERS_SEWING = [[trousers_sewing_formula(size, classic) for classic in _FLAGS] for size in _SIZES]
+_VEST_FABRIC = [vest_fabric_formula(size) for size in _SIZES]
+# Те же расходы ткани в миллиметрах
+_JACKET_FABRIC_MM = [[[to_mm(value) for value in row] for row in rows] for rows in _JACKET_FABRIC]
+_TROUSERS_FABRIC_MM = [[[to_mm(value) for value in row] for row in rows] for rows in _TROUSERS_FABRIC]
+_VEST_FABRIC_MM = [to_mm(value) for value in _VEST_FABRIC]
+
+
+# Проверка диапазона обязательна: отрицательный индекс списка не вызывает ошибку.
+# Нецелые размеры и количества карманов (TypeError) считаются по формулам.
+
+def jacket_fabric(size: int, has_lining: bool, pockets_count: int) -> float:
+    """Расход ткани пиджака по таблице, вне её - по формуле"""
+    if MIN_SIZE <= size <= MAX_SIZE and 0 <= pockets_count <= MAX_POCKETS:
+        try:
+            return _JACKET_FABRIC[size - MIN_SIZE][1 if has_lining else 0][pockets_count]
+        except TypeError:
+            pass
+    return jacket_fabric_formula(size, has_lining, pockets_count)
+
+
+def jacket_fabric_mm(size: int, has_lining: bool, pockets_count: int) -> int:
+    """Расход ткани пиджака в миллиметрах"""
+    if MIN_SIZE <= size <= MAX_SIZE and 0 <= pockets_count <= MAX_POCKETS:
+        try:
+            return _JACKET_FABRIC_MM[size - MIN_SIZE][1 if has_lining else 0][pockets_count]
+        except TypeError:
+            pass
+    return to_mm(jacket_fabric_formula(size, has_lining, pockets_count))
+
+
+def jacket_sewing(size: int, pockets_count: int) -> int:
+    """Стоимость пошива пиджака по таблице, вне её - по формуле"""
+    if MIN_SIZE <= size <= MAX_SIZE and 0 <= pockets_count <= MAX_POCKETS:
+        try:
+            return _JACKET_SEWING[size - MIN_SIZE][pockets_count]
+        except TypeError:
+            pass
+    return jacket_sewing_formula(size, pockets_count)
+
+
+def trousers_fabric(size: int, has_belt: bool, is_classic: bool) -> float:
+    """Расход ткани брюк по таблице, вне её - по формуле"""
+    if MIN_SIZE <= size <= MAX_SIZE:
+        try:
+            return _TROUSERS_FABRIC[size - MIN_SIZE][1 if has_belt else 0][1 if is_classic else 0]
+        except TypeError:
+            pass
+    return trousers_fabric_formula(size, has_belt, is_classic)
+
+
+def trousers_fabric_mm(size: int, has_belt: bool, is_classic: bool) -> int:
+    """Расход ткани брюк в миллиметрах"""
+    if MIN_SIZE <= size <= MAX_SIZE:
+        try:
+            return _TROUSERS_FABRIC_MM[size - MIN_SIZE][1 if has_belt else 0][1 if is_classic else 0]
+        except TypeError:
+            pass
+    return to_mm(trousers_fabric_formula(size, has_belt, is_classic))
+
+
+def trousers_sewing(size: int, is_classic: bool) -> int:
+    """Стоимость пошива брюк по таблице, вне её - по формуле"""
+    if MIN_SIZE <= size <= MAX_SIZE:
+        try:
+            return _TROUSERS_SEWING[size - MIN_SIZE][1 if is_classic else 0]
+        except TypeError:
+            pass
+    return trousers_sewing_formula(size, is_classic)
+
+
+def vest_fabric(size: int) -> float:
+    """Расход ткани на жилет по таблице, вне её - по формуле"""
+    if MIN_SIZE <= size <= MAX_SIZE:
+        try:
+            return _VEST_FABRIC[size - MIN_SIZE]
+        except TypeError:
+            pass
+    return vest_fabric_formula(size)
+
+
+def vest_fabric_mm(size: int) -> int:
+    """Расход ткани на жилет в миллиметрах"""
+    if MIN_SIZE <= size <= MAX_SIZE:
+        try:
+            return _VEST_FABRIC_MM[size - MIN_SIZE]
+        except TypeError:
+            pass
+    return to_mm(vest_fabric_formula(size))
@@ -0,0 +1,292 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import CodeType
+
+from . import money, pricing_tables
+from .abstract_clothing import Clothing
+from .clothing_items import Jacket, Trousers, ThreePieceSuit, VEST_SEWING_KOPECKS
+from .item_store import ItemView
+from .records import JACKET_TYPE, TROUSERS_TYPE, SUIT_TYPE
+
+# Размер кэша в памяти, записей
+DEFAULT_MAX_SIZE = 10_000
+# Размер кэша на диске, записей
+DEFAULT_MAX_ROWS = 1_000_000
+# Через сколько записей на диск проверяется его размер и срок хранения
+TRIM_EVERY = 1000
+# Через сколько накопленных записей они сохраняются на диск, если не вызван flush
+FLUSH_EVERY = 256
+
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+)
+
+
+def quote_key(item: Clothing) -> tuple:
+    """Ключ кэша: тип, размер, цены и параметры изделия (название не влияет на расчёт)"""
+    if isinstance(item, ItemView):
+        item = item.materialize()
+    common = (item.size, float(item.fabric_price), float(item.accessories_price))
+    if isinstance(item, Jacket):
+        return (JACKET_TYPE, *common, bool(item.has_lining), item.pockets_count)
+    if isinstance(item, Trousers):
+        return (TROUSERS_TYPE, *common, bool(item.has_belt), bool(item.is_classic))
+    if isinstance(item, ThreePieceSuit):
+        vest = quote_key(item.vest) if item.vest else None
+        return (SUIT_TYPE, *common, quote_key(item.jacket), quote_key(item.trousers), vest)
+    raise TypeError(f"Неподдерживаемый тип изделия: {item.__class__.__name__}")
+
+
+def _pricing_functions():
+    functions = [getattr(module, name) for module in (pricing_tables, money) for name in dir(module)
+                 if callable(getattr(module, name)) and getattr(getattr(module, name), '__module__', None)
+                 == module.__name__]
+    for cls in (Clothing, Jacket, Trousers, ThreePieceSuit):
+        functions += [vars(cls)[name] for name in ('calculate_fabric_consumption', 'calculate_sewing_cost',
+                                                   'calculate_total_cost', 'fabric_mm', 'sewing_kopecks',
+                                                   'material_kopecks', 'exact_material_cost')
+                      if name in vars(cls)]
+    return functions
+
+
+def _hash_code(digest, code: CodeType):
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(digest, const)
+        else:
+            digest.update(repr(const).encode())
+
+
+def pricing_fingerprint() -> str:
+    """Отпечаток формул расчёта: байт-код и константы функций расчёта и таблиц.
+
+    Меняется при любом изменении формул или констант, и сохранённые на диске
+    расчёты при этом сбрасываются. Обёртки (кэширование, метрики) не учитываются.
+    """
+    digest = hashlib.sha256()
+    for function in _pricing_functions():
+        while hasattr(function, '__wrapped__'):
+            function = function.__wrapped__
+        _hash_code(digest, function.__code__)
+    digest.update(repr((pricing_tables.MIN_SIZE, pricing_tables.MAX_SIZE, pricing_tables.MAX_POCKETS,
+                        money.KOPECKS, money.MM_PER_M, VEST_SEWING_KOPECKS)).encode())
+    return digest.hexdigest()[:16]
+
+
+class QuoteCache:
+    """Кэш расчётов изделий по параметрам изделия.
+
+    Хранит (расход ткани в мм, пошив в копейках, материалы в копейках).
+
+    Первый уровень - LRU в памяти на max_size записей, второй (если задан
+    path) - таблица SQLite, которая переживает перезапуск и ограничена
+    max_rows записями, реже всего использовавшиеся удаляются. ttl (секунды)
+    ограничивает срок жизни записей на обоих уровнях.
+
+    Записи на диск копятся в памяти и сохраняются одной транзакцией: при
+    flush, каждые flush_every записей и при close. flush_later сохраняет их в
+    отдельном потоке - так делает сервис расчёта после каждой пачки, чтобы не
+    блокировать цикл событий. Чтение из кэша рассчитано на один поток.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttl: float = None, path: str = None,
+                 max_rows: int = DEFAULT_MAX_ROWS):
+        if max_size < 1:
+            raise ValueError("Размер кэша должен быть положительным")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_rows = max_rows
+        # Сколько записей копится до синхронной записи на диск (None - только flush)
+        self.flush_every = FLUSH_EVERY
+        self.fingerprint = pricing_fingerprint()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        # Ожидающие записи на диск: ключ -> строка таблицы quote_cache
+        self._dirty = {}
+        self._writes = 0
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._writer = None
+        if path is not None:
+            self._open()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Соединение с файлом кэша для текущего потока"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Соединение используется одним потоком, закрывается из close()
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _open(self):
+        conn = self._connection()
+        with conn:
+            conn.execute('''
+                         CREATE TABLE IF NOT EXISTS quote_cache
+                         (
+                             key              TEXT PRIMARY KEY,
+                             fabric_mm        INTEGER NOT NULL,
+                             sewing_kopecks   INTEGER NOT NULL,
+                             material_kopecks INTEGER NOT NULL,
+                             created_at       REAL NOT NULL,
+                             used_at          REAL NOT NULL
+                         ) WITHOUT ROWID
+                         ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_quote_cache_used_at ON quote_cache (used_at)')
+            conn.execute('CREATE TABLE IF NOT EXISTS quote_cache_meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            row = conn.execute("SELECT value FROM quote_cache_meta WHERE name = 'fingerprint'").fetchone()
+            if row is None or row[0] != self.fingerprint:
+                # Формулы изменились: прежние расчёты недействительны
+                conn.execute('DELETE FROM quote_cache')
+                conn.execute("INSERT OR REPLACE INTO quote_cache_meta (name, value) VALUES ('fingerprint', ?)",
+                             (self.fingerprint,))
+
+    def _remember(self, key, value, created_at: float, disk_key: str = None):
+        self._entries[key] = (value, created_at, disk_key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key: str, now: float):
+        """(значение, время создания) с диска или None"""
+        row = self._dirty.get(key)
+        if row is None:
+            row = self._connection().execute('SELECT * FROM quote_cache WHERE key = ?', (key,)).fetchone()
+        if row is None or (self.ttl is not None and now - row[4] > self.ttl):
+            return None
+        value, created_at = row[1:4], row[4]
+        self._buffer(key, value, created_at, now)
+        return value, created_at
+
+    def _buffer(self, key: str, value: tuple, created_at: float, used_at: float):
+        self._dirty[key] = (key, *value, created_at, used_at)
+        if self.flush_every is not None and len(self._dirty) >= self.flush_every:
+            self.flush()
+
+    def take_writes(self) -> list:
+        """Накопленные записи для write; буфер очищается"""
+        rows, self._dirty = list(self._dirty.values()), {}
+        return rows
+
+    def write(self, rows: list):
+        """Запись строк на диск одной транзакцией (в любом потоке)"""
+        if not rows:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO quote_cache VALUES (?, ?, ?, ?, ?, ?)', rows)
+        before, self._writes = self._writes, self._writes + len(rows)
+        if before // TRIM_EVERY != self._writes // TRIM_EVERY:
+            self.trim()
+
+    def flush(self):
+        """Синхронная запись накопленного на диск"""
+        rows = self.take_writes()
+        if self.path is not None and rows:
+            self.write(rows)
+
+    def flush_later(self):
+        """Запись накопленного на диск в отдельном потоке, не блокируя вызывающий.
+
+        Записи выполняются по порядку одним потоком. Возвращает Future или None.
+        """
+        rows = self.take_writes()
+        if self.path is None or not rows:
+            return None
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='quote-cache')
+        return self._writer.submit(self.write, rows)
+
+    def trim(self):
+        """Удаление с диска просроченных записей и лишних сверх max_rows"""
+        if self.path is None:
+            return
+        conn = self._connection()
+        with conn:
+            if self.ttl is not None:
+                conn.execute('DELETE FROM quote_cache WHERE created_at < ?', (time.time() - self.ttl,))
+            conn.execute('DELETE FROM quote_cache WHERE key IN (SELECT key FROM quote_cache '
+                         'ORDER BY used_at DESC LIMIT -1 OFFSET ?)', (self.max_rows,))
+
+    def quote(self, item: Clothing) -> tuple:
+        """(расход ткани в мм, пошив и материалы в копейках) изделия из кэша или с расчётом"""
+        try:
+            key = quote_key(item)
+        except TypeError:
+            return item.fabric_mm(), item.sewing_kopecks(), item.material_kopecks()
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, created_at, disk_key = entry
+            if self.ttl is None or now - created_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if disk_key is not None:
+                    # Частые ключи не должны первыми вытесняться с диска (trim - по used_at).
+                    # Повторные попадания до записи на диск обновляют ту же строку буфера
+                    self._buffer(disk_key, value, created_at, now)
+                return value
+            del self._entries[key]
+        disk_key = None
+        if self.path is not None:
+            disk_key = repr(key)
+            found = self._disk_get(disk_key, now)
+            if found is not None:
+                self.disk_hits += 1
+                # Срок жизни отсчитывается от создания записи, а не от чтения с диска
+                self._remember(key, *found, disk_key)
+                return found[0]
+        self.misses += 1
+        value = (item.fabric_mm(), item.sewing_kopecks(), item.material_kopecks())
+        self._remember(key, value, now, disk_key)
+        if disk_key is not None:
+            self._buffer(disk_key, value, now, now)
+        return value
+
+    def stats(self) -> dict:
+        """Статистика: попадания в памяти и на диске, промахи, вытеснения, размер"""
+        requests = self.hits + self.disk_hits + self.misses
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': len(self._entries),
+                'hit_rate': (self.hits + self.disk_hits) / requests if requests else 0.0}
+
+    def clear(self):
+        """Очистка обоих уровней кэша"""
+        self._entries.clear()
+        self._dirty.clear()
+        if self.path is not None:
+            if self._writer is not None:
+                self._writer.submit(lambda: None).result()
+            conn = self._connection()
+            with conn:
+                conn.execute('DELETE FROM quote_cache')
+
+    def close(self):
+        """Запись накопленного на диск и закрытие соединений"""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        self.flush()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+        self.path = None
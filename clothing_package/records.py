@@ -0,0 +1,106 @@
+import json
+import math
+from .abstract_clothing import Clothing
+from .clothing_items import Jacket, Trousers, ThreePieceSuit
+from .item_store import ItemView
+
+JACKET_TYPE = 'jacket'
+TROUSERS_TYPE = 'trousers'
+SUIT_TYPE = 'suit'
+
+
+def item_options(item: Clothing) -> dict:
+    """Параметры изделия помимо названия, размера и цен"""
+    if isinstance(item, ItemView):
+        item = item.materialize()
+    if isinstance(item, Jacket):
+        return {'has_lining': bool(item.has_lining), 'pockets_count': item.pockets_count}
+    if isinstance(item, Trousers):
+        return {'has_belt': bool(item.has_belt), 'is_classic': bool(item.is_classic)}
+    if isinstance(item, ThreePieceSuit):
+        return {'jacket': item_to_dict(item.jacket), 'trousers': item_to_dict(item.trousers),
+                'has_vest': bool(item.vest)}
+    raise TypeError(f"Неподдерживаемый тип изделия: {item.__class__.__name__}")
+
+
+def item_type(item: Clothing) -> str:
+    """Короткое имя типа изделия"""
+    if isinstance(item, ItemView):
+        item = item.materialize()
+    if isinstance(item, Jacket):
+        return JACKET_TYPE
+    if isinstance(item, Trousers):
+        return TROUSERS_TYPE
+    if isinstance(item, ThreePieceSuit):
+        return SUIT_TYPE
+    raise TypeError(f"Неподдерживаемый тип изделия: {item.__class__.__name__}")
+
+
+def item_to_dict(item: Clothing) -> dict:
+    """Описание изделия словарём из простых типов (для JSON)"""
+    return {'type': item_type(item), 'name': item.name, 'size': item.size,
+            'fabric_price': item.fabric_price, 'accessories_price': item.accessories_price,
+            **item_options(item)}
+
+
+_TRUE_VALUES = {'1', 'true', 'yes', 'y', 'д', 'да'}
+_FALSE_VALUES = {'', '0', 'false', 'no', 'n', 'н', 'нет'}
+
+
+def _flag(value) -> bool:
+    """Логическое значение из JSON или текстового поля CSV"""
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE_VALUES:
+            return True
+        if text in _FALSE_VALUES:
+            return False
+        raise ValueError(f"Некорректное логическое значение: {value!r}")
+    return bool(value)
+
+
+def _number(value) -> float:
+    """Конечное число из JSON или CSV: бесконечность (например, 1e400 в JSON) и NaN отклоняются"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Некорректное число: {value!r}")
+    return number
+
+
+def _integer(value) -> int:
+    return int(_number(value)) if isinstance(value, float) else int(value)
+
+
+def item_from_dict(data: dict, expected_type: str = None) -> Clothing:
+    """Создание изделия по описанию из item_to_dict (или строке заказа).
+
+    Отсутствующие параметры принимают значения по умолчанию конструкторов.
+    """
+    if not isinstance(data, dict):
+        raise TypeError(f"Описание изделия должно быть словарём, получено: {data!r}")
+    kind = data.get('type', expected_type)
+    if kind == SUIT_TYPE:
+        return ThreePieceSuit(str(data.get('name', "Костюм")),
+                              item_from_dict(data['jacket'], JACKET_TYPE),
+                              item_from_dict(data['trousers'], TROUSERS_TYPE), None)
+    common = (str(data['name']), _integer(data['size']), _number(data['fabric_price']),
+              _number(data.get('accessories_price') or 0))
+    if kind == JACKET_TYPE:
+        pockets_count = _integer(data.get('pockets_count', 4))
+        if pockets_count < 0:
+            raise ValueError("Количество карманов не может быть отрицательным")
+        return Jacket(*common, _flag(data.get('has_lining', True)), pockets_count)
+    if kind == TROUSERS_TYPE:
+        return Trousers(*common, _flag(data.get('has_belt', False)), _flag(data.get('is_classic', True)))
+    raise ValueError(f"Неизвестный тип изделия: {kind!r}")
+
+
+def item_row(item: Clothing, figures: tuple = None) -> tuple:
+    """Строка для таблицы calculation_items:
+    (тип, название, размер, параметры в JSON, расход ткани, пошив, материалы)
+
+    figures - уже известные (расход ткани, пошив, материалы), например из кэша.
+    """
+    if figures is None:
+        figures = (item.calculate_fabric_consumption(), item.calculate_sewing_cost(), item.calculate_total_cost())
+    return (item_type(item), item.name, item.size, json.dumps(item_options(item), ensure_ascii=False), *figures)
@@ -0,0 +1,179 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from .calculator import ClothingCalculator
+from .item_store import ItemStore
+
+MAGIC = b'CLTHSNAP'
+VERSION = 2
+
+# Заголовок: сигнатура, версия, четыре итога корзины (миллиметры и копейки),
+# количество строк хранилища, количество названий, длина блока названий
+HEADER = struct.Struct('<8sI4qQQQ')
+
+# Столбцы в порядке записи: (атрибут ItemStore, код типа array). Каждый
+# столбец начинается с границы 8 байт, поэтому открывается без копирования
+COLUMNS = (
+    ('_fabric_prices', 'd'),
+    ('_accessories_prices', 'd'),
+    ('_counts', 'i'),
+    ('_sizes', 'h'),
+    ('_kinds', 'b'),
+    ('_flags', 'b'),
+)
+
+_TOTALS = ('_total_fabric', '_total_sewing', '_total_material', '_total_accessories')
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _column(buffer, offset: int, typecode: str, count: int):
+    """Столбец файла без копирования (в порядке байтов little-endian)"""
+    size = array(typecode).itemsize * count
+    if offset + size > len(buffer):
+        raise ValueError("Снимок корзины повреждён: файл короче заголовка")
+    if sys.byteorder != 'little':
+        column = array(typecode, bytes(buffer[offset:offset + size]))
+        column.byteswap()
+        return column, offset + size
+    return buffer[offset:offset + size].cast(typecode), offset + size
+
+
+class _MappedNames:
+    """Названия строк: номер названия в столбце файла и общий список названий"""
+
+    __slots__ = ('_ids', '_pool')
+
+    def __init__(self, ids, pool):
+        self._ids = ids
+        self._pool = pool
+
+    def __getitem__(self, row):
+        return self._pool[self._ids[row]]
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class MappedItemStore(ItemStore):
+    """ItemStore, столбцы которого отображены из файла снимка.
+
+    Строки читаются из файла по мере обращения. При первом добавлении
+    изделия столбцы копируются в память и хранилище становится обычным.
+    """
+
+    def __init__(self, mapping: mmap.mmap, buffer, columns: dict, names: _MappedNames):
+        self._mapping = mapping
+        self._buffer = buffer
+        for attr, column in columns.items():
+            setattr(self, attr, column)
+        self._names = names
+        self._name_pool = None
+
+    def append(self, item) -> int:
+        if self._name_pool is None:
+            for attr, typecode in COLUMNS:
+                setattr(self, attr, array(typecode, getattr(self, attr)))
+            self._names = [self._names[row] for row in range(len(self._names))]
+            self._name_pool = {name: name for name in self._names}
+        return super().append(item)
+
+
+def _store_rows(calculator: ClothingCalculator):
+    """Хранилище и признаки строк, входящих в корзину (для обычного режима - копия)"""
+    if calculator.compact:
+        return calculator._store, calculator._alive + bytes(len(calculator._store) - len(calculator._alive))
+    store = ItemStore()
+    alive = bytearray()
+    for item in calculator.iter_items():
+        row = store.append(item)
+        alive.extend(bytes(row + 1 - len(alive)))
+        alive[row] = 1
+    return store, alive
+
+
+def save_snapshot(calculator: ClothingCalculator, path: str):
+    """Сохранение корзины в двоичный снимок со столбцами фиксированной ширины.
+
+    Номера изделий компактной корзины сохраняются; изделия обычной корзины
+    нумеруются заново. Файл записывается во временный и затем заменяет
+    прежний, поэтому перезапись открытого снимка безопасна.
+    """
+    store, alive = _store_rows(calculator)
+    rows = len(store)
+    pool = {}
+    name_ids = array('I', (pool.setdefault(store._names[row], len(pool)) for row in range(rows)))
+    encoded = [name.encode('utf-8') for name in pool]
+    name_offsets = array('Q', [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+    totals = [getattr(calculator, total) for total in _TOTALS]
+
+    sections = [getattr(store, attr) for attr, _ in COLUMNS[:3]]
+    sections += [name_ids]
+    sections += [getattr(store, attr) for attr, _ in COLUMNS[3:]]
+    sections += [alive, name_offsets, b''.join(encoded)]
+
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        header = HEADER.pack(MAGIC, VERSION, *totals, rows, len(encoded), name_offsets[-1])
+        f.write(header)
+        offset = len(header)
+        for section in sections:
+            padding = _align(offset) - offset
+            f.write(bytes(padding))
+            if isinstance(section, array) and sys.byteorder != 'little':
+                section = array(section.typecode, section)
+                section.byteswap()
+            data = section.tobytes() if isinstance(section, array) else bytes(section)
+            f.write(data)
+            offset += padding + len(data)
+    os.replace(temporary, path)
+
+
+def load_snapshot(path: str) -> ClothingCalculator:
+    """Открытие снимка как компактной корзины.
+
+    Файл отображается в память (mmap), столбцы не копируются, а изделия
+    создаются только при обращении к ним, поэтому даже миллион изделий
+    открывается за миллисекунды. Итоги корзины читаются из снимка.
+    """
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapping)
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path}: файл слишком короткий для снимка корзины")
+    magic, version, *header = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: не является снимком корзины")
+    if version != VERSION:
+        raise ValueError(f"{path}: неподдерживаемая версия снимка {version}")
+    *totals, rows, name_count, names_size = header
+
+    offset = HEADER.size
+    columns = {}
+    for attr, typecode in COLUMNS[:3]:
+        columns[attr], offset = _column(buffer, _align(offset), typecode, rows)
+    name_ids, offset = _column(buffer, _align(offset), 'I', rows)
+    for attr, typecode in COLUMNS[3:]:
+        columns[attr], offset = _column(buffer, _align(offset), typecode, rows)
+    offset = _align(offset)
+    alive = bytearray(buffer[offset:offset + rows])
+    name_offsets, offset = _column(buffer, _align(offset + rows), 'Q', name_count + 1)
+    if offset + names_size > len(buffer):
+        raise ValueError("Снимок корзины повреждён: файл короче заголовка")
+    blob = buffer[offset:offset + names_size]
+    pool = [str(blob[name_offsets[i]:name_offsets[i + 1]], 'utf-8') for i in range(name_count)]
+
+    calculator = ClothingCalculator(compact=True)
+    calculator._store = MappedItemStore(mapping, buffer, columns, _MappedNames(name_ids, pool))
+    calculator._alive = alive
+    calculator._count = alive.count(1)
+    for attr, value in zip(_TOTALS, totals):
+        setattr(calculator, attr, value)
+    return calculator
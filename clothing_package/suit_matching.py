@@ -0,0 +1,143 @@
+from heapq import heappop, heappush
+
+from .calculator import ClothingCalculator
+from .clothing_items import Jacket, Trousers, ThreePieceSuit
+from .item_store import ItemView
+
+# Допустимая разница размеров пиджака и брюк одного костюма
+DEFAULT_SIZE_WINDOW = 2
+
+SUIT_NAME = "Костюм (пиджак+брюки)"
+
+
+def _materialize(item):
+    return item.materialize() if isinstance(item, ItemView) else item
+
+
+def _matchable(counts: dict, capacity: dict, size_window: int) -> bool:
+    """Хватает ли пар изделиям counts (размер -> количество) среди изделий другого
+    типа capacity (размер -> количество) при разнице размеров не больше size_window.
+
+    Проверка жадным алгоритмом Гловера: размеры пар перебираются по возрастанию,
+    и каждый достаётся изделиям, у которых раньше всех кончается диапазон.
+    """
+    demand = sorted(counts.items())
+    # Изделия, ожидающие пары: [наибольший допустимый размер пары, количество]
+    pending = []
+    position = 0
+    for size in sorted(capacity):
+        while position < len(demand) and demand[position][0] - size_window <= size:
+            item_size, count = demand[position]
+            heappush(pending, [item_size + size_window, count])
+            position += 1
+        if pending and pending[0][0] < size:
+            return False
+        free = capacity[size]
+        while free and pending:
+            used = min(free, pending[0][1])
+            free -= used
+            pending[0][1] -= used
+            if not pending[0][1]:
+                heappop(pending)
+    return not pending and position == len(demand)
+
+
+def _select(entries, capacity: dict, size_window: int) -> list:
+    """Изделия наибольшей суммарной стоимости пошива, которым хватает пар.
+
+    Множества изделий, которым можно подобрать пары, образуют матроид, поэтому
+    изделия берутся жадно по убыванию стоимости пошива, если для всех выбранных
+    пары по-прежнему находятся. Изделия одного размера взаимозаменяемы, так что
+    проверка ведётся по количествам размеров; размер, на котором проверка не
+    прошла, больше не проверяется.
+    """
+    counts = {}
+    saturated = set()
+    selected = []
+    for sewing, size, index in sorted(entries, key=lambda entry: (-entry[0], entry[2])):
+        if size in saturated:
+            continue
+        counts[size] = counts.get(size, 0) + 1
+        if _matchable(counts, capacity, size_window):
+            selected.append((size, sewing, index))
+        else:
+            counts[size] -= 1
+            if not counts[size]:
+                del counts[size]
+            saturated.add(size)
+    return selected
+
+
+def _size_counts(entries) -> dict:
+    counts = {}
+    for _, size, _ in entries:
+        counts[size] = counts.get(size, 0) + 1
+    return counts
+
+
+def match_suits(items, size_window: int = DEFAULT_SIZE_WINDOW) -> list:
+    """Подбор пар (номер пиджака, номер брюк) в списке изделий для костюмов.
+
+    В пару попадают изделия с одинаковой ценой ткани и разницей размеров
+    не больше size_window. Скидка за комплект - 10% стоимости пошива пары,
+    поэтому подбор максимизирует суммарную стоимость пошива изделий, вошедших
+    в костюмы (с точностью до округления скидки до рубля). По теореме
+    Мендельсона - Далмейджа пиджаки и брюки можно выбрать независимо (см.
+    _select): для выбранных всегда есть паросочетание, покрывающее их всех.
+    Оно строится жадно по размерам. Сложность O(n * k log k), k - число
+    различных размеров.
+    """
+    if size_window < 0:
+        raise ValueError("Разница размеров не может быть отрицательной")
+    groups = {}
+    for index, item in enumerate(items):
+        item = _materialize(item)
+        if isinstance(item, (Jacket, Trousers)):
+            jackets, trousers = groups.setdefault(item.fabric_price, ([], []))
+            (jackets if isinstance(item, Jacket) else trousers).append(
+                (item.calculate_sewing_cost(), item.size, index))
+
+    pairs = []
+    for jackets, trousers in groups.values():
+        if not jackets or not trousers:
+            continue
+        jackets, trousers = (_select(jackets, _size_counts(trousers), size_window),
+                             _select(trousers, _size_counts(jackets), size_window))
+        jackets.sort()
+        trousers.sort()
+        # Пиджаки, допустимые для текущего размера брюк: (верхняя граница размера брюк, номер)
+        candidates = []
+        position = 0
+        for size, _, trousers_index in trousers:
+            while position < len(jackets) and jackets[position][0] - size_window <= size:
+                jacket_size, _, jacket_index = jackets[position]
+                heappush(candidates, (jacket_size + size_window, jacket_index))
+                position += 1
+            while candidates and candidates[0][0] < size:
+                heappop(candidates)
+            if candidates:
+                pairs.append((heappop(candidates)[1], trousers_index))
+    pairs.sort()
+    return pairs
+
+
+def form_suits(calculator: ClothingCalculator, size_window: int = DEFAULT_SIZE_WINDOW, name: str = SUIT_NAME):
+    """Автоматическая сборка костюмов в корзине.
+
+    Подобранные пиджаки и брюки (см. match_suits) заменяются костюмами.
+    Возвращает (количество костюмов, экономия на пошиве).
+    """
+    ids = []
+    items = []
+    for item_class in (Jacket, Trousers):
+        for item_id, item in calculator.iter_entries(item_type=item_class):
+            ids.append(item_id)
+            items.append(_materialize(item))
+    pairs = match_suits(items, size_window)
+    if not pairs:
+        return 0, 0
+    sewing_before = calculator.calculate_total_sewing_cost()
+    calculator.remove_by_ids(ids[index] for pair in pairs for index in pair)
+    for jacket_index, trousers_index in pairs:
+        calculator.add_item(ThreePieceSuit(name, items[jacket_index], items[trousers_index], None))
+    return len(pairs), sewing_before - calculator.calculate_total_sewing_cost()
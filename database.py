@@ -1,10 +1,169 @@
 import sqlite3
 import os
+import calendar
+import re
+import sys
+import threading
 from datetime import datetime
+from itertools import islice
+
+from clothing_package import metrics
 
 # Получаем путь к БД из переменной окружения или используем локальный путь
 DB_NAME = os.getenv('DB_PATH', 'clothing_calculations.db')
 
+# Размер кэша подготовленных выражений одного соединения
+STATEMENT_CACHE_SIZE = 128
+
+# Количество строк в одной транзакции при массовом сохранении
+BULK_CHUNK_SIZE = 1000
+
+# Размер страницы истории по умолчанию
+HISTORY_PAGE_SIZE = 50
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+SECONDS_PER_DAY = 24 * 60 * 60
+
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA foreign_keys=ON',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA busy_timeout=5000',
+)
+
+INSERT_CALCULATION_SQL = '''
+                         INSERT INTO calculations (date, items, total_fabric, total_sewing_cost, total_material_cost,
+                                                   grand_total, created_at)
+                         VALUES (?, ?, ?, ?, ?, ?, ?)
+                         '''
+
+INSERT_CALCULATION_ITEM_SQL = '''
+                              INSERT INTO calculation_items (calculation_id, position, item_type, name, size, options,
+                                                             fabric, sewing_cost, material_cost)
+                              VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                              '''
+
+HISTORY_COLUMNS = 'id, date, items, total_fabric, total_sewing_cost, total_material_cost, grand_total'
+
+SELECT_HISTORY_SQL = f'SELECT {HISTORY_COLUMNS} FROM calculations ORDER BY created_at DESC, id DESC'
+
+_local = threading.local()
+_all_connections = []
+_connections_lock = threading.Lock()
+
+
+def get_connection() -> sqlite3.Connection:
+    """Соединение с БД для текущего потока.
+
+    Соединение открывается при первом обращении и затем переиспользуется,
+    отдельно для каждого потока и каждого пути к БД.
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(DB_NAME)
+    if conn is None:
+        # Закрывать соединения может close_connections из любого потока
+        conn = sqlite3.connect(DB_NAME, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        connections[DB_NAME] = conn
+        with _connections_lock:
+            _all_connections.append((connections, DB_NAME, conn))
+    return conn
+
+
+def close_connections():
+    """Закрытие всех открытых соединений с БД"""
+    with _connections_lock:
+        for connections, path, conn in _all_connections:
+            if connections.get(path) is conn:
+                del connections[path]
+            conn.close()
+        _all_connections.clear()
+
+
+def _timestamp(value) -> int:
+    """Целочисленная метка времени для даты (datetime или строка).
+
+    Дата без часового пояса переводится как UTC, так же как это делает
+    strftime('%s', date) в SQLite при миграции старых записей.
+    """
+    if isinstance(value, str):
+        value = datetime.strptime(value, DATE_FORMAT if ' ' in value else '%Y-%m-%d')
+    return calendar.timegm(value.timetuple())
+
+
+def _migrate_created_at(conn):
+    """Индексируемая целочисленная метка времени вместо сортировки по тексту"""
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(calculations)')}
+    if 'created_at' not in columns:
+        conn.execute('ALTER TABLE calculations ADD COLUMN created_at INTEGER')
+    conn.execute("UPDATE calculations SET created_at = CAST(strftime('%s', date) AS INTEGER) "
+                 "WHERE created_at IS NULL")
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_calculations_created_at ON calculations (created_at, id)')
+
+
+# Строки старого текстового списка изделий: "1. Название (размер 50)"
+# и "2. Костюм-тройка 'Название', размер 50"
+_ITEM_LINE_RE = re.compile(r"^\d+\.\s+(?:Костюм-тройка '(?P<suit>.*)', размер (?P<suit_size>\d+)"
+                           r"|(?P<name>.*) \(размер (?P<size>\d+)\))$")
+
+
+def _parse_item_line(line: str):
+    """Тип, название и размер изделия из строки старого формата"""
+    match = _ITEM_LINE_RE.match(line.strip())
+    if match is None:
+        return None, line.strip(), None
+    if match['suit'] is not None:
+        return 'suit', match['suit'], int(match['suit_size'])
+    # По тексту пиджак от брюк не отличить, тип остаётся неизвестным
+    return None, match['name'], int(match['size'])
+
+
+def _migrate_calculation_items(conn):
+    """Нормализованная таблица изделий расчёта с переносом старых текстовых списков"""
+    conn.execute('''
+                 CREATE TABLE IF NOT EXISTS calculation_items
+                 (
+                     id             INTEGER PRIMARY KEY,
+                     calculation_id INTEGER NOT NULL REFERENCES calculations (id) ON DELETE CASCADE,
+                     position       INTEGER NOT NULL,
+                     item_type      TEXT,
+                     name           TEXT    NOT NULL,
+                     size           INTEGER,
+                     options        TEXT,
+                     fabric         REAL,
+                     sewing_cost    REAL,
+                     material_cost  REAL
+                 )
+                 ''')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_calculation_items_calculation '
+                 'ON calculation_items (calculation_id, position)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_calculation_items_type_size ON calculation_items (item_type, size)')
+    rows = conn.execute('SELECT id, items FROM calculations '
+                        'WHERE id NOT IN (SELECT calculation_id FROM calculation_items)')
+    conn.executemany(INSERT_CALCULATION_ITEM_SQL,
+                     ((calculation_id, position, *_parse_item_line(line), None, None, None, None)
+                      for calculation_id, items in rows.fetchall()
+                      for position, line in enumerate(filter(str.strip, items.split('\n')), 1)))
+
+
+# Миграции схемы по порядку; номер применённой хранится в PRAGMA user_version
+MIGRATIONS = (
+    _migrate_created_at,
+    _migrate_calculation_items,
+)
+
+
+def _apply_migrations(conn):
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], version + 1):
+        with conn:
+            migration(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+
 
 def init_db():
     """Инициализация базы данных"""
@@ -13,9 +172,9 @@ def init_db():
     if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir)
 
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
+    conn = get_connection()
+    with conn:
+        conn.execute('''
                    CREATE TABLE IF NOT EXISTS calculations
                    (
                        id
@@ -49,30 +208,134 @@ def init_db():
                        NULL
                    )
                    ''')
-    conn.commit()
-    conn.close()
+    _apply_migrations(conn)
+
+
+def save_calculation(items, total_fabric, total_sewing, total_materials, grand_total, item_rows=()):
+    """Сохранение расчёта в БД.
 
+    item_rows - строки изделий (тип, название, размер, параметры в JSON, расход ткани,
+    пошив, материалы), сохраняются в calculation_items в той же транзакции.
+    Возвращает id расчёта.
+    """
+    now = datetime.now()
+    conn = get_connection()
+    with conn:
+        return _insert_calculation(conn, (now.strftime(DATE_FORMAT), items, total_fabric, total_sewing,
+                                          total_materials, grand_total, _timestamp(now)), item_rows)
 
-def save_calculation(items, total_fabric, total_sewing, total_materials, grand_total):
-    """Сохранение расчёта в БД"""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('''
-                   INSERT INTO calculations (date, items, total_fabric, total_sewing_cost, total_material_cost,
-                                             grand_total)
-                   VALUES (?, ?, ?, ?, ?, ?)
-                   ''',
-                   (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), items, total_fabric, total_sewing, total_materials,
-                    grand_total))
-    conn.commit()
-    conn.close()
+
+def _insert_calculation(conn, params, item_rows) -> int:
+    """Запись расчёта и его изделий в текущей транзакции; возвращает id расчёта"""
+    calculation_id = conn.execute(INSERT_CALCULATION_SQL, params).lastrowid
+    conn.executemany(INSERT_CALCULATION_ITEM_SQL,
+                     ((calculation_id, position, *row) for position, row in enumerate(item_rows, 1)))
+    return calculation_id
 
 
 def get_history():
     """Получение истории расчётов"""
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM calculations ORDER BY date DESC')
-    data = cursor.fetchall()
-    conn.close()
-    return data
\ No newline at end of file
+    return get_connection().execute(SELECT_HISTORY_SQL).fetchall()
+
+
+def get_calculation_items(calculation_id: int):
+    """Изделия расчёта по порядку"""
+    return get_connection().execute(
+        'SELECT position, item_type, name, size, options, fabric, sewing_cost, material_cost '
+        'FROM calculation_items WHERE calculation_id = ? ORDER BY position', (calculation_id,)).fetchall()
+
+
+def iter_history_pages(page_size: int = HISTORY_PAGE_SIZE, date_from=None, date_to=None):
+    """Постраничная выдача истории расчётов, от новых к старым.
+
+    Страницы читаются по мере запроса с продолжением от последней
+    выданной записи (keyset-пагинация), поэтому в памяти только одна страница.
+    date_from и date_to (включительно) - datetime или строки '%Y-%m-%d[ %H:%M:%S]';
+    date_to без времени включает весь указанный день.
+    """
+    if page_size < 1:
+        raise ValueError("Размер страницы должен быть положительным")
+    conditions = []
+    params = []
+    if date_from is not None:
+        conditions.append('created_at >= ?')
+        params.append(_timestamp(date_from))
+    if date_to is not None:
+        if isinstance(date_to, str) and ' ' not in date_to:
+            # Дата без времени включает весь день: до начала следующего
+            conditions.append('created_at < ?')
+            params.append(_timestamp(date_to) + SECONDS_PER_DAY)
+        else:
+            conditions.append('created_at <= ?')
+            params.append(_timestamp(date_to))
+    columns = f'SELECT {HISTORY_COLUMNS}, created_at FROM calculations'
+    order = ' ORDER BY created_at DESC, id DESC LIMIT ?'
+    where = ' WHERE ' + ' AND '.join(conditions) if conditions else ''
+    rows = get_connection().execute(columns + where + order, (*params, page_size)).fetchall()
+    while rows:
+        yield [row[:-1] for row in rows]
+        if len(rows) < page_size:
+            return
+        # Продолжение в два запроса: сначала оставшиеся записи с той же датой,
+        # затем более старые. Условие (created_at, id) < (?, ?) SQLite ограничивает
+        # по индексу только датой, и записи с одинаковой датой перебирались бы
+        # заново на каждой странице
+        created_at, last_id = rows[-1][-1], rows[-1][0]
+        rows = get_connection().execute(f'{columns} WHERE created_at = ? AND id < ? ORDER BY id DESC LIMIT ?',
+                                        (created_at, last_id, page_size)).fetchall()
+        if len(rows) < page_size:
+            older = ' AND '.join(conditions + ['created_at < ?'])
+            rows += get_connection().execute(f'{columns} WHERE {older}{order}',
+                                             (*params, created_at, page_size - len(rows))).fetchall()
+
+
+def iter_history(page_size: int = HISTORY_PAGE_SIZE, date_from=None, date_to=None):
+    """Потоковая выдача записей истории (см. iter_history_pages)"""
+    for page in iter_history_pages(page_size, date_from, date_to):
+        yield from page
+
+
+def _calculation_params(rows, now):
+    """Параметры INSERT_CALCULATION_SQL и строки изделий каждого расчёта"""
+    now_timestamp = _timestamp(now)
+    now = now.strftime(DATE_FORMAT)
+    for row in rows:
+        items, total_fabric, total_sewing, total_materials, grand_total, *rest = row
+        item_rows = rest.pop(0) if rest and not isinstance(rest[0], str) else ()
+        if rest:
+            params = (rest[0], items, total_fabric, total_sewing, total_materials, grand_total, _timestamp(rest[0]))
+        else:
+            params = (now, items, total_fabric, total_sewing, total_materials, grand_total, now_timestamp)
+        yield params, item_rows
+
+
+def save_calculations_many(rows, chunk_size: int = BULK_CHUNK_SIZE) -> int:
+    """Массовое сохранение расчётов в БД.
+
+    Каждая строка - кортеж аргументов save_calculation (строки изделий
+    необязательны), к которому можно добавить дату в формате
+    '%Y-%m-%d %H:%M:%S'. Строки читаются потоково
+    и записываются порциями по chunk_size, каждая порция в одной транзакции.
+    Возвращает количество сохранённых строк.
+    """
+    if chunk_size < 1:
+        raise ValueError("Размер порции должен быть положительным")
+    conn = get_connection()
+    calculations = _calculation_params(rows, datetime.now())
+    saved = 0
+    while True:
+        chunk = list(islice(calculations, chunk_size))
+        if not chunk:
+            return saved
+        with conn:
+            if any(item_rows for params, item_rows in chunk):
+                # id расчёта для строк изделий известен только после вставки каждой строки
+                for params, item_rows in chunk:
+                    _insert_calculation(conn, params, item_rows)
+            else:
+                conn.executemany(INSERT_CALCULATION_SQL, [params for params, item_rows in chunk])
+        saved += len(chunk)
+
+
+metrics.instrument(sys.modules[__name__], 'init_db', 'save_calculation', 'get_history', 'get_calculation_items',
+                   'save_calculations_many', prefix='database')
@@ -1,16 +1,29 @@
+import importlib.util
 import os
 import sys
 from clothing_package import Jacket, Trousers, ThreePieceSuit, ClothingCalculator
-from database import init_db, save_calculation, get_history
+from clothing_package.item_store import item_class
+from clothing_package.pricing_tables import MIN_SIZE, MAX_SIZE
+from datetime import datetime
+
+# Отчёты, БД, пакетный режим и HTTP-сервис импортируются при первом использовании,
+# чтобы запуск меню и командной строки не платил за python-docx, SQLite и asyncio.
+# Наличие python-docx проверяется без импорта самой библиотеки.
+DOCX_AVAILABLE = importlib.util.find_spec('docx') is not None
+if not DOCX_AVAILABLE:
+    print("python-docx не установлен. Сохранение в .docx недоступно.")
 
-try:
-    from docx import Document
-    from datetime import datetime
 
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-    print("python-docx не установлен. Сохранение в .docx недоступно.")
+# Количество расчётов на одной странице истории
+HISTORY_PAGE_SIZE = 10
+
+# Количество последних периодов в аналитике
+ANALYTICS_PERIODS = 12
+
+# Имя файла снимка корзины, предлагаемое по умолчанию
+CART_SNAPSHOT = 'cart.snapshot'
+
+ITEM_TYPE_NAMES = {'jacket': 'Пиджаки', 'trousers': 'Брюки', 'suit': 'Костюмы', 'unknown': 'Без типа'}
 
 
 class ClothingApp:
@@ -18,7 +31,17 @@ class ClothingApp:
 
     def __init__(self):
         self.calculator = ClothingCalculator()
-        init_db()
+        self._db_ready = False
+
+    def ensure_db(self):
+        """Инициализация БД и сводных таблиц при первом обращении"""
+        if not self._db_ready:
+            from database import init_db
+            from analytics import init_analytics
+
+            init_db()
+            init_analytics()
+            self._db_ready = True
 
     def clear_screen(self):
         """Очистка экрана (безопасная версия)"""
@@ -43,10 +66,15 @@ class ClothingApp:
         print("4. Показать все изделия")
         print("5. Удалить изделие")
         print("6. Рассчитать итоги")
-        if DOCX_AVAILABLE:
-            print("7. Сохранить отчёт в .docx")
+        print("7. Сохранить отчёт (.docx, .csv, .json)")
         print("8. Показать историю расчётов")
-        print("9. Выход")
+        print("9. Аналитика")
+        print("10. Метрики")
+        print("11. Автоподбор костюмов")
+        print("12. План раскроя по рулонам")
+        print("13. Сохранить корзину в файл")
+        print("14. Загрузить корзину из файла")
+        print("0. Выход")
 
     def get_input(self, prompt, input_type=str, validation=None):
         """Безопасный ввод данных с обработкой ошибок"""
@@ -75,7 +103,7 @@ class ClothingApp:
 
     def validate_size(self, size):
         """Проверка размера (44-64)"""
-        return 44 <= size <= 64
+        return MIN_SIZE <= size <= MAX_SIZE
 
     def validate_positive(self, value):
         """Проверка положительного числа"""
@@ -146,19 +174,15 @@ class ClothingApp:
             return
 
         print("\nДоступные изделия:")
-        items = self.calculator.get_items()
 
-        # Показываем только пиджаки и брюки
-        jackets = []
-        trousers_list = []
+        # Показываем только пиджаки и брюки, отобранные по индексу типов калькулятора
+        jackets = dict(self.calculator.iter_entries(item_type=Jacket))
+        trousers_list = dict(self.calculator.iter_entries(item_type=Trousers))
 
-        for i, item in enumerate(items):
-            if isinstance(item, Jacket):
-                jackets.append((i, item))
-                print(f"{i + 1}. {item} (Пиджак)")
-            elif isinstance(item, Trousers):
-                trousers_list.append((i, item))
-                print(f"{i + 1}. {item} (Брюки)")
+        for item_id, item in jackets.items():
+            print(f"{item_id}. {item} (Пиджак)")
+        for item_id, item in trousers_list.items():
+            print(f"{item_id}. {item} (Брюки)")
 
         if not jackets or not trousers_list:
             print("\nНе хватает пиджака или брюк для создания костюма!")
@@ -167,30 +191,25 @@ class ClothingApp:
 
         try:
             print("\nВыберите пиджак:")
-            jacket_idx = self.get_input("Номер пиджака: ", int) - 1
+            jacket_id = self.get_input("Номер пиджака: ", int)
 
             print("\nВыберите брюки:")
-            trousers_idx = self.get_input("Номер брюк: ", int) - 1
+            trousers_id = self.get_input("Номер брюк: ", int)
 
-            # Проверяем, что выбранные индексы соответствуют пиджаку и брюкам
-            selected_jacket = None
-            selected_trousers = None
-
-            for idx, item in jackets:
-                if idx == jacket_idx:
-                    selected_jacket = item
-                    break
-
-            for idx, item in trousers_list:
-                if idx == trousers_idx:
-                    selected_trousers = item
-                    break
+            # Проверяем, что выбранные номера соответствуют пиджаку и брюкам
+            selected_jacket = jackets.get(jacket_id)
+            selected_trousers = trousers_list.get(trousers_id)
 
             if not selected_jacket or not selected_trousers:
                 print("Ошибка: выберите корректные номера пиджака и брюк")
                 self.wait_for_enter()
                 return
 
+            if self.calculator.compact:
+                # Загруженная из снимка корзина выдаёт представления строк
+                selected_jacket = selected_jacket.materialize()
+                selected_trousers = selected_trousers.materialize()
+
             name = self.get_input("Название костюма: ", str)
             suit = ThreePieceSuit(name, selected_jacket, selected_trousers, None)
             self.calculator.add_item(suit)
@@ -205,18 +224,100 @@ class ClothingApp:
 
         self.wait_for_enter()
 
+    def match_suits(self):
+        """Автоматическая сборка костюмов из пиджаков и брюк корзины"""
+        from clothing_package.suit_matching import DEFAULT_SIZE_WINDOW, form_suits
+
+        self.clear_screen()
+        print("АВТОПОДБОР КОСТЮМОВ")
+        print("Пиджак и брюки объединяются в костюм при одинаковой цене ткани и близких размерах.")
+        print("Подобранные изделия заменяются костюмами.")
+
+        window = self.get_input(f"Допустимая разница размеров (обычно {DEFAULT_SIZE_WINDOW}): ", int,
+                                self.validate_positive)
+        count, saving = form_suits(self.calculator, window)
+        if count:
+            print(f"\nСоздано костюмов: {count}")
+            print(f"Экономия на пошиве: {saving:.2f} руб")
+        else:
+            print("\nПодходящих пар пиджаков и брюк не найдено")
+
+        self.wait_for_enter()
+
+    def show_cutting_plan(self):
+        """Раскладка ткани изделий корзины по рулонам"""
+        from clothing_package.cutting_plan import plan_cutting, plan_totals
+
+        self.clear_screen()
+        print("ПЛАН РАСКРОЯ")
+
+        if len(self.calculator) == 0:
+            print("Нет изделий для раскроя")
+            self.wait_for_enter()
+            return
+
+        roll_length = self.get_input("Длина рулона (м): ", float, lambda value: value > 0)
+        try:
+            plan = plan_cutting(self.calculator, roll_length)
+        except ValueError as e:
+            print(f"Ошибка: {e}")
+            self.wait_for_enter()
+            return
+
+        for fabric_price, fabric in plan.items():
+            print(f"\nТкань {fabric_price} руб/м: рулонов {len(fabric['rolls'])} "
+                  f"(минимум {fabric['lower_bound']}), отходы {fabric['waste']:.2f} м")
+            for number, roll in enumerate(fabric['rolls'], 1):
+                print(f"  Рулон {number}: " + ", ".join(f"{item_id}. {self.calculator.get_item(item_id)}"
+                                                        for item_id in roll))
+        totals = plan_totals(plan)
+        print(f"\nВсего рулонов: {totals['rolls']}, отходы: {totals['waste']:.2f} м")
+
+        self.wait_for_enter()
+
+    def save_cart(self):
+        """Сохранение корзины в двоичный снимок"""
+        from clothing_package.snapshot import save_snapshot
+
+        self.clear_screen()
+        print("СОХРАНЕНИЕ КОРЗИНЫ")
+
+        filename = self.get_input(f"Имя файла (например, {CART_SNAPSHOT}): ", str)
+        try:
+            save_snapshot(self.calculator, filename)
+            print(f"\nКорзина сохранена: {os.path.abspath(filename)} ({len(self.calculator)} изд.)")
+        except (OSError, TypeError) as e:
+            print(f"\nОшибка при сохранении корзины: {e}")
+
+        self.wait_for_enter()
+
+    def load_cart(self):
+        """Загрузка корзины из двоичного снимка вместо текущей"""
+        from clothing_package.snapshot import load_snapshot
+
+        self.clear_screen()
+        print("ЗАГРУЗКА КОРЗИНЫ")
+
+        filename = self.get_input(f"Имя файла (например, {CART_SNAPSHOT}): ", str)
+        try:
+            self.calculator = load_snapshot(filename)
+            print(f"\nЗагружено изделий: {len(self.calculator)}")
+        except (OSError, ValueError) as e:
+            print(f"\nОшибка при загрузке корзины: {e}")
+
+        self.wait_for_enter()
+
     def show_items(self):
         """Показ всех изделий"""
         self.clear_screen()
         print("ВСЕ ИЗДЕЛИЯ")
 
-        items = self.calculator.get_items()
-        if not items:
+        if len(self.calculator) == 0:
             print("Нет добавленных изделий")
         else:
-            for i, item in enumerate(items):
-                print(f"\n{i + 1}. {item}")
-                print(f"   Тип: {item.__class__.__name__}")
+            for item_id, item in self.calculator.iter_entries():
+                print(f"\n{item_id}. {item}")
+                print(f"   Тип: {item_class(item).__name__}")
                 print(f"   Расход ткани: {item.calculate_fabric_consumption()} м")
                 print(f"   Стоимость пошива: {item.calculate_sewing_cost()} руб")
                 print(f"   Стоимость материалов: {item.calculate_total_cost()} руб")
@@ -229,22 +330,23 @@ class ClothingApp:
         self.clear_screen()
         print("УДАЛЕНИЕ ИЗДЕЛИЯ")
 
-        items = self.calculator.get_items()
-        if not items:
+        if len(self.calculator) == 0:
             print("Нет изделий для удаления")
             self.wait_for_enter()
             return
 
-        for i, item in enumerate(items):
-            print(f"{i + 1}. {item}")
+        for item_id, item in self.calculator.iter_entries():
+            print(f"{item_id}. {item}")
 
         try:
-            idx = self.get_input("Выберите номер для удаления (0 для отмены): ", int) - 1
-            if idx >= 0:
-                self.calculator.remove_item(idx)
+            item_id = self.get_input("Выберите номер для удаления (0 для отмены): ", int)
+            if item_id > 0:
+                self.calculator.remove_by_id(item_id)
                 print("Изделие удалено!")
             else:
                 print("Удаление отменено")
+        except KeyError:
+            print("Изделие с таким номером не найдено")
         except Exception as e:
             print(f"Ошибка при удалении: {e}")
 
@@ -273,8 +375,14 @@ class ClothingApp:
 
         # Сохраняем в БД
         try:
-            details = "\n".join([f"{i + 1}. {item}" for i, item in enumerate(self.calculator.get_items())])
-            save_calculation(details, total_fabric, total_sewing, total_materials, grand_total)
+            from clothing_package.records import item_row
+            from database import save_calculation
+
+            self.ensure_db()
+            items = self.calculator.get_items()
+            details = "\n".join([f"{i + 1}. {item}" for i, item in enumerate(items)])
+            save_calculation(details, total_fabric, total_sewing, total_materials, grand_total,
+                             [item_row(item) for item in items])
             print("\nРасчёт сохранён в базу данных")
         except Exception as e:
             print(f"\nОшибка при сохранении в БД: {e}")
@@ -282,13 +390,7 @@ class ClothingApp:
         self.wait_for_enter()
 
     def save_report(self):
-        """Сохранение отчёта в .docx"""
-        if not DOCX_AVAILABLE:
-            print("Библиотека python-docx не установлена.")
-            print("Установите: pip install python-docx")
-            self.wait_for_enter()
-            return
-
+        """Сохранение отчёта в .docx, .csv или .json"""
         self.clear_screen()
         print("СОХРАНЕНИЕ ОТЧЁТА")
 
@@ -297,30 +399,21 @@ class ClothingApp:
             self.wait_for_enter()
             return
 
+        from reports import REPORT_WRITERS
+
+        formats = [name for name in REPORT_WRITERS if name != 'docx' or DOCX_AVAILABLE]
+        if not DOCX_AVAILABLE:
+            print("Библиотека python-docx не установлена, формат .docx недоступен.")
+            print("Установите: pip install python-docx")
+        report_format = self.get_input(f"Формат отчёта ({', '.join(formats)}): ", str).strip().lower()
+        if report_format not in formats:
+            print("Неизвестный формат отчёта")
+            self.wait_for_enter()
+            return
+
         try:
-            doc = Document()
-            doc.add_heading('Отчёт о расчёте одежды', 0)
-
-            # Дата
-            doc.add_paragraph(f"Дата: {datetime.now().strftime('%d.%m.%Y %H:%M')}")
-
-            doc.add_heading('Изделия:', level=1)
-            for i, item in enumerate(self.calculator.get_items()):
-                doc.add_heading(f"{i + 1}. {item}", level=2)
-                doc.add_paragraph(f"Тип: {item.__class__.__name__}", style='List Bullet')
-                doc.add_paragraph(f"Расход ткани: {item.calculate_fabric_consumption()} м", style='List Bullet')
-                doc.add_paragraph(f"Стоимость пошива: {item.calculate_sewing_cost()} руб", style='List Bullet')
-                doc.add_paragraph(f"Стоимость материалов: {item.calculate_total_cost()} руб", style='List Bullet')
-
-            doc.add_heading('Итоги:', level=1)
-            doc.add_paragraph(f"Общий расход ткани: {self.calculator.calculate_total_fabric():.2f} м")
-            doc.add_paragraph(f"Общая стоимость пошива: {self.calculator.calculate_total_sewing_cost():.2f} руб")
-            doc.add_paragraph(f"Общая стоимость материалов: {self.calculator.calculate_total_material_cost():.2f} руб")
-            doc.add_paragraph(
-                f"ИТОГО: {self.calculator.calculate_total_sewing_cost() + self.calculator.calculate_total_material_cost():.2f} руб")
-
-            filename = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-            doc.save(filename)
+            filename = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{report_format}"
+            REPORT_WRITERS[report_format](self.calculator, filename)
             print(f"\nОтчёт сохранён как {filename}")
             print(f"   Полный путь: {os.path.abspath(filename)}")
 
@@ -335,11 +428,12 @@ class ClothingApp:
         print("ИСТОРИЯ РАСЧЁТОВ")
 
         try:
-            history = get_history()
-            if not history:
-                print("История пуста")
-            else:
-                for record in history:
+            from database import iter_history_pages
+
+            self.ensure_db()
+            shown = 0
+            for page in iter_history_pages(HISTORY_PAGE_SIZE):
+                for record in page:
                     print(f"ID: {record[0]} | Дата: {record[1]}")
                     print("Изделия:")
                     for line in record[2].split('\n'):
@@ -348,11 +442,85 @@ class ClothingApp:
                     print(f"Стоимость пошива: {record[4]:.2f} руб")
                     print(f"Стоимость материалов: {record[5]:.2f} руб")
                     print(f"ИТОГО: {record[6]:.2f} руб")
+                shown += len(page)
+                if len(page) < HISTORY_PAGE_SIZE or not self.ask_next_page():
+                    break
+            if not shown:
+                print("История пуста")
         except Exception as e:
             print(f"Ошибка при загрузке истории: {e}")
 
         self.wait_for_enter()
 
+    def show_analytics(self):
+        """Итоги по дням, неделям или месяцам в разрезе типов изделий"""
+        self.clear_screen()
+        print("АНАЛИТИКА")
+
+        periods = {'д': 'day', 'н': 'week', 'м': 'month'}
+        period = periods.get(self.get_input("Период (д - день, н - неделя, м - месяц): ", str).strip().lower())
+        if period is None:
+            print("Неизвестный период")
+            self.wait_for_enter()
+            return
+
+        try:
+            from analytics import get_rollup
+
+            self.ensure_db()
+            rows = get_rollup(period, limit=ANALYTICS_PERIODS)
+            if not rows:
+                print("Нет данных для аналитики")
+            for period_key, item_type, count, fabric, sewing, materials in rows:
+                print(f"{period_key} | {ITEM_TYPE_NAMES.get(item_type, item_type)}: {count} шт. | "
+                      f"ткань {fabric:.2f} м | пошив {sewing:.2f} руб | материалы {materials:.2f} руб")
+        except Exception as e:
+            print(f"Ошибка при загрузке аналитики: {e}")
+
+        self.wait_for_enter()
+
+    def show_metrics(self):
+        """Счётчики вызовов и задержки расчётов и операций с БД"""
+        from clothing_package import metrics
+
+        self.clear_screen()
+        print("МЕТРИКИ")
+        print(f"Сбор метрик {'включён' if metrics.is_enabled() else 'выключен'}")
+        for name, data in metrics.snapshot().items():
+            average = data['total_seconds'] / data['count'] * 1000
+            print(f"{name}: {data['count']} вызовов, ошибок {data['errors']}, "
+                  f"всего {data['total_seconds'] * 1000:.2f} мс, в среднем {average:.4f} мс")
+
+        action = self.get_input("\nв - включить, о - выключить, с - сбросить, ф - сохранить в файл, "
+                                "Enter - назад: ", str).strip().lower()
+        if action == 'в':
+            metrics.enable()
+            print("Сбор метрик включён")
+        elif action == 'о':
+            metrics.disable()
+            print("Сбор метрик выключен")
+        elif action == 'с':
+            metrics.reset()
+            print("Метрики сброшены")
+        elif action == 'ф':
+            filename = self.get_input("Имя файла (.json или .prom): ", str)
+            try:
+                metrics.dump(filename)
+                print(f"Метрики сохранены: {filename}")
+            except OSError as e:
+                print(f"Ошибка при сохранении: {e}")
+        else:
+            return
+        self.wait_for_enter()
+
+    def ask_next_page(self):
+        """Запрос следующей страницы: True - показать, False - завершить просмотр"""
+        try:
+            answer = input("\nEnter - следующая страница, q - выход: ")
+        except (KeyboardInterrupt, EOFError):
+            return False
+        return answer.strip().lower() not in ('q', 'й')
+
     def wait_for_enter(self):
         """Ожидание нажатия Enter (безопасная версия)"""
         try:
@@ -380,15 +548,27 @@ class ClothingApp:
                     self.remove_item()
                 elif choice == '6':
                     self.calculate_totals()
-                elif choice == '7' and DOCX_AVAILABLE:
+                elif choice == '7':
                     self.save_report()
                 elif choice == '8':
                     self.show_history()
                 elif choice == '9':
+                    self.show_analytics()
+                elif choice == '10':
+                    self.show_metrics()
+                elif choice == '11':
+                    self.match_suits()
+                elif choice == '12':
+                    self.show_cutting_plan()
+                elif choice == '13':
+                    self.save_cart()
+                elif choice == '14':
+                    self.load_cart()
+                elif choice == '0':
                     print("\nДо свидания!")
                     break
                 else:
-                    print("\nНеверный выбор! Пожалуйста, выберите 1-9")
+                    print("\nНеверный выбор! Пожалуйста, выберите 0-14")
                     self.wait_for_enter()
 
             except KeyboardInterrupt:
@@ -400,7 +580,111 @@ class ClothingApp:
                 self.wait_for_enter()
 
 
+def build_parser():
+    """Разбор аргументов командной строки для неинтерактивных режимов"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Калькулятор расхода ткани и стоимости пошива")
+    subparsers = parser.add_subparsers(dest='command')
+
+    batch = subparsers.add_parser('batch', help="пакетный расчёт заказов из JSONL или CSV")
+    batch.add_argument('orders', help="файл заказов (.jsonl или .csv)")
+    batch.add_argument('--out', required=True, help="CSV-файл для итогов по заказам")
+    batch.add_argument('--format', choices=('jsonl', 'csv'), help="формат файла заказов (по умолчанию по расширению)")
+    batch.add_argument('--chunk-size', type=int, help="заказов в одной порции (по умолчанию 1000)")
+    batch.add_argument('--save-db', action='store_true', help="сохранять итоги заказов в БД")
+    batch.add_argument('--workers', type=int, default=1, help="количество процессов для расчёта")
+    batch.add_argument('--metrics-out', help="файл метрик (.json или .prom, при --workers > 1 без расчёта заказов)")
+
+    serve = subparsers.add_parser('serve', help="HTTP-сервис расчёта стоимости")
+    serve.add_argument('--host', help="адрес (по умолчанию 127.0.0.1)")
+    serve.add_argument('--port', type=int, help="порт (по умолчанию 8080)")
+    serve.add_argument('--window-ms', type=float, help="окно объединения запросов, мс (по умолчанию 2)")
+    serve.add_argument('--save-db', action='store_true', help="сохранять расчёты корзин в БД")
+    serve.add_argument('--metrics', action='store_true', help="собирать метрики и отдавать их по GET /metrics")
+    serve.add_argument('--cache-size', type=int, help="кэшировать расчёты изделий: записей в памяти")
+    serve.add_argument('--cache-db', help="файл SQLite для кэша расчётов между перезапусками")
+    serve.add_argument('--cache-ttl', type=float, help="срок хранения расчёта в кэше, секунды")
+
+    load = subparsers.add_parser('loadtest', help="нагрузочный тест HTTP-сервиса")
+    load.add_argument('--host', help="адрес сервиса (по умолчанию запускается встроенный)")
+    load.add_argument('--port', type=int)
+    load.add_argument('--requests', type=int, default=2000)
+    load.add_argument('--concurrency', type=int, default=50)
+    return parser
+
+
+def run_batch_command(args):
+    from batch_processing import BATCH_CHUNK_SIZE, run_batch
+    from clothing_package import metrics
+
+    if args.metrics_out:
+        metrics.enable()
+    try:
+        count = run_batch(args.orders, args.out, args.chunk_size or BATCH_CHUNK_SIZE, args.save_db,
+                          args.format, args.workers)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ошибка пакетного расчёта: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.metrics_out:
+            metrics.dump(args.metrics_out)
+    print(f"Обработано заказов: {count}. Результаты: {args.out}")
+    return 0
+
+
+def run_serve_command(args):
+    import asyncio
+    import quote_service
+
+    window = quote_service.BATCH_WINDOW if args.window_ms is None else args.window_ms / 1000
+    if args.metrics:
+        quote_service.metrics.enable()
+    cache = None
+    if args.cache_size or args.cache_db:
+        from clothing_package.quote_cache import DEFAULT_MAX_SIZE, QuoteCache
+
+        cache = QuoteCache(args.cache_size or DEFAULT_MAX_SIZE, args.cache_ttl, args.cache_db)
+    try:
+        asyncio.run(quote_service.serve(args.host or quote_service.DEFAULT_HOST,
+                                        args.port or quote_service.DEFAULT_PORT, window, args.save_db, cache))
+    except KeyboardInterrupt:
+        print("\nСервис остановлен")
+    return 0
+
+
+def run_loadtest_command(args):
+    import asyncio
+    import quote_service
+
+    stats = asyncio.run(quote_service.load_test(args.host, args.port, args.requests, args.concurrency))
+    print(f"Запросов: {stats['requests']} (ошибок: {stats['errors']}) за {stats['seconds']:.2f} с")
+    print(f"Запросов в секунду: {stats['rps']:.0f}")
+    print(f"Задержка p50: {stats['p50_ms']:.2f} мс, p99: {stats['p99_ms']:.2f} мс")
+    return 0
+
+
+COMMANDS = {
+    'batch': run_batch_command,
+    'serve': run_serve_command,
+    'loadtest': run_loadtest_command,
+}
+
+
+def run_command(argv):
+    """Запуск неинтерактивной команды, возвращает код завершения"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return COMMANDS[args.command](args)
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_command(sys.argv[1:]))
+
     # Добавляем обработку сигналов для корректного завершения
     try:
         app = ClothingApp()
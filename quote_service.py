@@ -0,0 +1,355 @@
+import asyncio
+import json
+import math
+import sys
+import time
+from http import HTTPStatus
+
+from async_database import init_db_async, save_calculation_async, shutdown
+from clothing_package import metrics
+from clothing_package.money import from_kopecks, from_mm
+from clothing_package.quote_cache import QuoteCache
+from clothing_package.records import item_from_dict, item_row, SUIT_TYPE
+
+# Окно накопления запросов перед общим расчётом, секунды
+BATCH_WINDOW = 0.002
+# Максимальный размер пачки запросов
+MAX_BATCH_SIZE = 256
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+ROUTES = {
+    '/quote/item': 'item',
+    '/quote/suit': 'suit',
+    '/quote/cart': 'cart',
+}
+
+
+def _figures(item, cache: QuoteCache = None) -> tuple:
+    """(расход ткани в мм, пошив и материалы в копейках) изделия"""
+    if cache is not None:
+        return cache.quote(item)
+    return item.fabric_mm(), item.sewing_kopecks(), item.material_kopecks()
+
+
+def _item_quote(item, figures: tuple) -> dict:
+    fabric, sewing, materials = figures
+    return {'type': item.__class__.__name__, 'name': item.name, 'size': item.size,
+            'fabric': from_mm(fabric), 'sewing_cost': from_kopecks(sewing),
+            'material_cost': from_kopecks(materials), 'total': from_kopecks(sewing + materials)}
+
+
+def quote_item(data: dict, cache: QuoteCache = None) -> dict:
+    """Расчёт одного изделия по описанию из records.item_to_dict"""
+    item = item_from_dict(data)
+    return _item_quote(item, _figures(item, cache))
+
+
+def quote_suit(data: dict, cache: QuoteCache = None) -> dict:
+    """Расчёт костюма по описаниям пиджака и брюк"""
+    return quote_item({**data, 'type': SUIT_TYPE}, cache)
+
+
+def quote_cart(data: dict, cache: QuoteCache = None):
+    """Расчёт корзины: ответ и строки изделий для сохранения в БД.
+
+    Суммы считаются в целых миллиметрах и копейках, как в ClothingCalculator.
+    """
+    items = [item_from_dict(item_data) for item_data in data['items']]
+    figures = [_figures(item, cache) for item in items]
+    total_fabric, total_sewing, total_materials = (sum(column) for column in zip(*figures)) if figures else (0, 0, 0)
+    response = {
+        'items': [_item_quote(item, item_figures) for item, item_figures in zip(items, figures)],
+        'total_fabric': from_mm(total_fabric),
+        'total_sewing_cost': from_kopecks(total_sewing),
+        'total_material_cost': from_kopecks(total_materials),
+        'grand_total': from_kopecks(total_sewing + total_materials),
+    }
+    rows = [item_row(item, (quote['fabric'], quote['sewing_cost'], quote['material_cost']))
+            for item, quote in zip(items, response['items'])]
+    return response, rows
+
+
+_QUOTES = {
+    'item': lambda data, cache: (quote_item(data, cache), None),
+    'suit': lambda data, cache: (quote_suit(data, cache), None),
+    'cart': quote_cart,
+}
+
+
+def quote_batch(requests, cache: QuoteCache = None) -> list:
+    """Общий расчёт пачки запросов (вид, данные).
+
+    Одинаковые запросы в пачке считаются один раз, а с кэшем расчётов
+    изделий (см. quote_cache) повторно не считаются и изделия из разных
+    пачек. Для каждого запроса возвращается (ошибка, результат), где
+    ошибка - None или исключение.
+    """
+    computed = {}
+    results = []
+    for kind, data in requests:
+        key = (kind, json.dumps(data, sort_keys=True, ensure_ascii=False))
+        if key not in computed:
+            try:
+                computed[key] = (None, _QUOTES[kind](data, cache))
+            except (KeyError, TypeError, ValueError) as e:
+                computed[key] = (e, None)
+        results.append(computed[key])
+    return results
+
+
+class QuoteBatcher:
+    """Объединение запросов, пришедших в пределах короткого окна, в один расчёт"""
+
+    def __init__(self, window: float = BATCH_WINDOW, max_batch: int = MAX_BATCH_SIZE, cache: QuoteCache = None):
+        self.window = window
+        self.max_batch = max_batch
+        self.cache = cache
+        self.batches = 0
+        self.requests = 0
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, kind: str, data):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((kind, data, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.requests += len(batch)
+        try:
+            results = quote_batch([(kind, data) for kind, data, _ in batch], self.cache)
+        except Exception as e:
+            # Ожидающие ответа клиенты не должны зависнуть из-за непредвиденной ошибки
+            results = [(e, None)] * len(batch)
+        for (_, _, future), (error, result) in zip(batch, results):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        if self.cache is not None:
+            # Новые расчёты пишутся на диск одной транзакцией в потоке кэша, не в цикле событий
+            self.cache.flush_later()
+
+
+class QuoteService:
+    """HTTP-сервис расчёта стоимости поверх clothing_package"""
+
+    def __init__(self, window: float = BATCH_WINDOW, max_batch: int = MAX_BATCH_SIZE, save_db: bool = False,
+                 cache: QuoteCache = None):
+        self.batcher = QuoteBatcher(window, max_batch, cache)
+        self.save_db = save_db
+        self.cache = cache
+        if cache is not None:
+            # Диск пишется после каждой пачки (QuoteBatcher._flush), а не внутри расчёта
+            cache.flush_every = None
+        self._server = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        if self.save_db:
+            await init_db_async()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.save_db:
+            shutdown()
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.close)
+
+    async def dispatch(self, method: str, path: str, body: bytes):
+        """Обработка запроса: (HTTP-статус, объект ответа)"""
+        if method == 'GET' and path == '/health':
+            health = {'status': 'ok', 'batches': self.batcher.batches, 'requests': self.batcher.requests}
+            if self.cache is not None:
+                health['cache'] = self.cache.stats()
+            return HTTPStatus.OK, health
+        if method == 'GET' and path == '/metrics':
+            if not metrics.is_enabled():
+                return HTTPStatus.NOT_FOUND, {'error': "Сбор метрик выключен"}
+            return HTTPStatus.OK, metrics.to_prometheus()
+        kind = ROUTES.get(path)
+        if kind is None:
+            return HTTPStatus.NOT_FOUND, {'error': f"Неизвестный путь: {path}"}
+        if method != 'POST':
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Ожидается POST"}
+        try:
+            data = json.loads(body or b'{}')
+            if not isinstance(data, dict):
+                raise TypeError("Тело запроса должно быть JSON-объектом")
+            response, rows = await self.batcher.submit(kind, data)
+        except (KeyError, TypeError, ValueError) as e:
+            return HTTPStatus.BAD_REQUEST, {'error': f"Некорректный запрос: {e!r}"}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"Ошибка расчёта: {e!r}"}
+        if rows is not None and self.save_db:
+            # Ответ может быть общим для одинаковых запросов пачки
+            response = dict(response)
+            details = "\n".join(f"{i + 1}. {item['name']} (размер {item['size']})"
+                                for i, item in enumerate(response['items']))
+            response['calculation_id'] = await save_calculation_async(
+                details, response['total_fabric'], response['total_sewing_cost'],
+                response['total_material_cost'], response['grand_total'], rows)
+        return HTTPStatus.OK, response
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    status, payload = HTTPStatus.BAD_REQUEST, {'error': "Некорректная строка запроса"}
+                else:
+                    body = await reader.readexactly(int(headers.get('content-length', 0)))
+                    status, payload = await self.dispatch(parts[0], parts[1], body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def _response(status: HTTPStatus, payload, keep_alive: bool) -> bytes:
+    """Ответ HTTP: строка отправляется как текст, остальное - как JSON"""
+    if isinstance(payload, str):
+        body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+    else:
+        body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json'
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+def _request(path: str, payload, host: str) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Соединение закрыто сервером")
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return int(status_line.split()[1]), await reader.readexactly(length)
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+# Запрос для нагрузочного теста по умолчанию
+DEFAULT_LOAD_PAYLOAD = {'type': 'jacket', 'name': "Пиджак", 'size': 52, 'fabric_price': 1200,
+                        'accessories_price': 450, 'has_lining': True, 'pockets_count': 4}
+
+
+async def run_load_test(host: str, port: int, requests: int = 1000, concurrency: int = 20,
+                        path: str = '/quote/item', payload=None) -> dict:
+    """Нагрузочный тест сервиса: задержки p50/p99 (мс) и запросы в секунду"""
+    request = _request(path, DEFAULT_LOAD_PAYLOAD if payload is None else payload, host)
+    remaining = iter(range(requests))
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for _ in remaining:
+                start = time.perf_counter()
+                writer.write(request)
+                status, _ = await _read_response(reader)
+                latencies.append(time.perf_counter() - start)
+                if status != HTTPStatus.OK:
+                    errors += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, window: float = BATCH_WINDOW,
+                save_db: bool = False, cache: QuoteCache = None):
+    """Запуск сервиса до прерывания"""
+    service = QuoteService(window, save_db=save_db, cache=cache)
+    host, port = await service.start(host, port)
+    print(f"Сервис расчёта запущен на http://{host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+
+async def load_test(host: str = None, port: int = None, requests: int = 1000, concurrency: int = 20,
+                    window: float = BATCH_WINDOW) -> dict:
+    """Нагрузочный тест; без адреса запускает встроенный сервис на свободном порту"""
+    service = None
+    if host is None or port is None:
+        service = QuoteService(window)
+        host, port = await service.start(DEFAULT_HOST, 0)
+    try:
+        stats = await run_load_test(host, port, requests, concurrency)
+        if service is not None:
+            stats['batches'] = service.batcher.batches
+    finally:
+        if service is not None:
+            await service.stop()
+    return stats
+
+
+metrics.instrument(sys.modules[__name__], 'quote_batch', prefix='quote_service')
@@ -0,0 +1,97 @@
+import csv
+import json
+from copy import deepcopy
+from datetime import datetime
+
+from clothing_package import ClothingCalculator
+from clothing_package.item_store import ItemView, item_class
+from clothing_package.records import item_type
+
+REPORT_FIELDS = ('position', 'type', 'name', 'size', 'fabric', 'sewing_cost', 'material_cost')
+
+
+def iter_item_figures(calculator: ClothingCalculator):
+    """Показатели изделий корзины, каждое изделие рассчитывается один раз:
+    (номер, изделие, расход ткани, пошив, материалы)
+    """
+    for position, item in enumerate(calculator.iter_items(), 1):
+        # Представление компактной корзины создаёт объект при каждом расчёте
+        if isinstance(item, ItemView):
+            item = item.materialize()
+        yield (position, item, item.calculate_fabric_consumption(), item.calculate_sewing_cost(),
+               item.calculate_total_cost())
+
+
+def report_totals(calculator: ClothingCalculator) -> dict:
+    """Итоги корзины, каждый показатель запрашивается один раз"""
+    total_sewing = calculator.calculate_total_sewing_cost()
+    total_materials = calculator.calculate_total_material_cost()
+    return {'total_fabric': calculator.calculate_total_fabric(), 'total_sewing_cost': total_sewing,
+            'total_material_cost': total_materials, 'grand_total': total_sewing + total_materials}
+
+
+def write_docx_report(calculator: ClothingCalculator, path: str):
+    """Отчёт .docx: изделия одной таблицей и итоги"""
+    from docx import Document
+
+    doc = Document()
+    doc.add_heading('Отчёт о расчёте одежды', 0)
+    doc.add_paragraph(f"Дата: {datetime.now().strftime('%d.%m.%Y %H:%M')}")
+
+    doc.add_heading('Изделия:', level=1)
+    table = doc.add_table(rows=2, cols=6)
+    table.style = 'Table Grid'
+    header = ("№", "Изделие", "Тип", "Расход ткани, м", "Пошив, руб", "Материалы, руб")
+    for cell, text in zip(table.rows[0].cells, header):
+        cell.text = text
+    # Строки изделий копируются с готового XML-шаблона строки: заполнение
+    # ячеек через API python-docx на больших корзинах в разы медленнее
+    for cell in table.rows[1].cells:
+        cell.text = "-"
+    template = table.rows[1]._tr
+    table_element = table._tbl
+    table_element.remove(template)
+    for position, item, fabric, sewing, materials in iter_item_figures(calculator):
+        row = deepcopy(template)
+        values = (str(position), str(item), item_class(item).__name__, f"{fabric}", f"{sewing}", f"{materials}")
+        for text_element, text in zip(row.xpath('./w:tc/w:p/w:r/w:t'), values):
+            text_element.text = text
+        table_element.append(row)
+
+    totals = report_totals(calculator)
+    doc.add_heading('Итоги:', level=1)
+    doc.add_paragraph(f"Общий расход ткани: {totals['total_fabric']:.2f} м")
+    doc.add_paragraph(f"Общая стоимость пошива: {totals['total_sewing_cost']:.2f} руб")
+    doc.add_paragraph(f"Общая стоимость материалов: {totals['total_material_cost']:.2f} руб")
+    doc.add_paragraph(f"ИТОГО: {totals['grand_total']:.2f} руб")
+    doc.save(path)
+
+
+def write_csv_report(calculator: ClothingCalculator, path: str):
+    """Потоковый отчёт CSV: строка на изделие и строка итогов"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_FIELDS)
+        for position, item, fabric, sewing, materials in iter_item_figures(calculator):
+            writer.writerow((position, item_type(item), item.name, item.size, fabric, sewing, materials))
+        totals = report_totals(calculator)
+        writer.writerow(('', 'total', 'ИТОГО', '', totals['total_fabric'], totals['total_sewing_cost'],
+                         totals['total_material_cost']))
+
+
+def write_json_report(calculator: ClothingCalculator, path: str):
+    """Потоковый отчёт JSON: изделия записываются по одному, в памяти не собираются"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"date": %s, "items": [' % json.dumps(datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        for position, item, fabric, sewing, materials in iter_item_figures(calculator):
+            record = dict(zip(REPORT_FIELDS, (position, item_type(item), item.name, item.size, fabric, sewing,
+                                              materials)))
+            f.write((',\n' if position > 1 else '\n') + json.dumps(record, ensure_ascii=False))
+        f.write('\n], "totals": %s}\n' % json.dumps(report_totals(calculator)))
+
+
+REPORT_WRITERS = {
+    'docx': write_docx_report,
+    'csv': write_csv_report,
+    'json': write_json_report,
+}
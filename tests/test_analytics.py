@@ -0,0 +1,116 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import analytics
+import database
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'analytics.db'))
+    database.init_db()
+    yield database
+    database.close_connections()
+
+
+def save(db, date, rows):
+    conn = db.get_connection()
+    with conn:
+        calculation_id = conn.execute(db.INSERT_CALCULATION_SQL,
+                                      (date, "blob", 0, 0, 0, 0, db._timestamp(date))).lastrowid
+        conn.executemany(db.INSERT_CALCULATION_ITEM_SQL,
+                         ((calculation_id, position, *row) for position, row in enumerate(rows, 1)))
+    return calculation_id
+
+
+JACKET = ('jacket', 'J', 56, '{}', 3.0, 6000, 3500.0)
+TROUSERS = ('trousers', 'T', 56, '{}', 2.0, 4000, 1800.0)
+
+
+def test_rollups_follow_inserts(db):
+    analytics.init_analytics()
+    save(db, "2024-03-04 10:00:00", [JACKET, TROUSERS])
+    save(db, "2024-03-04 18:00:00", [JACKET])
+    save(db, "2024-03-20 09:00:00", [JACKET])
+
+    daily = analytics.get_rollup('day')
+    assert daily == [
+        ('2024-03-20', 'jacket', 1, 3.0, 6000, 3500.0),
+        ('2024-03-04', 'jacket', 2, 6.0, 12000, 7000.0),
+        ('2024-03-04', 'trousers', 1, 2.0, 4000, 1800.0),
+    ]
+    assert analytics.get_rollup('month', item_type='jacket') == [('2024-03', 'jacket', 3, 9.0, 18000, 10500.0)]
+    assert [row[0] for row in analytics.get_rollup('week')] == ['2024-W12', '2024-W10', '2024-W10']
+    assert analytics.get_rollup('day', date_from='2024-03-05') == [daily[0]]
+    assert analytics.get_rollup('day', limit=1) == [daily[0]]
+
+
+def test_backfill_and_delete(db):
+    calculation_id = save(db, "2024-05-01 12:00:00", [JACKET, TROUSERS])
+    analytics.init_analytics()
+    assert len(analytics.get_rollup('month')) == 2
+
+    conn = db.get_connection()
+    with conn:
+        conn.execute("DELETE FROM calculation_items WHERE calculation_id = ? AND item_type = 'trousers'",
+                     (calculation_id,))
+    assert analytics.get_rollup('month', item_type='trousers') == [('2024-05', 'trousers', 0, 0.0, 0, 0.0)]
+
+
+def test_deleting_calculation_updates_rollups(db):
+    analytics.init_analytics()
+    kept = save(db, "2024-05-01 09:00:00", [JACKET])
+    deleted = save(db, "2024-05-01 12:00:00", [JACKET, TROUSERS])
+    conn = db.get_connection()
+    with conn:
+        conn.execute("DELETE FROM calculations WHERE id = ?", (deleted,))
+    assert db.get_calculation_items(deleted) == []
+    assert len(db.get_calculation_items(kept)) == 1
+    assert analytics.get_rollup('day') == [('2024-05-01', 'jacket', 1, 3.0, 6000, 3500.0),
+                                           ('2024-05-01', 'trousers', 0, 0.0, 0, 0.0)]
+
+
+def test_bulk_saved_calculations_are_rolled_up(db):
+    analytics.init_analytics()
+    db.save_calculations_many([("bulk", 5.0, 10000, 5300.0, 15300.0, [JACKET, TROUSERS], "2024-06-01 10:00:00"),
+                               ("bulk", 3.0, 6000, 3500.0, 9500.0, [JACKET], "2024-06-01 11:00:00")])
+    assert analytics.get_rollup('day') == [('2024-06-01', 'jacket', 2, 6.0, 12000, 7000.0),
+                                           ('2024-06-01', 'trousers', 1, 2.0, 4000, 1800.0)]
+
+
+def test_legacy_calculations_use_header_totals(db):
+    conn = db.get_connection()
+    # Расчёт в старом формате: изделия перенесены из текста без собственных сумм
+    with conn:
+        calculation_id = conn.execute(db.INSERT_CALCULATION_SQL,
+                                      ("2024-02-01 10:00:00", "", 4.4, 8300, 4200.5, 12500.5,
+                                       db._timestamp("2024-02-01 10:00:00"))).lastrowid
+        conn.executemany(db.INSERT_CALCULATION_ITEM_SQL,
+                         [(calculation_id, 1, None, 'Пиджак', 48, None, None, None, None),
+                          (calculation_id, 2, None, 'Брюки', 50, None, None, None, None)])
+    analytics.init_analytics()
+    expected = [('2024-02', 'unknown', 2, 4.4, 8300, 4200.5)]
+    assert analytics.get_rollup('month') == expected
+
+    # Сводка со старыми триггерами пересобирается при следующей инициализации
+    with conn:
+        conn.execute('DROP TRIGGER rollup_monthly_delete')
+        conn.execute('DELETE FROM rollup_monthly')
+    analytics.init_analytics()
+    assert analytics.get_rollup('month') == expected
+
+    with conn:
+        conn.execute('DELETE FROM calculation_items WHERE position = 1')
+    assert analytics.get_rollup('month') == [('2024-02', 'unknown', 1, 0.0, 0, 0.0)]
+    with conn:
+        conn.execute('DELETE FROM calculations')
+    assert analytics.get_rollup('month') == [('2024-02', 'unknown', 0, 0.0, 0, 0.0)]
+
+
+def test_unknown_period(db):
+    with pytest.raises(ValueError):
+        analytics.get_rollup('year')
@@ -0,0 +1,61 @@
+import asyncio
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import async_database
+import database
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'async.db'))
+    yield
+    async_database.shutdown()
+
+
+def test_concurrent_saves_and_reads(db_path):
+    async def scenario():
+        await async_database.init_db_async()
+        saves = [async_database.save_calculation_async(f"order {i}", 1.0, 2.0, 3.0, 5.0) for i in range(100)]
+        reads = [async_database.get_history_async() for _ in range(20)]
+        results = await asyncio.gather(*saves, *reads)
+        ids = results[:100]
+        assert len(set(ids)) == 100
+        history = await async_database.get_history_async()
+        assert {row[2] for row in history} == {f"order {i}" for i in range(100)}
+
+    asyncio.run(scenario())
+
+
+def test_event_loop_is_not_blocked(db_path):
+    async def scenario():
+        await async_database.init_db_async()
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker_task = asyncio.create_task(ticker())
+        await asyncio.gather(*(async_database.save_calculation_async("x", 1, 2, 3, 5) for _ in range(200)))
+        done.set()
+        await ticker_task
+        return ticks
+
+    assert asyncio.run(scenario()) > 1
+
+
+def test_async_history_pages(db_path):
+    async def scenario():
+        await async_database.init_db_async()
+        await async_database.save_calculations_many_async(("row", 1, 2, 3, 5) for _ in range(7))
+        return [len(page) async for page in async_database.iter_history_pages_async(page_size=3)]
+
+    assert asyncio.run(scenario()) == [3, 3, 1]
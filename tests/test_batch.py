@@ -0,0 +1,82 @@
+import random
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+np = pytest.importorskip("numpy")
+
+from clothing_package import Jacket, Trousers, ThreePieceSuit
+from clothing_package.batch import price_jackets, price_trousers, price_suits
+
+
+def random_jacket_columns(count, seed):
+    rng = random.Random(seed)
+    return {
+        "sizes": [rng.randint(40, 70) for _ in range(count)],
+        "fabric_prices": [round(rng.uniform(100, 3000), 2) for _ in range(count)],
+        "accessories_prices": [round(rng.uniform(0, 1500), 2) for _ in range(count)],
+        "has_lining": [rng.random() < 0.5 for _ in range(count)],
+        "pockets_count": [rng.randint(0, 8) for _ in range(count)],
+    }
+
+
+def random_trousers_columns(count, seed):
+    rng = random.Random(seed)
+    return {
+        "sizes": [rng.randint(40, 70) for _ in range(count)],
+        "fabric_prices": [round(rng.uniform(100, 3000), 2) for _ in range(count)],
+        "accessories_prices": [round(rng.uniform(0, 1500), 2) for _ in range(count)],
+        "has_belt": [rng.random() < 0.5 for _ in range(count)],
+        "is_classic": [rng.random() < 0.5 for _ in range(count)],
+    }
+
+
+def make_jackets(columns):
+    return [Jacket("J", *row) for row in zip(columns["sizes"], columns["fabric_prices"],
+                                             columns["accessories_prices"], columns["has_lining"],
+                                             columns["pockets_count"])]
+
+
+def make_trousers(columns):
+    return [Trousers("T", *row) for row in zip(columns["sizes"], columns["fabric_prices"],
+                                               columns["accessories_prices"], columns["has_belt"],
+                                               columns["is_classic"])]
+
+
+def test_jackets_match_scalar():
+    columns = random_jacket_columns(2000, seed=1)
+    fabric, sewing, total = price_jackets(**columns)
+    for i, jacket in enumerate(make_jackets(columns)):
+        assert fabric[i] == jacket.calculate_fabric_consumption()
+        assert sewing[i] == jacket.calculate_sewing_cost()
+        assert total[i] == jacket.calculate_total_cost()
+
+
+def test_trousers_match_scalar():
+    columns = random_trousers_columns(2000, seed=2)
+    fabric, sewing, total = price_trousers(**columns)
+    for i, trousers in enumerate(make_trousers(columns)):
+        assert fabric[i] == trousers.calculate_fabric_consumption()
+        assert sewing[i] == trousers.calculate_sewing_cost()
+        assert total[i] == trousers.calculate_total_cost()
+
+
+def test_suits_match_scalar():
+    jacket_columns = random_jacket_columns(2000, seed=3)
+    trousers_columns = random_trousers_columns(2000, seed=4)
+    fabric, sewing, total = price_suits(jacket_columns, trousers_columns)
+    pairs = zip(make_jackets(jacket_columns), make_trousers(trousers_columns))
+    for i, (jacket, trousers) in enumerate(pairs):
+        suit = ThreePieceSuit("S", jacket, trousers, None)
+        assert fabric[i] == suit.calculate_fabric_consumption()
+        assert sewing[i] == suit.calculate_sewing_cost()
+        assert total[i] == suit.calculate_total_cost()
+
+
+def test_rounding_ties_follow_builtin_round():
+    from clothing_package.batch import _round2
+    values = np.array([2.675, 1.005, 0.125, 0.375, 4.6, -1.005])
+    assert _round2(values).tolist() == [round(v, 2) for v in values.tolist()]
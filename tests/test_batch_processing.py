@@ -0,0 +1,102 @@
+import csv
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import analytics
+import database
+from batch_processing import run_batch
+from clothing_package import Jacket, Trousers, ClothingCalculator
+from clothing_package.records import item_to_dict
+
+
+def read_results(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_jsonl_orders(tmp_path):
+    jacket = Jacket("Пиджак", 52, 1000, 500, True, 4)
+    trousers = Trousers("Брюки", 54, 800, 300, False, True)
+    orders = [
+        {"order_id": "A1", "items": [item_to_dict(jacket), item_to_dict(trousers)]},
+        {"order_id": "A2", "items": [item_to_dict(jacket + trousers)]},
+    ]
+    orders_path = tmp_path / "orders.jsonl"
+    orders_path.write_text("\n".join(json.dumps(order, ensure_ascii=False) for order in orders), encoding='utf-8')
+    out_path = tmp_path / "results.csv"
+
+    assert run_batch(str(orders_path), str(out_path), chunk_size=1) == 2
+
+    results = read_results(out_path)
+    assert [row['order_id'] for row in results] == ["A1", "A2"]
+    calculator = ClothingCalculator()
+    calculator.add_item(jacket)
+    calculator.add_item(trousers)
+    assert results[0]['items_count'] == "2"
+    assert results[0]['total_fabric'] == f"{calculator.calculate_total_fabric():.2f}"
+    assert results[0]['grand_total'] == (
+        f"{calculator.calculate_total_sewing_cost() + calculator.calculate_total_material_cost():.2f}")
+
+
+def test_csv_orders_grouped_by_order_id(tmp_path, monkeypatch):
+    orders_path = tmp_path / "orders.csv"
+    orders_path.write_text(
+        "order_id,type,name,size,fabric_price,accessories_price,has_lining,pockets_count,has_belt,is_classic\n"
+        "1,jacket,Пиджак,48,1000,500,нет,2,,\n"
+        "1,trousers,Брюки,50,800,300,,,да,false\n"
+        "2,jacket,Пиджак,50,1000,500,0,2,,\n", encoding='utf-8')
+    out_path = tmp_path / "results.csv"
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'batch.db'))
+    try:
+        assert run_batch(str(orders_path), str(out_path), save_db=True) == 2
+        assert len(database.get_history()) == 2
+        analytics.init_analytics()
+        assert [row[1:3] for row in analytics.get_rollup('day')] == [('jacket', 2), ('trousers', 1)]
+        items = database.get_connection().execute(
+            'SELECT TOTAL(sewing_cost), TOTAL(material_cost) FROM calculation_items').fetchone()
+        totals = database.get_connection().execute(
+            'SELECT TOTAL(total_sewing_cost), TOTAL(total_material_cost) FROM calculations').fetchone()
+        assert items == pytest.approx(totals)
+    finally:
+        database.close_connections()
+
+    results = read_results(out_path)
+    assert [(row['order_id'], row['items_count'], row['total_fabric'], row['total_sewing_cost'])
+            for row in results] == [("1", "2", "4.40", "8300.00"), ("2", "1", "3.10", "5700.00")]
+
+
+def test_invalid_item_reports_order(tmp_path):
+    orders_path = tmp_path / "orders.jsonl"
+    orders_path.write_text('{"order_id": "X", "items": [{"type": "hat", "name": "H", "size": 50, '
+                           '"fabric_price": 1}]}\n', encoding='utf-8')
+    with pytest.raises(ValueError, match="Заказ X"):
+        run_batch(str(orders_path), str(tmp_path / "out.csv"))
+
+
+@pytest.mark.parametrize('line, message', [('[1, 2]', "Строка 2"), ('{"order_id": "Y", "items": [5]}', "Заказ Y")])
+def test_non_object_records_raise_value_error(tmp_path, line, message):
+    orders_path = tmp_path / "orders.jsonl"
+    orders_path.write_text('{"order_id": "1", "items": []}\n' + line + '\n', encoding='utf-8')
+    with pytest.raises(ValueError, match=message):
+        run_batch(str(orders_path), str(tmp_path / "out.csv"))
+
+
+def test_parallel_run_matches_single_process(tmp_path):
+    orders_path = tmp_path / "orders.jsonl"
+    with open(orders_path, 'w', encoding='utf-8') as f:
+        for i in range(60):
+            jacket = Jacket(f"Пиджак {i}", 44 + i % 21, 900 + i, 100 + i % 7, i % 2 == 0, i % 5)
+            trousers = Trousers(f"Брюки {i}", 44 + (i * 3) % 21, 700 + i, 50 + i % 3, i % 3 == 0, i % 4 != 0)
+            items = [item_to_dict(jacket), item_to_dict(trousers), item_to_dict(jacket + trousers)]
+            f.write(json.dumps({"order_id": i, "items": items}, ensure_ascii=False) + "\n")
+
+    single = tmp_path / "single.csv"
+    parallel = tmp_path / "parallel.csv"
+    assert run_batch(str(orders_path), str(single), chunk_size=7) == 60
+    assert run_batch(str(orders_path), str(parallel), chunk_size=7, workers=2) == 60
+    assert parallel.read_bytes() == single.read_bytes()
@@ -0,0 +1,25 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.suite import compare, run_suite
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = {'results': {'a[1000]': 0.100, 'b[1000]': 0.100, 'c[1000]': 0.100, 'tiny[1]': 0.0001}}
+    current = {'results': {'a[1000]': 0.120, 'b[1000]': 0.200, 'c[1000]': 0.050, 'tiny[1]': 0.0009}}
+    assert compare(baseline, current, threshold=0.25) == [('b[1000]', 0.100, 0.200, 2.0)]
+    assert [key for key, *_ in compare(baseline, current, threshold=0.1)] == ['a[1000]', 'b[1000]']
+
+
+def test_compare_skips_missing_results():
+    assert compare({'results': {'a[1]': 0.1}}, {'results': {}}) == []
+
+
+def test_run_suite_names_results_by_size():
+    results = run_suite(sizes=(1, 10), repeat=1, names=['calculator_totals', 'suit_composition'],
+                        log=lambda message: None)
+    assert set(results['results']) == {'calculator_totals[1]', 'calculator_totals[10]',
+                                       'suit_composition[1]', 'suit_composition[10]'}
+    assert results['meta']['sizes'] == [1, 10]
@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 import pytest
 import sys
 import os
@@ -135,6 +138,43 @@ class TestThreePieceSuit:
         expected = jacket_total + trousers_total  # 5100
         assert suit.calculate_total_cost() == expected
 
+    def test_component_change_invalidates_only_affected_suits(self):
+        jacket = Jacket("Jacket", 50, 1000, 500, False, 2)
+        trousers = Trousers("Trousers", 50, 800, 300, False, False)
+        other = ThreePieceSuit("Other", Jacket("J2", 52, 1000, 500), Trousers("T2", 52, 800, 300), None)
+        suit = ThreePieceSuit("Test Suit", jacket, trousers, None)
+        for item in (suit, other):
+            item.calculate_fabric_consumption()
+            item.calculate_total_cost()
+            item.calculate_sewing_cost()
+
+        jacket.pockets_count = 6
+
+        assert suit._fabric_consumption is None and suit._total_cost is None
+        assert other._fabric_consumption is not None and other._total_cost is not None
+        assert trousers._fabric_mm is not None
+        assert suit.calculate_fabric_consumption() == round(
+            jacket.calculate_fabric_consumption() + trousers.calculate_fabric_consumption(), 2)
+        assert suit.calculate_sewing_cost() == int((5000 + 400 + 6 * 150 + 3000) * 0.9)
+
+    def test_temporary_suits_do_not_accumulate_subscriptions(self):
+        jacket = Jacket("Jacket", 50, 1000, 500, False, 2)
+        trousers = Trousers("Trousers", 50, 800, 300, False, False)
+        calc = ClothingCalculator()
+        calc.add_item(jacket)
+        kept = [jacket + trousers for _ in range(10)]
+        for _ in range(1000):
+            (jacket + trousers).calculate_total_cost()
+        assert len(jacket._live_dependents()) == 11
+        assert len(jacket._dependents) <= 2 * 11
+        assert len(trousers._dependents) <= 2 * 10
+
+        jacket.pockets_count = 3
+        assert all(suit.calculate_sewing_cost() == kept[0].calculate_sewing_cost() for suit in kept)
+        assert calc.calculate_total_sewing_cost() == jacket.calculate_sewing_cost()
+        calc.remove_by_id(1)
+        assert len(jacket._live_dependents()) == 10
+
     def test_add_operator(self):
         jacket = Jacket("Jacket", 50, 1000, 500, False, 2)
         trousers = Trousers("Trousers", 50, 800, 300, False, False)
@@ -158,6 +198,61 @@ class TestThreePieceSuit:
         assert suit[1] == trousers
 
 
+class TestCopyAndPickle:
+    """Копирование и сериализация изделий, на которые подписаны корзины и костюмы"""
+
+    def test_pickle_item_with_dependents(self):
+        jacket = Jacket("Jacket", 52, 1000, 500, True, 4)
+        trousers = Trousers("Trousers", 54, 800, 300, False, True)
+        suit = ThreePieceSuit("Suit", jacket, trousers, None)
+        calc = ClothingCalculator()
+        calc.add_item(suit)
+
+        restored = pickle.loads(pickle.dumps(suit))
+        assert restored.calculate_total_cost() == suit.calculate_total_cost()
+        restored.jacket.pockets_count = 0
+        assert restored.calculate_sewing_cost() < suit.calculate_sewing_cost()
+        assert calc.calculate_total_sewing_cost() == suit.calculate_sewing_cost()
+
+    def test_copy_does_not_update_original_calculator(self):
+        jacket = Jacket("Jacket", 52, 1000, 500, True, 4)
+        calc = ClothingCalculator()
+        calc.add_item(jacket)
+
+        duplicate = copy.copy(jacket)
+        duplicate.pockets_count = 0
+        assert calc.calculate_total_sewing_cost() == jacket.calculate_sewing_cost() == 6400
+        assert duplicate.calculate_sewing_cost() == 5800
+
+    def test_copied_suit_follows_its_parts(self):
+        jacket = Jacket("Jacket", 52, 1000, 500, True, 4)
+        suit = ThreePieceSuit("Suit", jacket, Trousers("Trousers", 54, 800, 300), None)
+        duplicate = copy.copy(suit)
+        duplicate.calculate_sewing_cost()
+        jacket.pockets_count = 0
+        assert duplicate.calculate_sewing_cost() == suit.calculate_sewing_cost()
+
+    @pytest.mark.parametrize('clone', [copy.deepcopy, lambda calc: pickle.loads(pickle.dumps(calc))])
+    def test_cloned_calculator_follows_its_items(self, clone):
+        calc = ClothingCalculator()
+        jacket = Jacket("Jacket", 52, 1000, 500, True, 4)
+        trousers = Trousers("Trousers", 54, 800, 300, False, True)
+        for item in (jacket, trousers, ThreePieceSuit("Suit", jacket, trousers, None)):
+            calc.add_item(item)
+
+        cloned = clone(calc)
+        cloned.get_item(1).has_lining = False
+        items = cloned.get_items()
+        assert cloned.total_fabric_mm() == sum(item.fabric_mm() for item in items)
+        assert cloned.total_material_kopecks() == sum(item.material_kopecks() for item in items)
+        assert calc.total_fabric_mm() == sum(item.fabric_mm() for item in calc.get_items())
+        assert cloned.total_fabric_mm() < calc.total_fabric_mm()
+
+        cloned.remove_by_id(3)
+        cloned.remove_by_id(1)
+        assert cloned.total_fabric_mm() == cloned.get_item(2).fabric_mm()
+
+
 class TestClothingCalculator:
     """Тесты для класса ClothingCalculator"""
 
@@ -231,6 +326,23 @@ class TestClothingCalculator:
         result = calc(1200)
         assert result == 4220
 
+    def test_call_with_price_sequence(self):
+        calc = ClothingCalculator()
+        jacket = Jacket("Test", 50, 1000, 500, False, 2)
+        trousers = Trousers("Test2", 50, 800, 300, False, False)
+        calc.add_item(jacket)
+        calc.add_item(trousers)
+        calc.add_item(jacket + trousers)
+
+        prices = [800 + 50 * i for i in range(25)]
+        curve = calc(prices)
+        assert len(curve) == len(prices)
+        for price, cost in zip(prices, curve):
+            expected = sum(item.calculate_fabric_consumption() * price + item.accessories_price
+                           for item in calc.get_items())
+            assert cost == pytest.approx(expected)
+            assert calc(price) == pytest.approx(expected)
+
     def test_empty_calculator(self):
         """Тест пустого калькулятора"""
         calc = ClothingCalculator()
@@ -240,6 +352,113 @@ class TestClothingCalculator:
         assert calc.calculate_total_material_cost() == 0
         assert calc(1000) == 0
 
+    def test_totals_follow_item_changes(self):
+        calc = ClothingCalculator()
+        jacket = Jacket("Test", 52, 1000, 500, True, 4)
+        trousers = Trousers("Test2", 54, 800, 300, False, True)
+        suit = ThreePieceSuit("Suit", jacket, trousers, None)
+        for item in (jacket, trousers, suit, jacket):
+            calc.add_item(item)
+
+        jacket.has_lining = False
+        jacket.pockets_count = 2
+        trousers.has_belt = True
+        calc.remove_item(3)
+
+        items = calc.get_items()
+        assert calc.calculate_total_fabric() == pytest.approx(
+            sum(item.calculate_fabric_consumption() for item in items))
+        assert calc.calculate_total_sewing_cost() == sum(item.calculate_sewing_cost() for item in items)
+        assert calc.calculate_total_material_cost() == pytest.approx(
+            sum(item.calculate_total_cost() for item in items))
+
+    def test_removed_item_no_longer_updates_totals(self):
+        calc = ClothingCalculator()
+        jacket = Jacket("Test", 50, 1000, 500, False, 2)
+        calc.add_item(jacket)
+        calc.remove_item(0)
+        jacket.pockets_count = 5
+        assert calc.calculate_total_fabric() == 0
+        assert calc.calculate_total_sewing_cost() == 0
+
+    def test_items_have_no_dict(self):
+        jacket = Jacket("Test", 50, 1000, 500, False, 2)
+        trousers = Trousers("Test2", 50, 800, 300, False, False)
+        suit = ThreePieceSuit("Suit", jacket, trousers, None)
+        for item in (jacket, trousers, suit):
+            assert not hasattr(item, '__dict__')
+
+    def test_compact_calculator_matches_regular(self):
+        regular = ClothingCalculator()
+        compact = ClothingCalculator(compact=True)
+        jacket = Jacket("Test", 52, 1000, 500, True, 4)
+        trousers = Trousers("Test2", 54, 800, 300, False, True)
+        for calc in (regular, compact):
+            calc.add_item(jacket)
+            calc.add_item(trousers)
+            calc.add_item(jacket + trousers)
+            calc.remove_item(1)
+
+        assert compact.compact and not regular.compact
+        assert len(compact) == len(regular) == 2
+        assert [str(item) for item in compact.get_items()] == [str(item) for item in regular.get_items()]
+        assert compact.calculate_total_fabric() == regular.calculate_total_fabric()
+        assert compact.calculate_total_sewing_cost() == regular.calculate_total_sewing_cost()
+        assert compact.calculate_total_material_cost() == regular.calculate_total_material_cost()
+        assert compact(1200) == regular(1200)
+        assert isinstance(compact.get_items()[1].materialize(), ThreePieceSuit)
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_stable_ids_and_removal_by_id(self, compact):
+        calc = ClothingCalculator(compact=compact)
+        jacket = Jacket("Test", 52, 1000, 500, True, 4)
+        trousers = Trousers("Test2", 54, 800, 300, False, True)
+        ids = [calc.add_item(item) for item in (jacket, trousers, jacket + trousers, jacket)]
+        assert len(set(ids)) == 4 and ids[0] == 1
+
+        calc.remove_by_id(ids[1])
+        assert len(calc) == 3
+        assert str(calc.get_item(ids[3])) == str(jacket)
+        assert [item_id for item_id, _ in calc.iter_entries()] == [ids[0], ids[2], ids[3]]
+        with pytest.raises(KeyError):
+            calc.get_item(ids[1])
+        with pytest.raises(KeyError):
+            calc.remove_by_id(ids[1])
+        assert calc.calculate_total_sewing_cost() == 2 * jacket.calculate_sewing_cost() + \
+            (jacket + trousers).calculate_sewing_cost()
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_filtered_iteration(self, compact):
+        calc = ClothingCalculator(compact=compact)
+        items = [Jacket("Классика", 50, 1000, 500), Trousers("Классика", 50, 800, 300),
+                 Jacket("Спорт", 52, 1000, 500), Jacket("Классика", 52, 1000, 500)]
+        ids = [calc.add_item(item) for item in items]
+        calc.remove_by_id(ids[3])
+
+        def found(**filters):
+            return [item_id for item_id, _ in calc.iter_entries(**filters)]
+
+        assert found(item_type=Jacket) == [ids[0], ids[2]]
+        assert found(size=50) == [ids[0], ids[1]]
+        assert found(item_type=Jacket, name="Классика") == [ids[0]]
+        assert found(item_type=ThreePieceSuit) == []
+        assert found(size=60) == []
+        assert [item.name for item in calc.iter_items(size=52)] == ["Спорт"]
+
+        # Индексы, построенные первым запросом, следуют за добавлением и удалением
+        new_id = calc.add_item(Jacket("Классика", 50, 900, 100))
+        calc.remove_by_id(ids[0])
+        assert found(item_type=Jacket, size=50) == [new_id]
+        assert found(name="Классика") == [ids[1], new_id]
+
+    def test_indexes_are_built_on_first_filtered_query(self):
+        calc = ClothingCalculator()
+        for size in (48, 50, 50):
+            calc.add_item(Jacket("Пиджак", size, 1000, 500))
+        assert calc._by_type is None
+        assert len(list(calc.iter_items(size=50))) == 2
+        assert calc._by_size is not None
+
 @pytest.fixture
 def sample_jacket():
     """Фикстура для создания тестового пиджака"""
@@ -0,0 +1,71 @@
+import sys
+import os
+import random
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers, ClothingCalculator
+from clothing_package.cutting_plan import pack_pieces, plan_cutting, plan_totals
+
+
+@pytest.mark.parametrize('method', ['ffd', 'bfd'])
+def test_pack_pieces_fills_rolls_in_decreasing_order(method):
+    pieces = [('a', 30), ('b', 70), ('c', 50), ('d', 50), ('e', 20)]
+    rolls = pack_pieces(pieces, 100, method)
+    assert sorted(map(sorted, rolls)) == [['a', 'b'], ['c', 'd'], ['e']]
+
+
+def test_best_fit_picks_tightest_roll():
+    pieces = [('a', 60), ('b', 50), ('c', 40)]
+    assert pack_pieces(pieces, 100, 'ffd') == [['a', 'c'], ['b']]
+    assert pack_pieces(pieces, 100, 'bfd') == [['a', 'c'], ['b']]
+    pieces = [('a', 65), ('b', 43), ('c', 39), ('d', 10), ('e', 8)]
+    assert pack_pieces(pieces, 100, 'ffd') == [['a', 'd', 'e'], ['b', 'c']]
+    assert pack_pieces(pieces, 100, 'bfd') == [['a'], ['b', 'c', 'd', 'e']]
+
+
+def test_piece_longer_than_roll_is_rejected():
+    with pytest.raises(ValueError):
+        pack_pieces([('a', 120)], 100)
+    with pytest.raises(ValueError):
+        pack_pieces([('a', 10)], 100, 'exact')
+
+
+def test_plan_per_fabric_price_and_carts():
+    first = ClothingCalculator()
+    first.add_item(Jacket("Пиджак", 52, 1000, 500, True, 4))
+    first.add_item(Trousers("Брюки", 54, 800, 300))
+    second = ClothingCalculator()
+    second.add_item(Jacket("Пиджак", 48, 1000, 500, False, 0))
+
+    plan = plan_cutting([first, second], {1000: 10}, default_roll_length=3)
+    jacket_fabric = first.get_items()[0].calculate_fabric_consumption()
+    assert plan[1000]['rolls'] == [[(0, 1), (1, 1)]]
+    assert plan[1000]['used'] == pytest.approx(jacket_fabric + 2.5)
+    assert plan[1000]['waste'] == pytest.approx(10 - jacket_fabric - 2.5)
+    assert plan[800]['roll_length'] == 3 and plan[800]['rolls'] == [[(0, 2)]]
+    assert plan_totals(plan)['rolls'] == 2
+
+    with pytest.raises(ValueError):
+        plan_cutting(first, {1000: 10})
+
+
+def test_hundred_thousand_pieces_in_seconds():
+    rng = random.Random(0)
+    calculator = ClothingCalculator(compact=True)
+    for i in range(100_000):
+        calculator.add_item(Jacket("Пиджак", rng.randint(44, 64), rng.choice((800, 1000)), 100,
+                                   rng.random() < 0.5, rng.randint(0, 5)))
+    start = time.perf_counter()
+    plan = plan_cutting(calculator, 50)
+    assert time.perf_counter() - start < 10
+    totals = plan_totals(plan)
+    assert sum(len(roll) for fabric in plan.values() for roll in fabric['rolls']) == 100_000
+    assert totals['lower_bound'] <= totals['rolls'] <= totals['lower_bound'] * 1.05
+    for fabric in plan.values():
+        for roll in fabric['rolls'][:50]:
+            assert sum(round(calculator.get_item(item_id).calculate_fabric_consumption() * 100)
+                       for item_id in roll) <= 5000
@@ -0,0 +1,179 @@
+import sys
+import os
+import sqlite3
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+from clothing_package import Jacket, Trousers
+from clothing_package.records import item_row
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Временная БД для каждого теста"""
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'test.db'))
+    database.init_db()
+    yield database
+    database.close_connections()
+
+
+def test_save_and_get_history(db):
+    db.save_calculation("1. Test (размер 50)", 3.1, 5300, 3600, 8900)
+    history = db.get_history()
+    assert len(history) == 1
+    assert history[0][2:] == ("1. Test (размер 50)", 3.1, 5300, 3600, 8900)
+
+
+def test_connection_is_reused_with_wal(db):
+    conn = db.get_connection()
+    db.save_calculation("x", 1, 2, 3, 5)
+    db.get_history()
+    assert db.get_connection() is conn
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_each_thread_has_own_connection(db):
+    main_conn = db.get_connection()
+    seen = []
+
+    def worker():
+        seen.append(db.get_connection())
+        db.save_calculation("thread", 1, 2, 3, 5)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(conn) for conn in seen}) == 4
+    assert main_conn not in seen
+    assert len(db.get_history()) == 4
+
+
+def test_save_calculations_many_in_chunks(db):
+    rows = (("bulk %d" % i, 1.0, 2.0, 3.0, 5.0) for i in range(25))
+    assert db.save_calculations_many(rows, chunk_size=10) == 25
+    history = db.get_history()
+    assert len(history) == 25
+    assert {record[2] for record in history} == {"bulk %d" % i for i in range(25)}
+
+
+def test_save_calculations_many_keeps_given_date(db):
+    db.save_calculations_many([("old", 1.0, 2.0, 3.0, 5.0, "2020-01-02 03:04:05")])
+    assert db.get_history()[0][1] == "2020-01-02 03:04:05"
+
+
+def test_save_calculations_many_with_items(db):
+    jacket = Jacket("Пиджак", 56, 1000, 500, True, 4)
+    rows = [("with items", 1.0, 2.0, 3.0, 5.0, [item_row(jacket)] * 2, "2020-01-02 03:04:05"),
+            ("without items", 1.0, 2.0, 3.0, 5.0)]
+    assert db.save_calculations_many(rows) == 2
+    history = db.get_history()
+    assert [record[1:3] for record in history][-1] == ("2020-01-02 03:04:05", "with items")
+    assert [row[:2] for row in db.get_calculation_items(history[-1][0])] == [(1, 'jacket'), (2, 'jacket')]
+    assert db.get_calculation_items(history[0][0]) == []
+
+
+def test_save_calculations_many_rejects_bad_chunk(db):
+    with pytest.raises(ValueError):
+        db.save_calculations_many([], chunk_size=0)
+
+
+def test_history_pages_are_keyset_ordered(db):
+    db.save_calculations_many(("row %d" % i, 1.0, 2.0, 3.0, 5.0, "2024-01-%02d 12:00:00" % (i % 5 + 1))
+                              for i in range(23))
+    pages = list(db.iter_history_pages(page_size=10))
+    assert [len(page) for page in pages] == [10, 10, 3]
+    rows = [row for page in pages for row in page]
+    assert rows == db.get_history()
+    assert [(row[1], row[0]) for row in rows] == sorted(((row[1], row[0]) for row in rows), reverse=True)
+
+
+def test_history_date_range(db):
+    db.save_calculations_many(("day %d" % day, 1.0, 2.0, 3.0, 5.0, "2024-03-%02d 10:00:00" % day)
+                              for day in range(1, 11))
+    rows = list(db.iter_history(page_size=3, date_from="2024-03-04", date_to="2024-03-06 23:59:59"))
+    assert [row[2] for row in rows] == ["day 6", "day 5", "day 4"]
+
+
+def test_history_date_to_without_time_includes_whole_day(db):
+    db.save_calculations_many(("at %s" % time, 1.0, 2.0, 3.0, 5.0, "2024-01-%s" % time)
+                              for time in ("30 12:00:00", "31 00:00:00", "31 23:59:59", "01 00:00:00"))
+    rows = list(db.iter_history(date_from="2024-01-31", date_to="2024-01-31"))
+    assert [row[2] for row in rows] == ["at 31 23:59:59", "at 31 00:00:00"]
+
+
+def test_history_pages_with_same_date_and_range(db):
+    db.save_calculations_many(("same %d" % i, 1.0, 2.0, 3.0, 5.0, "2024-03-05 10:00:00") for i in range(7))
+    db.save_calculations_many(("older %d" % i, 1.0, 2.0, 3.0, 5.0, "2024-03-01 10:00:00") for i in range(4))
+    pages = list(db.iter_history_pages(page_size=3, date_from="2024-03-01"))
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+    assert [row[2] for page in pages for row in page] == (["same %d" % i for i in reversed(range(7))]
+                                                          + ["older %d" % i for i in reversed(range(4))])
+
+
+def test_migration_fills_created_at(tmp_path, monkeypatch):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute('''CREATE TABLE calculations (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL,
+                    items TEXT NOT NULL, total_fabric REAL NOT NULL, total_sewing_cost REAL NOT NULL,
+                    total_material_cost REAL NOT NULL, grand_total REAL NOT NULL)''')
+    conn.execute("INSERT INTO calculations (date, items, total_fabric, total_sewing_cost, total_material_cost, "
+                 "grand_total) VALUES ('2023-05-06 07:08:09', 'old', 1, 2, 3, 5)")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(database, 'DB_NAME', path)
+    database.init_db()
+    try:
+        row = database.get_connection().execute('SELECT created_at FROM calculations').fetchone()
+        assert row[0] == database._timestamp("2023-05-06 07:08:09")
+        assert [r[2] for r in database.iter_history(date_from="2023-05-06")] == ["old"]
+    finally:
+        database.close_connections()
+
+
+def test_save_calculation_with_items(db):
+    jacket = Jacket("Пиджак", 56, 1000, 500, True, 4)
+    suit = jacket + Trousers("Брюки", 56, 800, 300, False, True)
+    calculation_id = db.save_calculation("blob", 1.0, 2.0, 3.0, 5.0, [item_row(jacket), item_row(suit)])
+
+    items = db.get_calculation_items(calculation_id)
+    assert [(row[0], row[1], row[2], row[3]) for row in items] == [
+        (1, 'jacket', 'Пиджак', 56), (2, 'suit', 'Костюм (пиджак+брюки)', 56)]
+    assert items[0][5:] == (jacket.calculate_fabric_consumption(), jacket.calculate_sewing_cost(),
+                            jacket.calculate_total_cost())
+    total = db.get_connection().execute(
+        "SELECT SUM(fabric) FROM calculation_items WHERE item_type = 'jacket' AND size = 56").fetchone()[0]
+    assert total == jacket.calculate_fabric_consumption()
+
+
+def test_failed_item_insert_rolls_back_header(db):
+    with pytest.raises(Exception):
+        db.save_calculation("blob", 1.0, 2.0, 3.0, 5.0, [("jacket", None, 50, "{}", 1, 2, 3)])
+    assert db.get_history() == []
+
+
+def test_migration_parses_item_blobs(tmp_path, monkeypatch):
+    path = str(tmp_path / 'blob.db')
+    monkeypatch.setattr(database, 'DB_NAME', path)
+    database.init_db()
+    conn = database.get_connection()
+    # Имитируем базу до нормализации: удаляем таблицу изделий и откатываем версию схемы
+    conn.execute('DROP TABLE calculation_items')
+    conn.execute('PRAGMA user_version = 1')
+    with conn:
+        conn.execute(database.INSERT_CALCULATION_SQL,
+                     ("2024-01-01 00:00:00", "1. Пиджак (размер 52)\n2. Костюм-тройка 'Офис', размер 54",
+                      1, 2, 3, 5, 0))
+    try:
+        database.init_db()
+        assert [row[:4] for row in database.get_calculation_items(1)] == [
+            (1, None, 'Пиджак', 52), (2, 'suit', 'Офис', 54)]
+    finally:
+        database.close_connections()
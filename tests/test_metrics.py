@@ -0,0 +1,96 @@
+import asyncio
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import quote_service
+from clothing_package import Jacket, Trousers, ClothingCalculator, metrics
+
+
+@pytest.fixture
+def enabled():
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_metrics_do_not_wrap_functions():
+    original = Jacket.__dict__['calculate_fabric_consumption']
+    metrics.enable()
+    assert Jacket.__dict__['calculate_fabric_consumption'] is not original
+    metrics.disable()
+    assert Jacket.__dict__['calculate_fabric_consumption'] is original
+
+
+def test_counts_and_histogram(enabled):
+    calculator = ClothingCalculator()
+    jacket = Jacket("Пиджак", 52, 1000, 500, True, 4)
+    calculator.add_item(jacket)
+    calculator.add_item(Trousers("Брюки", 54, 800, 300, False, True))
+    jacket.calculate_fabric_consumption()
+    calculator.calculate_total_fabric()
+
+    data = metrics.snapshot()
+    assert data['Jacket.calculate_fabric_consumption']['count'] >= 1
+    assert data['Jacket.fabric_mm']['count'] >= 1
+    assert data['ClothingCalculator.add_item']['count'] == 2
+    assert data['ClothingCalculator.calculate_total_fabric']['count'] == 1
+    assert data['ClothingCalculator.add_item']['buckets']['+Inf'] == 2
+
+
+def test_errors_are_counted(enabled):
+    class Failing:
+        def run(self):
+            raise ValueError("ошибка")
+
+    metrics.instrument(Failing, 'run')
+    with pytest.raises(ValueError):
+        Failing().run()
+    assert metrics.snapshot()['Failing.run']['errors'] == 1
+
+
+def test_database_functions_are_counted(enabled, tmp_path, monkeypatch):
+    import database
+
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'metrics.db'))
+    try:
+        database.init_db()
+        database.save_calculation("1. Пиджак", 1.0, 2.0, 3.0, 5.0)
+        database.get_history()
+    finally:
+        database.close_connections()
+    data = metrics.snapshot()
+    assert [data[f'database.{name}']['count'] for name in ('init_db', 'save_calculation', 'get_history')] == [1, 1, 1]
+
+
+def test_prometheus_and_json_dump(enabled, tmp_path):
+    Jacket("Пиджак", 52, 1000, 500, True, 4).calculate_sewing_cost()
+    text = metrics.to_prometheus()
+    assert 'clothing_calls_total{function="Jacket.calculate_sewing_cost"} 1' in text
+    assert 'clothing_call_duration_seconds_bucket{function="Jacket.calculate_sewing_cost",le="+Inf"} 1' in text
+
+    metrics.dump(str(tmp_path / 'metrics.json'))
+    with open(tmp_path / 'metrics.json', encoding='utf-8') as f:
+        assert json.load(f)['Jacket.calculate_sewing_cost']['count'] == 1
+    metrics.dump(str(tmp_path / 'metrics.prom'))
+    assert (tmp_path / 'metrics.prom').read_text(encoding='utf-8') == metrics.to_prometheus()
+
+
+def test_service_metrics_route(enabled):
+    service = quote_service.QuoteService()
+    payload = {'type': 'jacket', 'name': "Пиджак", 'size': 52, 'fabric_price': 1000, 'accessories_price': 500}
+
+    async def scenario():
+        await service.dispatch('POST', '/quote/item', json.dumps(payload).encode())
+        return await service.dispatch('GET', '/metrics', b'')
+
+    status, text = asyncio.run(scenario())
+    assert status == 200
+    assert 'clothing_calls_total{function="quote_service.quote_batch"} 1' in text
+    assert quote_service._response(status, text, True).startswith(b'HTTP/1.1 200 OK\r\nContent-Type: text/plain')
@@ -0,0 +1,106 @@
+import sys
+import os
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers, ThreePieceSuit, ClothingCalculator
+from clothing_package import money
+
+
+@pytest.mark.parametrize('value, kopecks', [
+    (1000, 100000), (1234.56, 123456), (0.1, 10), (1.005, 101), (2.675, 268), (-1.005, -101), (0.004, 0),
+])
+def test_to_kopecks_rounds_decimal_value_half_up(value, kopecks):
+    assert money.to_kopecks(value) == kopecks
+
+
+def test_lengths_and_division():
+    assert money.to_mm(3.45) == 3450
+    assert money.to_mm(1.4000000000000001) == 1400
+    assert money.from_mm(4600) == 4.6
+    assert [money.div_round(n, 1000) for n in (1499, 1500, -1500, -1499)] == [1, 2, -2, -1]
+    # 3.45 м по 741.78 руб: 2559.141 руб
+    assert money.material_kopecks(3450, 741.78, 0) == 255914
+    # Цена с долями копейки не округляется до умножения: 2.88 м по 1000.005 руб = 2880.0144 руб
+    assert money.material_kopecks(2880, 1000.005, 0) == 288001
+    # Полкопейки ткани и полкопейки фурнитуры - одна копейка, а не две
+    assert money.material_kopecks(1000, 0.005, 0.005) == 1
+
+
+def test_array_helpers_match_scalar():
+    rng = np.random.default_rng(5)
+    prices = np.round(rng.uniform(1, 5000, 1000), 3)
+    fabric = np.round(rng.uniform(1, 6, 1000), 2)
+    kopecks = money.to_kopecks_array(prices)
+    assert kopecks.dtype == np.int64
+    assert kopecks.tolist() == [money.to_kopecks(price) for price in prices.tolist()]
+    assert money.to_mm_array(fabric).tolist() == [money.to_mm(value) for value in fabric.tolist()]
+    fabric_mm = money.to_mm_array(fabric)
+    materials = money.material_kopecks_array((fabric_mm, prices, prices))
+    assert materials.tolist() == [money.material_kopecks(mm, price, price)
+                                  for mm, price in zip(fabric_mm.tolist(), prices.tolist())]
+    both = money.material_kopecks_array((fabric_mm, prices, prices), (fabric_mm, prices[::-1], 0.5))
+    assert both.tolist() == [money.round_material(money.material_cost(mm, first, first)
+                                                  + money.material_cost(mm, second, 0.5))
+                             for mm, first, second in zip(fabric_mm.tolist(), prices.tolist(),
+                                                          prices[::-1].tolist())]
+    assert money.total(materials) == sum(materials.tolist())
+
+
+def test_item_integer_figures():
+    jacket = Jacket("Пиджак", 52, 741.78, 500.05, True, 4)
+    trousers = Trousers("Брюки", 54, 741.78, 300, False, True)
+    suit = ThreePieceSuit("Костюм", jacket, trousers, None)
+    assert jacket.fabric_mm() == money.to_mm(jacket.calculate_fabric_consumption())
+    assert jacket.sewing_kopecks() == 640000
+    assert suit.fabric_mm() == jacket.fabric_mm() + trousers.fabric_mm()
+    # Стоимость частей складывается точно и округляется один раз
+    exact = (Decimal(jacket.fabric_mm()) * Decimal('741.78') + Decimal(trousers.fabric_mm()) * Decimal('741.78')) / 1000
+    assert suit.material_kopecks() == int(((exact + Decimal('800.05')) * 100).quantize(1, 'ROUND_HALF_UP'))
+    assert suit.calculate_total_cost() == suit.material_kopecks() / 100
+    assert suit.calculate_sewing_cost() == (6400 + 4100) * 9 // 10
+
+
+def test_calculator_totals_are_exact():
+    calc = ClothingCalculator()
+    jackets = [Jacket("Пиджак", 50, 1000.1, 0.1, False, 2) for _ in range(1000)]
+    ids = [calc.add_item(jacket) for jacket in jackets]
+    expected = 1000 * (Decimal('3.1') * Decimal('1000.1') + Decimal('0.1'))
+    assert calc.total_material_kopecks() == int(expected * 100)
+    assert calc.calculate_total_material_cost() == float(expected)
+    assert calc.total_fabric_mm() == 3_100_000
+    calc.remove_by_ids(ids)
+    assert (calc.total_fabric_mm(), calc.total_sewing_kopecks(), calc.total_material_kopecks()) == (0, 0, 0)
+
+
+def test_item_costs_are_rounded_once_to_kopecks():
+    trousers = Trousers("Брюки", 56, 1000.005, 0, False, True)
+    assert trousers.calculate_fabric_consumption() == 2.88
+    assert trousers.calculate_total_cost() == 2880.01
+    jacket = Jacket("Пиджак", 50, 1000.005, 0.005, False, 0)
+    # 2.9 м: 2900.0145 + 0.005 = 2900.0195 руб
+    assert jacket.calculate_total_cost() == 2900.02
+    # Костюм округляется один раз: 0.0145 + 0.009 + 0.004 = 0.0275 руб, по частям было бы 0.01 + 0.01
+    suit = ThreePieceSuit("Костюм", Jacket("Пиджак", 50, 0.005, 0, False, 0), Trousers("Брюки", 52, 0.005, 0.004))
+    assert suit.calculate_total_cost() == 0.03
+    assert suit.jacket.calculate_total_cost() + suit.trousers.calculate_total_cost() == 0.02
+
+
+def test_item_figures_add_up_to_calculator_totals():
+    rng = np.random.default_rng(7)
+    calc = ClothingCalculator()
+    for size, price, accessories in zip(rng.integers(44, 62, 300).tolist(),
+                                        np.round(rng.uniform(100, 3000, 300), 3).tolist(),
+                                        np.round(rng.uniform(0, 500, 300), 3).tolist()):
+        jacket = Jacket("Пиджак", size, price, accessories, size % 2 == 0, size % 5)
+        trousers = Trousers("Брюки", size, price * 0.9, accessories, size % 3 == 0, True)
+        calc.add_item(jacket if size % 3 else jacket + trousers)
+    items = list(calc.iter_items())
+    # Стоимость изделия в рублях - ровно его копейки, и итог корзины - их сумма
+    assert all(item.calculate_total_cost() == item.material_kopecks() / 100 for item in items)
+    assert calc.total_material_kopecks() == sum(money.to_kopecks(item.calculate_total_cost()) for item in items)
+    assert calc.total_fabric_mm() == sum(money.to_mm(item.calculate_fabric_consumption()) for item in items)
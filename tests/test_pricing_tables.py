@@ -0,0 +1,52 @@
+import sys
+import os
+from itertools import product
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers, ThreePieceSuit
+from clothing_package import pricing_tables as tables
+from clothing_package.money import to_mm
+
+SIZES = range(tables.MIN_SIZE, tables.MAX_SIZE + 1)
+FLAGS = (False, True)
+
+
+def test_tables_match_formulas_for_every_key():
+    for size, lining, pockets in product(SIZES, FLAGS, range(tables.MAX_POCKETS + 1)):
+        assert tables.jacket_fabric(size, lining, pockets) == tables.jacket_fabric_formula(size, lining, pockets)
+        assert tables.jacket_sewing(size, pockets) == tables.jacket_sewing_formula(size, pockets)
+    for size, belt, classic in product(SIZES, FLAGS, FLAGS):
+        assert tables.trousers_fabric(size, belt, classic) == tables.trousers_fabric_formula(size, belt, classic)
+        assert tables.trousers_sewing(size, classic) == tables.trousers_sewing_formula(size, classic)
+    for size in SIZES:
+        assert tables.vest_fabric(size) == tables.vest_fabric_formula(size)
+
+
+def test_millimetre_tables_match_metres():
+    for size, flag, pockets in product(range(30, 80), FLAGS, range(tables.MAX_POCKETS + 3)):
+        assert tables.jacket_fabric_mm(size, flag, pockets) == to_mm(tables.jacket_fabric(size, flag, pockets))
+        assert tables.trousers_fabric_mm(size, flag, not flag) == to_mm(tables.trousers_fabric(size, flag, not flag))
+        assert tables.vest_fabric_mm(size) == to_mm(tables.vest_fabric(size))
+
+
+def test_values_outside_tables_use_formulas():
+    for size in (30, 43, 65, 80):
+        assert tables.jacket_fabric(size, True, 3) == tables.jacket_fabric_formula(size, True, 3)
+        assert tables.trousers_sewing(size, True) == tables.trousers_sewing_formula(size, True)
+        assert tables.vest_fabric(size) == tables.vest_fabric_formula(size)
+    assert tables.jacket_sewing(52, 25) == tables.jacket_sewing_formula(52, 25)
+    assert tables.jacket_fabric(50.0, False, 2) == tables.jacket_fabric_formula(50.0, False, 2)
+    assert tables.trousers_fabric(52.5, True, 1) == tables.trousers_fabric_formula(52.5, True, 1)
+
+
+def test_items_agree_with_formulas():
+    jacket = Jacket("Пиджак", 56, 1000, 500, 1, 4)
+    trousers = Trousers("Брюки", 70, 800, 300, True, False)
+    suit = ThreePieceSuit("Костюм", jacket, trousers, Jacket("Жилет", 56, 900, 100))
+    assert jacket.calculate_fabric_consumption() == tables.jacket_fabric_formula(56, True, 4)
+    assert trousers.calculate_fabric_consumption() == tables.trousers_fabric_formula(70, True, False)
+    assert trousers.calculate_sewing_cost() == tables.trousers_sewing_formula(70, False)
+    expected = round(tables.jacket_fabric_formula(56, True, 4) + tables.trousers_fabric_formula(70, True, False)
+                     + tables.vest_fabric_formula(56), 2)
+    assert suit.calculate_fabric_consumption() == expected
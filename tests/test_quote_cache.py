@@ -0,0 +1,196 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import quote_service
+from clothing_package import Jacket, Trousers, ThreePieceSuit, ItemStore, pricing_tables
+from clothing_package import quote_cache
+from clothing_package.quote_cache import QuoteCache, quote_key
+from clothing_package.records import item_to_dict
+
+
+JACKET = Jacket("Пиджак", 52, 1000, 500, True, 4)
+TROUSERS = Trousers("Брюки", 54, 800, 300, False, True)
+
+
+def figures(item):
+    return item.fabric_mm(), item.sewing_kopecks(), item.material_kopecks()
+
+
+def test_key_ignores_name_but_not_parameters():
+    assert quote_key(JACKET) == quote_key(Jacket("Другой", 52, 1000.0, 500, True, 4))
+    assert quote_key(JACKET) != quote_key(Jacket("Пиджак", 52, 1000, 500, True, 5))
+    store = ItemStore()
+    assert quote_key(store.view(store.append(JACKET))) == quote_key(JACKET)
+    suit = ThreePieceSuit("Костюм", JACKET, TROUSERS, None)
+    assert quote_key(suit) != quote_key(ThreePieceSuit("Костюм", JACKET, TROUSERS, JACKET))
+
+
+def test_memory_lru_eviction_and_stats():
+    cache = QuoteCache(max_size=2)
+    items = [Jacket("Пиджак", size, 1000, 500, True, 4) for size in (48, 50, 52)]
+    for item in items:
+        assert cache.quote(item) == figures(item)
+    cache.quote(items[2])
+    cache.quote(items[0])
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (1, 4, 2, 2)
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quote_cache.time, 'time', lambda: now[0])
+    cache = QuoteCache(ttl=10)
+    cache.quote(JACKET)
+    now[0] += 5
+    cache.quote(JACKET)
+    now[0] += 20
+    cache.quote(JACKET)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = QuoteCache(path=path)
+    cache.quote(JACKET)
+    cache.close()
+
+    cache = QuoteCache(path=path)
+    assert cache.quote(JACKET) == figures(JACKET)
+    assert (cache.disk_hits, cache.misses) == (1, 0)
+    cache.quote(JACKET)
+    assert cache.hits == 1
+    cache.close()
+
+
+def test_disk_hit_keeps_creation_time(tmp_path, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(quote_cache.time, 'time', lambda: now[0])
+    path = str(tmp_path / 'cache.db')
+    cache = QuoteCache(ttl=10, path=path)
+    cache.quote(JACKET)
+    cache.close()
+
+    cache = QuoteCache(ttl=10, path=path)
+    now[0] = 8
+    cache.quote(JACKET)
+    now[0] = 18
+    cache.quote(JACKET)
+    assert (cache.disk_hits, cache.hits, cache.misses) == (1, 0, 1)
+    cache.close()
+
+
+def test_disk_writes_are_buffered(tmp_path):
+    cache = QuoteCache(path=str(tmp_path / 'cache.db'))
+    count = lambda: cache._connection().execute('SELECT COUNT(*) FROM quote_cache').fetchone()[0]
+    for size in (48, 50, 52):
+        cache.quote(Jacket("Пиджак", size, 1000, 500, True, 4))
+    assert count() == 0
+    cache.flush_later().result()
+    assert count() == 3
+    assert cache.flush_later() is None
+
+    cache.flush_every = 2
+    for size in (54, 56):
+        cache.quote(Jacket("Пиджак", size, 1000, 500, True, 4))
+    assert count() == 5
+    cache.close()
+
+
+def test_disk_tier_trimmed_to_max_rows(tmp_path):
+    cache = QuoteCache(path=str(tmp_path / 'cache.db'), max_rows=2)
+    for size in (48, 50, 52):
+        cache.quote(Jacket("Пиджак", size, 1000, 500, True, 4))
+    cache.flush()
+    cache.trim()
+    assert cache._connection().execute('SELECT COUNT(*) FROM quote_cache').fetchone()[0] == 2
+    cache.close()
+
+
+def test_memory_hits_keep_key_on_disk(tmp_path, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(quote_cache.time, 'time', lambda: now[0])
+    cache = QuoteCache(path=str(tmp_path / 'cache.db'), max_rows=3)
+    cache.quote(JACKET)
+    for size in (46, 48, 50, 54):
+        now[0] += 1
+        cache.quote(Jacket("Пиджак", size, 1000, 500, True, 4))
+        cache.quote(JACKET)
+    cache.flush()
+    cache.trim()
+    keys = {row[0] for row in cache._connection().execute('SELECT key FROM quote_cache')}
+    assert repr(quote_key(JACKET)) in keys and len(keys) == 3
+    assert (cache.hits, cache.misses) == (4, 5)
+    cache.close()
+
+
+def test_formula_change_invalidates_disk_tier(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.db')
+    cache = QuoteCache(path=path)
+    cache.quote(JACKET)
+    cache.close()
+
+    monkeypatch.setattr(pricing_tables, 'MAX_POCKETS', pricing_tables.MAX_POCKETS + 1)
+    cache = QuoteCache(path=path)
+    cache.quote(JACKET)
+    assert (cache.disk_hits, cache.misses) == (0, 1)
+    cache.close()
+
+
+def test_fingerprint_ignores_metrics_wrappers():
+    from clothing_package import metrics
+
+    before = quote_cache.pricing_fingerprint()
+    metrics.enable()
+    try:
+        assert quote_cache.pricing_fingerprint() == before
+    finally:
+        metrics.disable()
+
+
+def test_quote_service_uses_cache():
+    cache = QuoteCache()
+    cart = {'items': [item_to_dict(JACKET), item_to_dict(TROUSERS), item_to_dict(JACKET)]}
+    expected, expected_rows = quote_service.quote_cart(cart)
+    response, rows = quote_service.quote_cart(cart, cache)
+    assert response == expected and rows == expected_rows
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert quote_service.quote_item(item_to_dict(JACKET), cache) == quote_service.quote_item(item_to_dict(JACKET))
+    with pytest.raises(KeyError):
+        quote_service.quote_item({'type': 'jacket'}, cache)
+
+
+def test_service_writes_disk_tier_outside_event_loop(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+
+    cache = QuoteCache(path=str(tmp_path / 'cache.db'))
+    write = cache.write
+    threads = []
+
+    def recording_write(rows):
+        threads.append(threading.current_thread().name)
+        write(rows)
+
+    monkeypatch.setattr(cache, 'write', recording_write)
+
+    async def run():
+        service = quote_service.QuoteService(window=0.01, cache=cache)
+        await service.start('127.0.0.1', 0)
+        try:
+            return await asyncio.gather(*(service.batcher.submit('item', item_to_dict(item))
+                                          for item in (JACKET, TROUSERS)))
+        finally:
+            await service.stop()
+
+    assert [quote['fabric'] for quote, _ in asyncio.run(run())] == [JACKET.calculate_fabric_consumption(),
+                                                                  TROUSERS.calculate_fabric_consumption()]
+    assert threads and all(name.startswith('quote-cache') for name in threads)
+
+    cache = QuoteCache(path=str(tmp_path / 'cache.db'))
+    cache.quote(TROUSERS)
+    assert cache.disk_hits == 1
+    cache.close()
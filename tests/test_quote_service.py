@@ -0,0 +1,124 @@
+import asyncio
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import database
+import quote_service
+from clothing_package import Jacket, Trousers
+from clothing_package.records import item_to_dict
+
+
+JACKET = Jacket("Пиджак", 52, 1000, 500, True, 4)
+TROUSERS = Trousers("Брюки", 54, 800, 300, False, True)
+
+
+async def post(host, port, path, payload):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(quote_service._request(path, payload, host))
+    status, body = await quote_service._read_response(reader)
+    writer.close()
+    return status, json.loads(body)
+
+
+def with_service(scenario, **kwargs):
+    async def run():
+        service = quote_service.QuoteService(**kwargs)
+        host, port = await service.start('127.0.0.1', 0)
+        try:
+            return await scenario(service, host, port)
+        finally:
+            await service.stop()
+
+    return asyncio.run(run())
+
+
+def test_item_suit_and_cart_quotes():
+    async def scenario(service, host, port):
+        item = await post(host, port, '/quote/item', item_to_dict(JACKET))
+        suit = await post(host, port, '/quote/suit', {'name': "Костюм", 'jacket': item_to_dict(JACKET),
+                                                      'trousers': item_to_dict(TROUSERS)})
+        cart = await post(host, port, '/quote/cart', {'items': [item_to_dict(JACKET), item_to_dict(TROUSERS)]})
+        return item, suit, cart
+
+    (item_status, item), (suit_status, suit), (cart_status, cart) = with_service(scenario)
+    assert item_status == suit_status == cart_status == 200
+    assert item['fabric'] == JACKET.calculate_fabric_consumption()
+    assert item['total'] == JACKET.calculate_sewing_cost() + JACKET.calculate_total_cost()
+    assert suit['sewing_cost'] == (JACKET + TROUSERS).calculate_sewing_cost()
+    assert cart['total_sewing_cost'] == JACKET.calculate_sewing_cost() + TROUSERS.calculate_sewing_cost()
+    assert len(cart['items']) == 2
+
+
+def test_concurrent_requests_are_batched():
+    async def scenario(service, host, port):
+        results = await asyncio.gather(*(post(host, port, '/quote/item', item_to_dict(JACKET))
+                                         for _ in range(30)))
+        return results, service.batcher.batches
+
+    results, batches = with_service(scenario, window=0.05)
+    assert all(status == 200 for status, _ in results)
+    assert batches < 30
+
+
+def test_errors():
+    async def scenario(service, host, port):
+        return (await post(host, port, '/quote/item', {'type': 'hat'}),
+                await post(host, port, '/unknown', {}),
+                # 1e400 в JSON читается как бесконечность
+                [await post(host, port, '/quote/item', {**item_to_dict(JACKET), field: value})
+                 for field, value in (('fabric_price', 1e400), ('size', 1e400), ('accessories_price', 'nan'))])
+
+    (bad_status, bad), (missing_status, _), non_finite = with_service(scenario)
+    assert bad_status == 400 and 'error' in bad
+    assert missing_status == 404
+    assert [status for status, _ in non_finite] == [400, 400, 400]
+
+
+def test_malformed_request_does_not_block_batch():
+    async def scenario(service, host, port):
+        return await asyncio.gather(
+            post(host, port, '/quote/item', item_to_dict(JACKET)),
+            post(host, port, '/quote/item', []),
+            post(host, port, '/quote/suit', {'jacket': 5, 'trousers': item_to_dict(TROUSERS)}),
+        ), service.batcher.batches
+
+    (good, bad, bad_suit), batches = with_service(scenario, window=0.05)
+    assert batches == 1
+    assert good[0] == 200 and bad[0] == 400 and bad_suit[0] == 400
+
+
+def test_unexpected_batch_error_resolves_all_requests(monkeypatch):
+    def broken(requests, cache=None):
+        raise RuntimeError("сбой")
+
+    monkeypatch.setattr(quote_service, 'quote_batch', broken)
+
+    async def scenario(service, host, port):
+        return await asyncio.gather(*(post(host, port, '/quote/item', item_to_dict(JACKET)) for _ in range(3)))
+
+    results = asyncio.run(asyncio.wait_for(asyncio.to_thread(with_service, scenario, window=0.05), 5))
+    assert [status for status, _ in results] == [500] * 3
+
+
+def test_cart_saved_to_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_NAME', str(tmp_path / 'service.db'))
+
+    async def scenario(service, host, port):
+        return await post(host, port, '/quote/cart', {'items': [item_to_dict(JACKET)]})
+
+    status, cart = with_service(scenario, save_db=True)
+    assert status == 200
+    try:
+        assert [row[2] for row in database.get_calculation_items(cart['calculation_id'])] == ["Пиджак"]
+    finally:
+        database.close_connections()
+
+
+def test_load_generator_reports_latency():
+    stats = asyncio.run(quote_service.load_test(requests=200, concurrency=10))
+    assert stats['requests'] == 200 and stats['errors'] == 0
+    assert 0 < stats['p50_ms'] <= stats['p99_ms']
+    assert stats['rps'] > 0
@@ -0,0 +1,80 @@
+import csv
+import json
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers, ClothingCalculator, ItemStore
+from reports import iter_item_figures, write_csv_report, write_json_report, write_docx_report
+
+
+@pytest.fixture
+def calculator():
+    calc = ClothingCalculator()
+    jacket = Jacket("Пиджак", 52, 1000, 500, True, 4)
+    trousers = Trousers("Брюки", 54, 800, 300, False, True)
+    for item in (jacket, trousers, jacket + trousers):
+        calc.add_item(item)
+    return calc
+
+
+def test_csv_report(calculator, tmp_path):
+    path = tmp_path / "report.csv"
+    write_csv_report(calculator, str(path))
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['type'] for row in rows] == ['jacket', 'trousers', 'suit', 'total']
+    assert float(rows[0]['fabric']) == calculator.get_items()[0].calculate_fabric_consumption()
+    assert float(rows[-1]['sewing_cost']) == calculator.calculate_total_sewing_cost()
+
+
+def test_json_report(calculator, tmp_path):
+    path = tmp_path / "report.json"
+    write_json_report(calculator, str(path))
+    report = json.loads(path.read_text(encoding='utf-8'))
+    assert [item['position'] for item in report['items']] == [1, 2, 3]
+    assert report['totals']['grand_total'] == (calculator.calculate_total_sewing_cost()
+                                               + calculator.calculate_total_material_cost())
+
+
+def test_json_report_empty_cart(tmp_path):
+    path = tmp_path / "empty.json"
+    write_json_report(ClothingCalculator(), str(path))
+    assert json.loads(path.read_text(encoding='utf-8'))['items'] == []
+
+
+def test_compact_items_materialized_once_per_row(calculator, monkeypatch):
+    compact = ClothingCalculator(compact=True)
+    for item in calculator.iter_items():
+        compact.add_item(item)
+    calls = []
+    materialize = ItemStore.materialize
+    monkeypatch.setattr(ItemStore, 'materialize', lambda store, row: calls.append(row) or materialize(store, row))
+    figures = [(position, str(item), *rest) for position, item, *rest in iter_item_figures(compact)]
+    # Костюм создаёт и объекты своих частей, но каждая строка хранилища - один раз
+    assert len(calls) == len(set(calls))
+    assert figures == [(position, str(item), *rest) for position, item, *rest in iter_item_figures(calculator)]
+
+
+def test_docx_report_uses_single_table(calculator, tmp_path):
+    docx = pytest.importorskip("docx")
+    path = tmp_path / "report.docx"
+    write_docx_report(calculator, str(path))
+    document = docx.Document(str(path))
+    assert len(document.tables) == 1
+    assert len(document.tables[0].rows) == len(calculator) + 1
+    assert document.tables[0].rows[1].cells[1].text == str(calculator.get_items()[0])
+
+
+def test_docx_report_shows_item_types_of_compact_cart(calculator, tmp_path):
+    docx = pytest.importorskip("docx")
+    compact = ClothingCalculator(compact=True)
+    for item in calculator.iter_items():
+        compact.add_item(item)
+    path = tmp_path / "compact.docx"
+    write_docx_report(compact, str(path))
+    rows = docx.Document(str(path)).tables[0].rows[1:]
+    assert [row.cells[2].text for row in rows] == ["Jacket", "Trousers", "ThreePieceSuit"]
@@ -0,0 +1,86 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers, ThreePieceSuit, ClothingCalculator
+from clothing_package.item_store import item_class
+from clothing_package.snapshot import MappedItemStore, load_snapshot, save_snapshot
+
+
+def fill(calculator):
+    jacket = Jacket("Пиджак", 52, 1000, 500.5, True, 4)
+    trousers = Trousers("Брюки «Классика»", 54, 800, 300, False, True)
+    ids = [calculator.add_item(item) for item in (jacket, trousers, jacket + trousers,
+                                                  Jacket("Пиджак", 48, 950.25, 0.1, False, 0))]
+    calculator.remove_by_id(ids[1])
+    return ids
+
+
+def describe(calculator):
+    return [(item_id, str(item), item.calculate_fabric_consumption(), item.calculate_sewing_cost(),
+             item.calculate_total_cost()) for item_id, item in calculator.iter_entries()]
+
+
+def test_compact_round_trip_keeps_ids_and_totals(tmp_path):
+    calculator = ClothingCalculator(compact=True)
+    ids = fill(calculator)
+    path = str(tmp_path / 'cart.snapshot')
+    save_snapshot(calculator, path)
+
+    loaded = load_snapshot(path)
+    assert isinstance(loaded._store, MappedItemStore)
+    assert len(loaded) == 3
+    assert describe(loaded) == describe(calculator)
+    assert loaded.calculate_total_fabric() == calculator.calculate_total_fabric()
+    assert loaded.calculate_total_sewing_cost() == calculator.calculate_total_sewing_cost()
+    assert loaded.calculate_total_material_cost() == calculator.calculate_total_material_cost()
+    assert loaded(1500) == calculator(1500)
+    assert isinstance(loaded.get_item(ids[2]).materialize(), ThreePieceSuit)
+    assert [item_class(item) for item in loaded.iter_items()] == [Jacket, ThreePieceSuit, Jacket]
+
+
+def test_regular_calculator_is_renumbered(tmp_path):
+    calculator = ClothingCalculator()
+    fill(calculator)
+    path = str(tmp_path / 'cart.snapshot')
+    save_snapshot(calculator, path)
+
+    loaded = load_snapshot(path)
+    assert [entry[1:] for entry in describe(loaded)] == [entry[1:] for entry in describe(calculator)]
+    assert [item.name for item in loaded.iter_items(item_type=Jacket)] == ["Пиджак", "Пиджак"]
+    assert loaded.calculate_total_material_cost() == pytest.approx(calculator.calculate_total_material_cost())
+
+
+def test_loaded_cart_can_change_and_overwrite_its_file(tmp_path):
+    calculator = ClothingCalculator(compact=True)
+    ids = fill(calculator)
+    path = str(tmp_path / 'cart.snapshot')
+    save_snapshot(calculator, path)
+
+    loaded = load_snapshot(path)
+    loaded.remove_by_id(ids[0])
+    new_id = loaded.add_item(Trousers("Брюки", 50, 700, 100))
+    assert str(loaded.get_item(new_id)) == "Брюки (размер 50)"
+    save_snapshot(loaded, path)
+
+    reloaded = load_snapshot(path)
+    assert describe(reloaded) == describe(loaded)
+    assert reloaded.calculate_total_sewing_cost() == loaded.calculate_total_sewing_cost()
+
+
+def test_rejects_foreign_and_truncated_files(tmp_path):
+    foreign = tmp_path / 'foreign.bin'
+    foreign.write_bytes(b'not a snapshot' * 10)
+    with pytest.raises(ValueError):
+        load_snapshot(str(foreign))
+
+    calculator = ClothingCalculator()
+    fill(calculator)
+    path = tmp_path / 'cart.snapshot'
+    save_snapshot(calculator, str(path))
+    path.write_bytes(path.read_bytes()[:-20])
+    with pytest.raises(ValueError):
+        load_snapshot(str(path))
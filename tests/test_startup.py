@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Бюджет на импорт main сверх запуска пустого интерпретатора, секунды
+IMPORT_BUDGET = 0.15
+
+# Модули, которые не должны загружаться при запуске меню
+LAZY_MODULES = ('docx', 'numpy', 'sqlite3', 'asyncio', 'database', 'reports', 'quote_service')
+
+
+def run_python(code, **env):
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True,
+                            env={**os.environ, **env})
+    return result.stdout.strip().splitlines()[-1]
+
+
+def best_time(code, runs=3):
+    return min(float(run_python(code)) for _ in range(runs))
+
+
+def test_import_main_skips_heavy_modules():
+    loaded = run_python(f"import sys, main; print([m for m in {LAZY_MODULES!r} if m in sys.modules])")
+    assert loaded == "[]"
+
+
+def test_app_start_does_not_touch_database(tmp_path):
+    db_path = tmp_path / 'lazy.db'
+    run_python("import main; main.ClothingApp(); print('ok')", DB_PATH=str(db_path))
+    assert not db_path.exists()
+
+
+def test_import_time_budget():
+    bare = best_time("import time; s = time.perf_counter(); print(time.perf_counter() - s)")
+    startup = best_time("import time; s = time.perf_counter(); import main; print(time.perf_counter() - s)")
+    assert startup - bare < IMPORT_BUDGET, f"импорт main занял {startup:.3f} с"
@@ -0,0 +1,123 @@
+import sys
+import os
+import random
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from clothing_package import Jacket, Trousers, ThreePieceSuit, ClothingCalculator
+from clothing_package.suit_matching import match_suits, form_suits
+
+
+def test_pairs_respect_fabric_price_and_size_window():
+    items = [
+        Jacket("Пиджак", 50, 1000, 500),
+        Trousers("Брюки", 56, 1000, 300),
+        Trousers("Брюки", 52, 1000, 300),
+        Jacket("Пиджак", 50, 900, 500),
+        Trousers("Брюки", 50, 800, 300),
+    ]
+    assert match_suits(items) == [(0, 2)]
+    assert match_suits(items, size_window=0) == []
+    # В широком окне выгоднее брюки 56: их пошив дороже, и скидка на комплект больше
+    assert match_suits(items, size_window=6) == [(0, 1)]
+
+
+def test_matching_maximizes_number_of_suits():
+    # Жадное «ближайший размер» отдало бы брюки 50 пиджаку 50, оставив пиджак 48 без пары
+    items = [Jacket("Пиджак", 48, 1000, 0), Jacket("Пиджак", 50, 1000, 0),
+             Trousers("Брюки", 50, 1000, 0), Trousers("Брюки", 52, 1000, 0)]
+    assert match_suits(items) == [(0, 2), (1, 3)]
+
+
+def test_equal_sizes_prefer_expensive_sewing():
+    items = [Jacket("Пиджак", 50, 1000, 0, pockets_count=1), Jacket("Пиджак", 50, 1000, 0, pockets_count=5),
+             Trousers("Брюки", 50, 1000, 0)]
+    assert match_suits(items) == [(1, 2)]
+
+
+def test_matching_maximizes_discount_not_just_count():
+    calculator = ClothingCalculator()
+    for item in (Trousers("Брюки", 50, 1000, 0), Jacket("Пиджак", 48, 1000, 0, pockets_count=0),
+                 Jacket("Пиджак", 52, 1000, 0, pockets_count=10)):
+        calculator.add_item(item)
+    count, saving = form_suits(calculator)
+    assert count == 1
+    assert saving == 1080
+    assert calculator.get_items()[1].jacket.size == 52
+
+
+def best_pairing_sewing(items, size_window):
+    """Наибольшая суммарная стоимость пошива изделий в костюмах перебором"""
+    jackets = [i for i, item in enumerate(items) if isinstance(item, Jacket)]
+    trousers = [i for i, item in enumerate(items) if isinstance(item, Trousers)]
+
+    def best(position, used):
+        if position == len(jackets):
+            return 0
+        jacket = items[jackets[position]]
+        result = best(position + 1, used)
+        for t in trousers:
+            other = items[t]
+            if t not in used and other.fabric_price == jacket.fabric_price \
+                    and abs(other.size - jacket.size) <= size_window:
+                result = max(result, jacket.calculate_sewing_cost() + other.calculate_sewing_cost()
+                             + best(position + 1, used | {t}))
+        return result
+
+    return best(0, frozenset())
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_matching_is_optimal_on_small_orders(seed):
+    rng = random.Random(seed)
+    items = []
+    for _ in range(rng.randint(2, 9)):
+        if rng.random() < 0.5:
+            items.append(Jacket("Пиджак", rng.randint(46, 54), rng.choice((800, 1000)), 0,
+                                pockets_count=rng.randint(0, 10)))
+        else:
+            items.append(Trousers("Брюки", rng.randint(46, 54), rng.choice((800, 1000)), 0,
+                                  is_classic=rng.random() < 0.5))
+    pairs = match_suits(items)
+    assert sum(items[j].calculate_sewing_cost() + items[t].calculate_sewing_cost()
+               for j, t in pairs) == best_pairing_sewing(items, 2)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_form_suits_replaces_parts_and_reports_saving(compact):
+    calculator = ClothingCalculator(compact=compact)
+    for item in (Jacket("Пиджак", 52, 1000, 500, True, 4), Trousers("Брюки", 54, 1000, 300),
+                 Trousers("Брюки", 60, 1000, 300)):
+        calculator.add_item(item)
+    sewing_before = calculator.calculate_total_sewing_cost()
+    materials_before = calculator.calculate_total_material_cost()
+
+    count, saving = form_suits(calculator)
+
+    assert count == 1
+    items = calculator.get_items()
+    assert len(items) == 2
+    suit = items[1].materialize() if compact else items[1]
+    assert isinstance(suit, ThreePieceSuit) and suit.trousers.size == 54
+    assert saving == sewing_before - calculator.calculate_total_sewing_cost() > 0
+    assert calculator.calculate_total_material_cost() == pytest.approx(materials_before)
+
+
+def test_large_order_is_matched_quickly():
+    rng = random.Random(1)
+    items = []
+    for _ in range(10_000):
+        cls = Jacket if rng.random() < 0.5 else Trousers
+        items.append(cls("Изделие", rng.randint(44, 64), rng.choice((800, 1000, 1200)), 100))
+    start = time.perf_counter()
+    pairs = match_suits(items)
+    assert time.perf_counter() - start < 2
+    used = [index for pair in pairs for index in pair]
+    assert len(used) == len(set(used))
+    for jacket_index, trousers_index in pairs:
+        jacket, trousers = items[jacket_index], items[trousers_index]
+        assert isinstance(jacket, Jacket) and isinstance(trousers, Trousers)
+        assert jacket.fabric_price == trousers.fabric_price and abs(jacket.size - trousers.size) <= 2